@@ -9,7 +9,7 @@ from cmdkit.app import ApplicationGroup
 from cmdkit.cli import Interface
 
 # internal libs
-from refitt.apps.refitt.database import init, check, query
+from refitt.apps.refitt.database import init, check, query, migrate
 
 # public interface
 __all__ = ['DatabaseApp', ]
@@ -28,6 +28,7 @@ commands:
 init                     {init.__doc__}
 check                    {check.__doc__}
 query                    {query.__doc__}
+migrate                  {migrate.__doc__}
 
 options:
 -h, --help               Show this message and exit.
@@ -47,4 +48,5 @@ class DatabaseApp(ApplicationGroup):
     commands = {'init': init.InitDatabaseApp,
                 'check': check.CheckDatabaseApp,
                 'query': query.QueryDatabaseApp,
+                'migrate': migrate.MigrateDatabaseApp,
                 }
@@ -0,0 +1,119 @@
+# SPDX-FileCopyrightText: 2019-2022 REFITT Team
+# SPDX-License-Identifier: Apache-2.0
+
+"""Apply data migrations to existing database."""
+
+
+# type annotations
+from __future__ import annotations
+from typing import Dict, Callable, Any
+
+# standard libs
+from functools import partial
+
+# external libs
+from cmdkit.app import Application, exit_status
+from cmdkit.cli import Interface
+from sqlalchemy.exc import DatabaseError
+
+# internal libs
+from refitt.core.exceptions import handle_exception
+from refitt.core.logging import Logger
+from refitt.database import create_all, add_column, add_index
+from refitt.database.interface import engine
+from refitt.database.model import Object, ObjectAlias, File, Recommendation, RecommendationQueue, indices
+
+# public interface
+__all__ = ['MigrateDatabaseApp', ]
+
+# application logger
+log = Logger.with_name('refitt')
+
+
+PROGRAM = 'refitt database migrate'
+USAGE = f"""\
+usage: {PROGRAM} [-h] TASK
+{__doc__}\
+"""
+
+HELP = f"""\
+{USAGE}
+
+Missing tables and indices are created before the task is applied.
+
+tasks:
+aliases                Rebuild object alias index from `object.aliases`.
+pixels                 Add and populate `object.pixel` for cone search.
+files                  Move file data out of the database to the configured store.
+storage                Store file data uncompressed (PostgreSQL) and rewrite existing rows.
+airmass                Move recommendation airmass curves to typed columns.
+queue                  Rebuild queue of pending recommendations.
+
+options:
+-h, --help             Show this message and exit.\
+"""
+
+
+def migrate_pixels() -> None:
+    """Add sky pixel column and index to object table and populate for all objects."""
+    add_column(Object.pixel)
+    add_index(indices['object_pixel_index'])
+    Object.reindex_pixels()
+
+
+def migrate_files() -> None:
+    """Add storage key column to file table and move existing file data to external store."""
+    add_column(File.storage_key)
+    count = File.move_to_store()
+    log.info(f'Moved {count} files to external store')
+
+
+def migrate_file_storage() -> None:
+    """Store file data uncompressed (PostgreSQL) so slices are read without decompressing whole files."""
+    with engine.begin() as connection:
+        if not File.set_data_storage(connection):
+            log.info(f'Nothing to do for {connection.dialect.name} database')
+            return
+    count = File.rewrite_data()
+    log.info(f'Rewrote {count} files')
+
+
+def migrate_airmass() -> None:
+    """Add airmass and visibility columns to recommendation table and populate from JSON data."""
+    for column in (Recommendation.airmass_time, Recommendation.airmass_value,
+                   Recommendation.visible_start, Recommendation.visible_end):
+        add_column(column)
+    add_index(indices['recommendation_visible_index'])
+    count = Recommendation.backfill_airmass()
+    log.info(f'Moved airmass for {count} recommendations')
+
+
+# Named migration tasks
+tasks: Dict[str, Callable[[], Any]] = {
+    'aliases': ObjectAlias.rebuild,
+    'pixels': migrate_pixels,
+    'files': migrate_files,
+    'storage': migrate_file_storage,
+    'airmass': migrate_airmass,
+    'queue': RecommendationQueue.rebuild,
+}
+
+
+class MigrateDatabaseApp(Application):
+    """Application class for database migrate entry-point."""
+
+    interface = Interface(PROGRAM, USAGE, HELP)
+
+    task: str = None
+    interface.add_argument('task', choices=list(tasks))
+
+    exceptions = {
+        DatabaseError: partial(handle_exception, logger=log,
+                               status=exit_status.runtime_error),
+        **Application.exceptions
+    }
+
+    def run(self) -> None:
+        """Business logic of command."""
+        create_all()
+        tasks[self.task]()
@@ -6,13 +6,15 @@
 
 # type annotations
 from __future__ import annotations
-from typing import List, IO
+from typing import List, Dict, IO, Optional
 
 # standard libs
 import os
 import sys
+import time
 from datetime import datetime
 from functools import partial, cached_property
+from concurrent.futures import ProcessPoolExecutor
 
 # external libs
 from cmdkit.app import Application, exit_status
@@ -23,8 +25,8 @@ from sqlalchemy.exc import IntegrityError
 from refitt.core.exceptions import handle_exception
 from refitt.core.logging import Logger
 from refitt.core.schema import SchemaError
-from refitt.forecast import load_model
-from refitt.forecast.model import ModelData
+from refitt.forecast import load_model, ConvAutoEncoder
+from refitt.forecast.model import ModelData, PUBLISH_CHUNKSIZE
 from refitt.database.model import Object, Observation
 
 # public interface
@@ -35,8 +37,10 @@ log = Logger.with_name('refitt')
 
 
 PROGRAM = 'refitt forecast publish'
+DEFAULT_PRIMARY_TYPE = ConvAutoEncoder.name
 USAGE = f"""\
-usage: {PROGRAM} FILE [FILE...] [--observation-id ID | --primary FILE] [--print]
+usage: {PROGRAM} FILE [FILE...] [--observation-id ID | --primary FILE] [--jobs NUM] [--binary] [--print]
+       {PROGRAM} FILE [FILE...] --bulk [--primary-type NAME] [--jobs NUM] [--chunk-size NUM] [--binary] [--print]
 {__doc__}\
 """
 
@@ -50,8 +54,18 @@ options:
 -e, --epoch-id       ID      Epoch ID (default: <latest>).
 -p, --primary        FILE    Path to JSON file for primary model.
 -i, --observation-id ID      ID of existing observation.
+-b, --bulk                   Publish models for many objects together.
+-t, --primary-type   NAME    Model type defining observation with --bulk (default: {DEFAULT_PRIMARY_TYPE}).
+-j, --jobs           NUM     Number of processes loading files (default: 1).
+    --chunk-size     NUM     Objects written per transaction with --bulk (default: {PUBLISH_CHUNKSIZE}).
+    --binary                 Store model arrays in compact binary form.
     --print                  Print ID of published model(s). 
--h, --help                   Show this message and exit.\
+-h, --help                   Show this message and exit.
+
+All models published together must share an object, either given by the
+--primary model or the --observation-id. With --bulk, models may be given for
+any number of objects. They are grouped by object, and the model of the
+--primary-type for each object defines the observation referenced by all of them.\
 """
 
 
@@ -72,6 +86,21 @@ class ForecastPublishApp(Application):
     epoch_id: int = None
     interface.add_argument('-e', '--epoch-id', type=int, default=None)
 
+    bulk_mode: bool = False
+    interface.add_argument('-b', '--bulk', action='store_true', dest='bulk_mode')
+
+    primary_type: str = DEFAULT_PRIMARY_TYPE
+    interface.add_argument('-t', '--primary-type', default=primary_type)
+
+    jobs: int = 1
+    interface.add_argument('-j', '--jobs', type=int, default=jobs)
+
+    chunksize: int = PUBLISH_CHUNKSIZE
+    interface.add_argument('--chunk-size', type=int, default=chunksize, dest='chunksize')
+
+    binary_mode: bool = False
+    interface.add_argument('--binary', action='store_true', dest='binary_mode')
+
     verbose: bool = False
     interface.add_argument('--print', action='store_true', dest='verbose')
 
@@ -91,6 +120,9 @@ class ForecastPublishApp(Application):
         """Business logic of command."""
         self.check_args()
         self.check_sources()
+        if self.bulk_mode:
+            self.publish_bulk()
+            return
         if self.observation_id:
             models = self.load_by_observation()
         else:
@@ -102,8 +134,7 @@ class ForecastPublishApp(Application):
         """Load models with reference to given --observation-id."""
         models = []
         object_id = Observation.from_id(self.observation_id).object_id
-        for source in self.sources:
-            model = self.load(source)
+        for source, model in zip(self.sources, self.load_all(self.sources)):
             if model.object_id == object_id:
                 models.append(model)
             else:
@@ -118,8 +149,7 @@ class ForecastPublishApp(Application):
         primary_model = self.load(self.primary_filepath)
         models.append(primary_model)
         self.observation_id = primary_model.publish_observation(epoch_id=self.epoch_id).id
-        for source in self.sources:
-            model = self.load(source)
+        for source, model in zip(self.sources, self.load_all(self.sources)):
             if model.object_id == primary_model.object_id:
                 models.append(model)
             else:
@@ -128,8 +158,30 @@ class ForecastPublishApp(Application):
                                    f'found {model.object_id} for {model.name} (from file: {source})')
         return models
 
+    def publish_bulk(self) -> None:
+        """Publish models for many objects with --bulk."""
+        start = time.monotonic()
+        models = self.load_all(self.sources)
+        log.info(f'Loaded {len(models)} models ({time.monotonic() - start:.1f} seconds)')
+        groups = ModelData.group_by_object(models)
+        for model_id in ModelData.publish_all(groups, self.primary_type, epoch_id=self.epoch_id,
+                                              chunksize=self.chunksize, array_format=self.array_format):
+            self.write(model_id)
+        self.update_objects(groups)
+        elapsed = time.monotonic() - start
+        log.info(f'Published {len(models)} models for {len(groups)} objects '
+                 f'({elapsed:.1f} seconds, {len(models) / elapsed:.1f} models/s)')
+
     def check_args(self) -> None:
-        """Ensure at least --observation-id or --primary."""
+        """Ensure at least --observation-id or --primary (or --bulk alone)."""
+        if self.jobs < 1:
+            raise ArgumentError(f'Expected positive integer for --jobs (given {self.jobs})')
+        if self.chunksize < 1:
+            raise ArgumentError(f'Expected positive integer for --chunk-size (given {self.chunksize})')
+        if self.bulk_mode:
+            if self.primary_filepath or self.observation_id:
+                raise ArgumentError('Cannot provide --primary or --observation-id with --bulk')
+            return
         if self.primary_filepath and self.observation_id:
             raise ArgumentError('Cannot provide both --primary and --observation-id')
         if not self.primary_filepath and not self.observation_id:
@@ -160,7 +212,13 @@ class ForecastPublishApp(Application):
     def publish(self, *models: ModelData) -> None:
         """Publish a loaded model."""
         for model in models:
-            self.write(model.publish(observation_id=self.observation_id, epoch_id=self.epoch_id).id)
+            self.write(model.publish(observation_id=self.observation_id, epoch_id=self.epoch_id,
+                                     array_format=self.array_format).id)
+
+    @property
+    def array_format(self) -> Optional[str]:
+        """Storage format for model arrays (None keeps them as given)."""
+        return 'binary' if self.binary_mode else None
 
     @staticmethod
     def update_object(*models: ModelData) -> None:
@@ -173,11 +231,36 @@ class ForecastPublishApp(Application):
             Object.update(obj_id, pred_type=pred_type,
                           history={**obj.history, str(datetime.now().astimezone()): obj.pred_type})
 
+    def update_objects(self, groups: Dict[int, List[ModelData]]) -> None:
+        """Update many objects with predicted types from models (see `update_object`)."""
+        object_ids = list(groups)
+        session = Object.query().session
+        for start in range(0, len(object_ids), self.chunksize):
+            chunk = object_ids[start:start + self.chunksize]
+            now = str(datetime.now().astimezone())
+            for obj in Object.query().filter(Object.id.in_(chunk)):
+                pred_type = {model.name: model.object_pred_type
+                             for model in groups[obj.id] if model.object_pred_type}
+                pred_type = {**obj.pred_type, **pred_type}  # retain previous if any exist
+                if obj.pred_type != pred_type:
+                    obj.history = {**obj.history, now: obj.pred_type}
+                    obj.pred_type = pred_type
+            session.commit()
+
     @staticmethod
     def load(filepath: str) -> ModelData:
         """Load model data."""
         return load_model(filepath if filepath != '-' else sys.stdin)
 
+    def load_all(self, sources: List[str]) -> List[ModelData]:
+        """Load model data from all `sources` (files parsed and validated by --jobs processes, <stdin> here)."""
+        filepaths = [source for source in sources if source != '-']
+        if self.jobs == 1 or len(filepaths) < 2:
+            return [self.load(source) for source in sources]
+        with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+            loaded = pool.map(load_model, filepaths, chunksize=max(1, len(filepaths) // (self.jobs * 4)))
+            return [self.load(source) if source == '-' else next(loaded) for source in sources]
+
     @cached_property
     def output(self) -> IO:
         """File descriptor for writing output."""
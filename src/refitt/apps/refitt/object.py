@@ -6,7 +6,7 @@
 
 # type annotations
 from __future__ import annotations
-from typing import Callable, Dict
+from typing import List, Callable, Dict, Union
 
 # standard libs
 import sys
@@ -16,7 +16,7 @@ from functools import partial, cached_property
 # external libs
 import yaml
 from cmdkit.app import Application, exit_status
-from cmdkit.cli import Interface
+from cmdkit.cli import Interface, ArgumentError
 from rich.console import Console
 from rich.syntax import Syntax
 
@@ -34,7 +34,7 @@ log = Logger.with_name('refitt')
 
 PROGRAM = 'refitt object'
 USAGE = f"""\
-usage: {PROGRAM} [-h] NAME [--json]
+usage: {PROGRAM} [-h] {{NAME | --cone RA DEC RADIUS}} [--json] [--data] [--history]
 {__doc__}\
 """
 
@@ -42,11 +42,14 @@ HELP = f"""\
 {USAGE}
 
 arguments:
-NAME                   Object name.
+NAME                        Object name.
 
 options:
-    --json             Format output as JSON.
--h, --help             Show this message and exit.\
+    --cone RA DEC RADIUS    Search by position (degrees) within radius (arcseconds).
+    --json                  Format output as JSON.
+-d, --data                  Include object data.
+-l, --history               Include object history.
+-h, --help                  Show this message and exit.\
 """
 
 
@@ -55,8 +58,11 @@ class QueryObjectApp(Application):
 
     interface = Interface(PROGRAM, USAGE, HELP)
 
-    name: str
-    interface.add_argument('name')
+    name: str = None
+    interface.add_argument('name', nargs='?', default=name)
+
+    cone: List[float] = None
+    interface.add_argument('--cone', nargs=3, type=float, default=cone)
 
     format_json: bool = False
     interface.add_argument('--json', action='store_true', dest='format_json')
@@ -74,12 +80,22 @@ class QueryObjectApp(Application):
 
     def run(self) -> None:
         """Business logic of command."""
-        info = self.load_object().to_json()
+        if (self.name is None) == (self.cone is None):
+            raise ArgumentError('Expected either NAME or --cone')
+        if self.cone is None:
+            self.write(self.format_object(self.load_object()))
+        else:
+            ra, dec, radius = self.cone
+            self.write([self.format_object(record) for record in Object.cone_search(ra, dec, radius)])
+
+    def format_object(self, record: Object) -> dict:
+        """Convert object to dictionary with optional fields removed."""
+        info = record.to_json()
         if not self.include_data:
             info.pop('data')
         if not self.include_history:
             info.pop('history')
-        self.write(info)
+        return info
 
     def load_object(self) -> Object:
         """Load object from database."""
@@ -88,7 +104,7 @@ class QueryObjectApp(Application):
         else:
             return Object.from_name(self.name)
 
-    def write(self, data: dict) -> None:
+    def write(self, data: Union[dict, List[dict]]) -> None:
         """Format and print `data` to console."""
         formatter = self.format_method[self.format_name]
         output = formatter(data)
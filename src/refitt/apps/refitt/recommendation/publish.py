@@ -255,7 +255,7 @@ class RecommendationPublishApp(Application):
         """Unique epoch ID for recommendation."""
         if self.epoch is None:
             log.debug('Epoch not specified, fetching latest')
-            return Epoch.latest().id
+            return Epoch.latest_id()
         try:
             return int(self.epoch)
         except ValueError:
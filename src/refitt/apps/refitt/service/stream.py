@@ -15,7 +15,7 @@ from cmdkit.app import Application
 from cmdkit.cli import Interface
 
 # internal libs
-from refitt.data.broker import BrokerService
+from refitt.data.broker import BrokerService, DEFAULT_WORKER_COUNT, DEFAULT_QUEUE_SIZE
 
 # public interface
 __all__ = ['StreamApp', ]
@@ -27,6 +27,7 @@ PADDING = ' ' * len(PROGRAM)
 USAGE = f"""\
 usage: {PROGRAM} <broker> <topic> [--filter NAME] [--backfill] ...
        {PADDING} [--local-only [--output-directory DIR] | --database-only]
+       {PADDING} [--workers NUM] [--queue-size NUM]
 
 {__doc__}\
 """
@@ -46,6 +47,9 @@ options:
     --database-only            Do not write alerts to local files.
     --backfill                 Enable backfill for alert stream.
 -f, --filter            NAME   Name of filter to reject alerts.
+-w, --workers           NUM    Number of filter threads (default: {DEFAULT_WORKER_COUNT}).
+                               Alerts are processed serially if zero.
+-q, --queue-size        NUM    Maximum alerts held between stages (default: {DEFAULT_QUEUE_SIZE}).
 -h, --help                     Show this message and exit.\
 """
 
@@ -82,9 +86,16 @@ class StreamApp(Application):
     enable_backfill: bool = False
     interface.add_argument('--backfill', action='store_true', dest='enable_backfill')
 
+    workers: int = DEFAULT_WORKER_COUNT
+    interface.add_argument('-w', '--workers', type=int, default=workers)
+
+    queue_size: int = DEFAULT_QUEUE_SIZE
+    interface.add_argument('-q', '--queue-size', type=int, default=queue_size)
+
     def run(self) -> None:
         """Connect to broker and stream alerts."""
         service = BrokerService(self.broker, self.topic, (self.key, self.secret),
                                 self.filter_name, self.output_directory, self.local_only,
-                                self.database_only, self.enable_backfill)
+                                self.database_only, self.enable_backfill,
+                                workers=self.workers, queue_size=self.queue_size)
         service.run()
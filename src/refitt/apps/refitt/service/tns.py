@@ -20,6 +20,7 @@ from streamkit.subscriber import Subscriber
 # internal libs
 from refitt.core.logging import Logger
 from refitt.data.tns import TNSService
+from refitt.data.tns.manager import DEFAULT_FLUSH_SIZE, DEFAULT_FLUSH_INTERVAL
 
 # public interface
 __all__ = ['TNSApp', ]
@@ -32,7 +33,7 @@ PROGRAM = 'refitt service tns'
 PADDING = ' ' * len(PROGRAM)
 USAGE = f"""\
 usage: {PROGRAM} [-h] [--name NAME | [--persist] --from PATH | --live]
-       {PADDING} [--workers NUM] [--no-catalog]
+       {PADDING} [--workers NUM] [--no-catalog] [--flush-size NUM] [--flush-interval SEC]
 {__doc__}\
 """
 
@@ -46,6 +47,8 @@ options:
 -p, --persist               Keep file open forever (e.g., <stdin>).
 -w, --workers     NUM       Number of threads to use.
     --no-catalog            Use API queries for every update.
+    --flush-size  NUM       Write object updates in batches of NUM (default: {DEFAULT_FLUSH_SIZE}).
+    --flush-interval SEC    Write pending updates at least every SEC seconds (default: {DEFAULT_FLUSH_INTERVAL}).
 -h, --help                  Show this message and exit.\
 """
 
@@ -76,8 +79,16 @@ class TNSApp(Application):
     no_catalog: bool = False
     interface.add_argument('--no-catalog', action='store_true')
 
+    flush_size: int = DEFAULT_FLUSH_SIZE
+    interface.add_argument('--flush-size', type=int, default=flush_size)
+
+    flush_interval: float = DEFAULT_FLUSH_INTERVAL
+    interface.add_argument('--flush-interval', type=float, default=flush_interval)
+
     def run(self) -> None:
         """Run TNS query service."""
+        if self.flush_size < 1 or self.flush_interval <= 0:
+            raise ArgumentError(f'Expected positive --flush-size and --flush-interval')
         if not self.source_live and not self.source_path and not self.source_name:
             raise ArgumentError(f'Must specify either --name=NAME, --from=PATH, or --live')
         elif self.source_name:
@@ -92,30 +103,35 @@ class TNSApp(Application):
         """Name of provider type (e.g., catalog or query)."""
         return 'query' if self.no_catalog else 'catalog'
 
+    @property
+    def options(self) -> dict:
+        """Common options for TNSService."""
+        return {'threads': self.num_workers, 'provider': self.provider,
+                'flush_size': self.flush_size, 'flush_interval': self.flush_interval}
+
     def run_live(self) -> None:
         """Subscribe to broker events and run forever."""
         with Subscriber(name='tns', topics=['refitt.data.broker', ], batchsize=10, poll=4) as subscriber:
-            server = TNSService.from_subscriber(subscriber, threads=self.num_workers, provider=self.provider)
+            server = TNSService.from_subscriber(subscriber, **self.options)
             server.run()
 
     def run_name(self) -> None:
         """Look up a single name."""
-        server = TNSService([self.source_name, ], threads=self.num_workers, provider=self.provider)
+        server = TNSService([self.source_name, ], **self.options)
         server.run()
 
     def run_from(self, path: str) -> None:
         """Stream object names from I/O device."""
         if path == '-':
-            server = TNSService.from_io(sys.stdin, threads=self.num_workers, provider=self.provider)
+            server = TNSService.from_io(sys.stdin, **self.options)
             server.run()
         else:
             with open(self.source_path, mode='r') as stream:
                 if not self.source_persist:
-                    server = TNSService.from_io(stream, threads=self.num_workers, provider=self.provider)
+                    server = TNSService.from_io(stream, **self.options)
                     server.run()
                 else:
-                    server = TNSService(source=self.yield_forever(stream), threads=self.num_workers,
-                                        provider=self.provider)
+                    server = TNSService(source=self.yield_forever(stream), **self.options)
                     server.run()
 
     def yield_forever(self, stream: IO) -> Iterator[str]:
@@ -0,0 +1,91 @@
+# SPDX-FileCopyrightText: 2019-2022 REFITT Team
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Vectorized evaluation of airmass curves.
+
+A set of curves is packed into two 2D arrays (one row per curve) of sample times
+(POSIX seconds) and values. Rows are sorted by time and padded on the right with
+infinite times, so all curves can be evaluated at once with array operations.
+"""
+
+
+# type annotations
+from typing import List, Dict, Tuple, Union, Optional
+
+# standard libs
+import json
+from datetime import datetime
+
+# external libs
+import numpy as np
+
+# public interface
+__all__ = ['AIRMASS_CUTOFF', 'parse_curve', 'format_curve', 'pack_curves', 'interpolate', 'visible_window', ]
+
+
+# Targets are observable at or below this airmass
+AIRMASS_CUTOFF: float = 1.4
+
+
+def parse_curve(data: Union[str, Dict[str, float]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Decode airmass curve mapping ISO timestamps to values (possibly JSON-encoded)."""
+    if isinstance(data, str):
+        data = json.loads(data)
+    times = np.fromiter((datetime.fromisoformat(time).timestamp() for time in data.keys()),
+                        dtype=float, count=len(data))
+    values = np.fromiter(data.values(), dtype=float, count=len(data))
+    return times, values
+
+
+def format_curve(times: np.ndarray, values: np.ndarray) -> str:
+    """JSON-encode airmass curve as mapping of ISO timestamps (local time zone) to values (see `parse_curve`)."""
+    return json.dumps({datetime.fromtimestamp(time).astimezone().isoformat(): float(value)
+                       for time, value in zip(times.tolist(), values.tolist())})
+
+
+def pack_curves(curves: List[Tuple[np.ndarray, np.ndarray]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Pack (times, values) pairs into padded 2D arrays with each row sorted by time."""
+    width = max((len(times) for times, _ in curves), default=0)
+    times = np.full((len(curves), width), np.inf)
+    values = np.full((len(curves), width), np.nan)
+    for row, (curve_times, curve_values) in enumerate(curves):
+        times[row, :len(curve_times)] = curve_times
+        values[row, :len(curve_values)] = curve_values
+    order = np.argsort(times, axis=1, kind='stable')
+    return np.take_along_axis(times, order, axis=1), np.take_along_axis(values, order, axis=1)
+
+
+def interpolate(times: np.ndarray, values: np.ndarray, at: float) -> np.ndarray:
+    """
+    Linearly interpolate each packed curve at time `at` (POSIX seconds).
+    Curves without samples on both sides of `at` give NaN.
+    """
+    if times.shape[1] == 0:
+        return np.full(times.shape[0], np.nan)
+    count = np.isfinite(times).sum(axis=1)
+    after = (times <= at).sum(axis=1)  # NOTE: index of first sample later than `at`
+    valid = (after > 0) & (after < count)
+    lower = np.clip(after - 1, 0, times.shape[1] - 1)[:, None]
+    upper = np.clip(after, 0, times.shape[1] - 1)[:, None]
+    t0, t1 = np.take_along_axis(times, lower, axis=1)[:, 0], np.take_along_axis(times, upper, axis=1)[:, 0]
+    v0, v1 = np.take_along_axis(values, lower, axis=1)[:, 0], np.take_along_axis(values, upper, axis=1)[:, 0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = v0 + (v1 - v0) * (at - t0) / (t1 - t0)
+    return np.where(valid, result, np.nan)
+
+
+def visible_window(times: np.ndarray, values: np.ndarray,
+                   cutoff: float = AIRMASS_CUTOFF) -> Optional[Tuple[float, float]]:
+    """
+    Bounding interval (POSIX seconds) of times at which the curve may be at or below `cutoff`.
+    The interval extends to the samples neighbouring the first and last visible samples,
+    so it contains every time where the interpolated curve is visible. None if never visible.
+    """
+    order = np.argsort(times, kind='stable')
+    times, values = times[order], values[order]
+    visible, = np.nonzero(np.abs(values) <= cutoff)
+    if not visible.size:
+        return None
+    first, last = max(visible[0] - 1, 0), min(visible[-1] + 1, len(times) - 1)
+    return float(times[first]), float(times[last])
@@ -0,0 +1,111 @@
+# SPDX-FileCopyrightText: 2019-2022 REFITT Team
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Compact encoding of numeric arrays within JSON data.
+
+An encoded array is a small header and the raw little-endian values in base64,
+e.g., {"dtype": "float64", "shape": [3], "base64": "..."}. This is a fraction of
+the size of the equivalent JSON list and decodes directly into a numpy array
+without parsing each value.
+"""
+
+
+# type annotations
+from typing import List, Dict, Any, Iterable, Union
+
+# standard libs
+from base64 import b64encode, b64decode
+
+# external libs
+import numpy as np
+
+# public interface
+__all__ = ['DTYPES', 'ARRAY_FORMATS', 'ArrayError', 'is_encoded', 'encode', 'decode', 'check',
+           'encode_all', 'decode_all', 'convert_all', ]
+
+
+# Supported value types by name (always stored little-endian)
+DTYPES: Dict[str, str] = {
+    'float32': '<f4',
+    'float64': '<f8',
+}
+
+# Allowed representations of arrays in model data ('list' is plain JSON)
+ARRAY_FORMATS: List[str] = ['list', 'binary', ]
+
+# Keys of an encoded array
+_HEADER = {'dtype', 'shape', 'base64'}
+
+
+class ArrayError(Exception):
+    """Malformed encoded array."""
+
+
+def is_encoded(value: Any) -> bool:
+    """True if `value` is an encoded array."""
+    return isinstance(value, dict) and value.keys() == _HEADER
+
+
+def encode(values: Union[np.ndarray, List[Any]], dtype: str = 'float64') -> Dict[str, Any]:
+    """Encode `values` (array-like, possibly nested lists) as `dtype`."""
+    if dtype not in DTYPES:
+        raise ArrayError(f'Unsupported dtype \'{dtype}\' (expected one of {list(DTYPES)})')
+    array = np.ascontiguousarray(values, dtype=DTYPES[dtype])
+    return {'dtype': dtype, 'shape': list(array.shape), 'base64': b64encode(array.tobytes()).decode()}
+
+
+def check(value: Dict[str, Any], ndim: int = None) -> None:
+    """Validate header of encoded array `value`, optionally requiring `ndim` dimensions."""
+    if not is_encoded(value):
+        raise ArrayError(f'Expected encoded array, found {value.__class__.__name__}')
+    dtype, shape = value['dtype'], value['shape']
+    if dtype not in DTYPES:
+        raise ArrayError(f'Unsupported dtype \'{dtype}\' (expected one of {list(DTYPES)})')
+    if not isinstance(shape, list) or not all(type(size) is int and size >= 0 for size in shape):
+        raise ArrayError(f'Expected list of sizes for shape, found {shape}')
+    if ndim is not None and len(shape) != ndim:
+        raise ArrayError(f'Expected {ndim}-dimensional array, found shape={shape}')
+    if not isinstance(value['base64'], str):
+        raise ArrayError(f'Expected base64 string, found {value["base64"].__class__.__name__}')
+
+
+def decode(value: Dict[str, Any]) -> np.ndarray:
+    """Decode encoded array `value` into a (read-only) numpy array."""
+    check(value)
+    dtype = np.dtype(DTYPES[value['dtype']])
+    data = b64decode(value['base64'].encode())
+    count = int(np.prod(value['shape'], dtype=np.int64))
+    if len(data) != count * dtype.itemsize:
+        raise ArrayError(f'Expected {count * dtype.itemsize} bytes for shape={value["shape"]}, '
+                         f'found {len(data)}')
+    return np.frombuffer(data, dtype=dtype).reshape(value['shape'])
+
+
+def encode_all(data: Dict[str, Any], keys: Iterable[str], dtype: str = 'float64') -> Dict[str, Any]:
+    """Copy of `data` with any of `keys` present encoded (those already encoded are kept as is)."""
+    data = dict(data)
+    for key in keys:
+        if key in data and not is_encoded(data[key]):
+            data[key] = encode(data[key], dtype=dtype)
+    return data
+
+
+def decode_all(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of `data` with any encoded arrays decoded to (nested) lists."""
+    return {key: decode(value).tolist() if is_encoded(value) else value for key, value in data.items()}
+
+
+def convert_all(data: Dict[str, Any], keys: Iterable[str], array_format: str = None,
+                dtype: str = 'float64') -> Dict[str, Any]:
+    """
+    Copy of `data` with arrays kept as given (`array_format` is None), decoded to
+    lists ('list'), or any of `keys` encoded as `dtype` ('binary').
+    """
+    if array_format is None:
+        return dict(data)
+    if array_format == 'list':
+        return decode_all(data)
+    if array_format == 'binary':
+        return encode_all(data, keys, dtype=dtype)
+    raise ArrayError(f'Unsupported array format \'{array_format}\' (expected one of {ARRAY_FORMATS})')
@@ -0,0 +1,91 @@
+# SPDX-FileCopyrightText: 2019-2022 REFITT Team
+# SPDX-License-Identifier: Apache-2.0
+
+"""In-process caching with bounded size and time-to-live."""
+
+
+# type annotations
+from typing import Any, Callable, Hashable, Optional
+
+# standard libs
+import time
+from threading import Lock
+from collections import OrderedDict
+
+# public interface
+__all__ = ['TTLCache', ]
+
+
+class TTLCache:
+    """
+    Thread-safe mapping whose entries expire `ttl` seconds after insertion.
+    At most `maxsize` entries are held; the least recently used is evicted first.
+    A `ttl` or `maxsize` of zero disables the cache (nothing is stored).
+    """
+
+    ttl: float
+    maxsize: int
+
+    _data: OrderedDict
+    _lock: Lock
+    _timer: Callable[[], float]
+
+    def __init__(self, maxsize: int, ttl: float, timer: Callable[[], float] = time.monotonic) -> None:
+        """Initialize empty cache."""
+        if maxsize < 0:
+            raise ValueError(f'Expected non-negative maxsize, given {maxsize}')
+        if ttl < 0:
+            raise ValueError(f'Expected non-negative ttl, given {ttl}')
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = Lock()
+        self._timer = timer
+
+    @property
+    def enabled(self) -> bool:
+        """Whether entries are retained at all."""
+        return self.maxsize > 0 and self.ttl > 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Lookup value for `key` if present and not expired, otherwise `default`."""
+        with self._lock:
+            try:
+                expires, value = self._data[key]
+            except KeyError:
+                return default
+            if self._timer() >= expires:
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store `value` for `key` (evicting oldest entries as needed)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._data[key] = self._timer() + self.ttl, value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Optional[Any]:
+        """Remove `key` from cache if present (returns value or `default`)."""
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Check if `key` is present and not expired."""
+        sentinel = object()
+        return self.get(key, sentinel) is not sentinel
+
+    def __len__(self) -> int:
+        """Number of entries held (including any expired and not yet removed)."""
+        return len(self._data)
@@ -29,7 +29,7 @@ from refitt.core.exceptions import write_traceback, display_warning
 # public interface
 __all__ = ['config', 'update', 'default', 'ConfigurationError', 'Namespace', 'blame',
            'load', 'reload', 'load_file', 'reload_file', 'load_env', 'reload_env',
-           'DEFAULT_LOGGING_STYLE', 'DEFAULT_DATABASE', 'LOGGING_STYLES', ]
+           'DEFAULT_LOGGING_STYLE', 'DEFAULT_DATABASE', 'DEFAULT_FILE_STORE', 'LOGGING_STYLES', ]
 
 # partial logging (not yet configured - initialized afterward)
 log = logging.getLogger(__name__)
@@ -58,6 +58,9 @@ LOGGING_STYLES = {
 # Default SQLite database location if not configured
 DEFAULT_DATABASE = os.path.join(default_path.lib, 'main.db')
 
+# Default location for files if stored on the local filesystem
+DEFAULT_FILE_STORE = os.path.join(default_path.lib, 'files')
+
 
 # Environment variables and configuration files are automatically merged with defaults
 default = Namespace({
@@ -65,6 +68,27 @@ default = Namespace({
     'database': {
         # NOTE: If not configured the default is ~/.refitt/lib/main.db
         'provider': 'sqlite',
+        'epoch': {
+            # NOTE: the latest epoch is reused for up to `ttl` seconds by each process;
+            # epochs created by other processes may not be seen until then.
+            'ttl': 5,
+        },
+        'pool': {
+            # NOTE: Connections are tested before use and replaced after `recycle` seconds,
+            # so that connections dropped by the server (e.g., after failover) are not handed out.
+            # Also allowed: 'size', 'max_overflow', and 'timeout' (not supported with SQLite).
+            'pre_ping': True,
+            'recycle': 3600,
+        },
+    },
+
+    'store': {
+        # NOTE: Where new file data is written ('database' or 'local').
+        # Existing data remains readable from any provider until migrated.
+        'provider': 'database',
+        'local': {
+            'path': DEFAULT_FILE_STORE,
+        },
     },
 
     'logging': {
@@ -82,7 +106,13 @@ default = Namespace({
     'api': {
         'site': 'https://api.refitt.org',
         'port': None,
-        'login': 'https://refitt.org/api_credentials'
+        'login': 'https://refitt.org/api_credentials',
+        'cache': {
+            # NOTE: verified tokens and client credentials are reused for up to `ttl` seconds
+            # without consulting the database; revoked credentials may be accepted until then.
+            'ttl': 30,
+            'maxsize': 10_000,
+        },
     },
 
     'daemon': {
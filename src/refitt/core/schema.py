@@ -6,10 +6,10 @@
 
 # type annotations
 from __future__ import annotations
-from typing import Union, Optional, TypeVar, Type, List, Dict
+from typing import Union, Optional, TypeVar, Type, List, Dict, Callable
 
 # standard libs
-from abc import ABC
+from abc import ABC, abstractmethod
 from enum import Enum
 
 # public interface
@@ -30,9 +30,36 @@ Value_T = Union[V, List['Value_T'], Dict[str, 'Value_T']]
 Schema_T = Union[Type[V], 'ListSchema', 'DictSchema']
 
 
+# A compiled schema returns its input or raises SchemaError
+Validator = Callable[[Value_T], Value_T]
+
+
 class Schema(ABC):
     """Generic base class for all schema types."""
 
+    _validator: Optional[Validator] = None
+
+    @abstractmethod
+    def compile(self) -> Validator:
+        """Build a validator function specialized for this schema."""
+
+    def ensure(self, value: Value_T) -> Value_T:
+        """Returns `value` not in violation of specified schema."""
+        if self._validator is None:
+            self._validator = self.compile()
+        return self._validator(value)
+
+
+# Allowed key types for dictionaries
+_STR_TYPE = frozenset({str, })
+
+
+def _find_member(value: Value_T, allowed: tuple) -> int:
+    """Position of first member in `value` whose type is not in `allowed`."""
+    for i, member in enumerate(value):
+        if type(member) not in allowed:
+            return i
+
 
 class Size(Enum):
     """Special sizing indicator to signal requirements."""
@@ -104,6 +131,7 @@ class ListSchema(Schema):
     def member_type(self, some_type: Optional[Schema_T]) -> None:
         if some_type is None or some_type in V.__constraints__ or isinstance(some_type, (ListSchema, DictSchema)):
             self.__member_type = some_type
+            self._validator = None
         else:
             given = some_type if not hasattr(some_type, '__name__') else some_type.__name__
             raise SchemaDefinitionError(f'Unsupported member type \'{given}\'')
@@ -116,6 +144,7 @@ class ListSchema(Schema):
     def size(self, value: Optional[SizeType]) -> None:
         if value is None or isinstance(value, (int, Size)):
             self.__size = value
+            self._validator = None
         else:
             raise TypeError(f'ListSchema.size expects integer or {type(Size)}')
 
@@ -134,61 +163,72 @@ class ListSchema(Schema):
         """Infer schema from example `data`."""
         raise NotImplementedError()
 
-    def ensure(self, value: Value_T) -> Value_T:
-        """Returns `value` not in violation of specified schema."""
-        self.__check_type(value)
-        self.__check_size(value)
-        self.__check_member_types(value)
-        return value
-
-    def __check_member_types(self, value: Value_T) -> None:
-        if self.member_type is not None:
-            if self.member_type is float:
-                self.__check_float(value)
-            elif self.member_type in V.__constraints__:
-                self.__check_generic(value)
-            else:
-                self.__check_container(value)
-
-    def __check_container(self, value: Value_T) -> None:
-        for i, member in enumerate(value):
-            try:
-                self.member_type.ensure(member)
-            except SchemaError as error:
-                raise SchemaError(f'{error}, for member at position {i}') from error
-
-    def __check_generic(self, value: Value_T) -> None:
-        for i, member in enumerate(value):
-            if type(member) is not self.member_type:  # NOTE: we don't want to allow `isinstance(True, int)`
-                raise SchemaError(f'Expected all members to be type {self.member_type.__name__}, '
-                                  f'found {member.__class__.__name__}({repr(member)}) at position {i}')
+    def compile(self) -> Validator:
+        """
+        Build a validator function specialized for this schema.
 
-    def __check_float(self, value: Value_T) -> None:
-        for i, member in enumerate(value):
-            if type(member) not in (float, int,):
-                raise SchemaError(f'Expected all members to be type {self.member_type.__name__}, '
+        Members of a scalar type are checked together by the set of their types,
+        only falling back to an element-wise search to report the offending position.
+        Nested schema are compiled along with their parent.
+        """
+        size = self.size if isinstance(self.size, int) else None
+        equal_size = getattr(self.member_type, 'size', None) is Size.ALL_EQUAL
+        check_members = self.__compile_members()
+
+        def validate(value: Value_T) -> Value_T:
+            if not isinstance(value, list):
+                raise SchemaError(f'Expected list, found {value.__class__.__name__}({value})')
+            if size is not None and len(value) != size:
+                raise SchemaError(f'Expected length {size}, found length {len(value)}')
+            if equal_size and value:
+                self.__check_equal_size(value)
+            if check_members is not None:
+                check_members(value)
+            return value
+
+        return validate
+
+    def __compile_members(self) -> Optional[Callable[[list], None]]:
+        """Build member type check for list or None if any member type is allowed."""
+        member_type = self.member_type
+        if member_type is None:
+            return None
+        if isinstance(member_type, Schema):
+            validate_member = member_type.compile()
+
+            def check_container(value: list) -> None:
+                for i, member in enumerate(value):
+                    try:
+                        validate_member(member)
+                    except SchemaError as error:
+                        raise SchemaError(f'{error}, for member at position {i}') from error
+
+            return check_container
+
+        # NOTE: we don't want to allow `isinstance(True, int)`
+        allowed = (float, int) if member_type is float else (member_type, )
+        allowed_set = frozenset(allowed)
+
+        def check_scalar(value: list) -> None:
+            if not allowed_set.issuperset(map(type, value)):
+                i = _find_member(value, allowed)
+                member = value[i]
+                raise SchemaError(f'Expected all members to be type {member_type.__name__}, '
                                   f'found {member.__class__.__name__}({repr(member)}) at position {i}')
 
-    def __check_size(self, value: Value_T) -> None:
-        if isinstance(self.size, int) and len(value) != self.size:
-            raise SchemaError(f'Expected length {self.size}, found length {len(value)}')
-        if hasattr(self.member_type, 'size') and isinstance(self.member_type.size, Size):
-            if self.member_type.size is Size.ALL_EQUAL:
-                if not hasattr(value[0], '__len__'):
-                    raise SchemaError(f'Expected sized members, found {type(value[0])}({value[0]}) '
-                                      f'at position 0')
-                s0 = len(value[0])
-                for i, member in enumerate(value):
-                    si = len(member)
-                    if si != s0:
-                        raise SchemaError(f'Expected members of equal size, found size={si} at position {i} '
-                                          f'but size={s0} at position 0')
+        return check_scalar
 
     @staticmethod
-    def __check_type(value: list) -> None:
-        """Verify `value` is a list."""
-        if not isinstance(value, list):
-            raise SchemaError(f'Expected list, found {value.__class__.__name__}({value})')
+    def __check_equal_size(value: list) -> None:
+        """Verify all members of `value` have the same length."""
+        if not hasattr(value[0], '__len__'):
+            raise SchemaError(f'Expected sized members, found {type(value[0])}({value[0]}) '
+                              f'at position 0')
+        s0 = len(value[0])
+        for i, si in enumerate(map(len, value)):
+            if si != s0:
+                raise SchemaError(f'Expected members of equal size, found size={si} at position {i} '
+                                  f'but size={s0} at position 0')
 
     def __repr__(self) -> str:
         if self.member_type is None:
@@ -265,6 +305,7 @@ class DictSchema(Schema):
     def member_type(self, some_type: Optional[Dict_Schema_T]) -> None:
         if some_type is None or some_type in V.__constraints__ or isinstance(some_type, (ListSchema, DictSchema)):
             self.__member_type = some_type
+            self._validator = None
         elif isinstance(some_type, dict):
             for i, (key, value) in enumerate(some_type.items()):
                 if not isinstance(key, str):
@@ -277,6 +318,7 @@ class DictSchema(Schema):
                                                 f'at position {i}')
             else:
                 self.__member_type = some_type
+                self._validator = None
         else:
             given = some_type if not hasattr(some_type, '__name__') else some_type.__name__
             raise TypeError(f'Unsupported member type \'{given}\'')
@@ -287,6 +329,7 @@ class DictSchema(Schema):
 
     @size.setter
     def size(self, value: Optional[SizeType]) -> None:
+        self._validator = None
         if value is None:
             self.__size = None
         elif isinstance(value, (int, Size)):
@@ -322,72 +365,118 @@ class DictSchema(Schema):
             else:
                 return cls(member_type=member_type, size=size)
 
-    def ensure(self, value: Value_T) -> dict:
-        """Returns `value` not in violation of specified schema."""
-        self.__check_type(value)
+    def compile(self) -> Validator:
+        """
+        Build a validator function specialized for this schema.
+
+        Explicit keys are resolved to their member checks once, and a singular scalar
+        member type is checked by the set of member types (see `ListSchema.compile`).
+        """
         if isinstance(self.member_type, dict):
-            self.__check_dict(value)
+            check_members = self.__compile_dict()
         else:
-            self.__check_any(value)
-        return value
-
-    def __check_any(self, value: Value_T) -> None:
-        """Ensure valid types for `value` for singular `member_type`."""
-        if self.size is not None and len(value) != self.size:
-            raise SchemaError(f'Expected length {self.size}, found length {len(value)}')
-        for i, key in enumerate(value.keys()):
-            if not isinstance(key, str):
+            check_members = self.__compile_any()
+
+        def validate(value: Value_T) -> dict:
+            if not isinstance(value, dict):
+                raise SchemaError(f'Expected {self}, found {value.__class__.__name__}({value})')
+            check_members(value)
+            return value
+
+        return validate
+
+    def __compile_any(self) -> Callable[[dict], None]:
+        """Build check of `value` for singular `member_type`."""
+        size = self.size
+        member_type = self.member_type
+
+        def check_keys(value: dict) -> None:
+            if size is not None and len(value) != size:
+                raise SchemaError(f'Expected length {size}, found length {len(value)}')
+            if not _STR_TYPE.issuperset(map(type, value)):
+                i = _find_member(value, (str, ))
+                key = list(value)[i]
                 raise SchemaError(f'Expected all keys to be type str, '
                                   f'found {key.__class__.__name__}({repr(key)}) at position {i}')
-        if self.member_type is None:
-            return  # anything goes
-        if self.member_type is float:
-            for i, (key, member) in enumerate(value.items()):
-                if type(member) not in (float, int):
-                    raise SchemaError(f'Expected all members to be type {self.member_type.__name__}, '
-                                      f'found {member.__class__.__name__}({repr(member)}) at position {i} '
-                                      f'for member \'{key}\'')
-        elif self.member_type in V.__constraints__:
-            for i, (key, member) in enumerate(value.items()):
-                if type(member) is not self.member_type:  # NOTE: we don't want to allow `isinstance(True, int)`
-                    raise SchemaError(f'Expected all members to be type {self.member_type.__name__}, '
-                                      f'found {member.__class__.__name__}({repr(member)}) at position {i} '
-                                      f'for member \'{key}\'')
-        elif type(self.member_type) in (ListSchema, DictSchema):
+
+        if member_type is None:
+            return check_keys  # anything goes
+
+        if isinstance(member_type, Schema):
+            validate_member = member_type.compile()
+
+            def check_container(value: dict) -> None:
+                check_keys(value)
+                for key, member in value.items():
+                    try:
+                        validate_member(member)
+                    except SchemaError as error:
+                        raise SchemaError(f'{error}, for member \'{key}\'') from error
+
+            return check_container
+
+        # NOTE: we don't want to allow `isinstance(True, int)`
+        allowed = (float, int) if member_type is float else (member_type, )
+        allowed_set = frozenset(allowed)
+
+        def check_scalar(value: dict) -> None:
+            check_keys(value)
+            if not allowed_set.issuperset(map(type, value.values())):
+                i = _find_member(value.values(), allowed)
+                key, member = list(value.items())[i]
+                raise SchemaError(f'Expected all members to be type {member_type.__name__}, '
+                                  f'found {member.__class__.__name__}({repr(member)}) at position {i} '
+                                  f'for member \'{key}\'')
+
+        return check_scalar
+
+    def __compile_dict(self) -> Callable[[dict], None]:
+        """Build check of `value` for dictionary of expected keys in `member_type`."""
+        expected = list(self.member_type)
+        checks = {key: self.__compile_member(key, member_type)
+                  for key, member_type in self.member_type.items()}
+
+        def check_dict(value: dict) -> None:
+            for key in expected:
+                if key not in value:
+                    raise SchemaError(f'Missing key \'{key}\'')
+            if len(value) != len(expected):
+                for key in value:
+                    if key not in checks:
+                        raise SchemaError(f'Unexpected key \'{key}\'')
             for i, (key, member) in enumerate(value.items()):
-                try:
-                    self.member_type.ensure(member)
-                except SchemaError as error:
-                    raise SchemaError(f'{error}, for member \'{key}\'') from error
+                check = checks[key]
+                if check is not None:
+                    check(member, i)
+
+        return check_dict
+
+    @staticmethod
+    def __compile_member(key: str, member_type: Optional[Schema_T]) -> Optional[Callable[[Value_T, int], None]]:
+        """Build check for single member at `key` (None if any type is allowed)."""
+        if member_type is None:
+            return None
+
+        if isinstance(member_type, Schema):
+            validate_member = member_type.compile()
 
-    def __check_dict(self, value: Value_T) -> None:
-        """Ensure `value` types for dictionary of expected keys in `member_type`."""
-        for i, (key, member) in enumerate(self.member_type.items()):
-            if key not in value:
-                raise SchemaError(f'Missing key \'{key}\'')
-        for i, (key, member) in enumerate(value.items()):
-            if key not in self.member_type:
-                raise SchemaError(f'Unexpected key \'{key}\'')
-        for i, (key, member) in enumerate(value.items()):
-            member_type = self.member_type[key]
-            if member_type is float:
-                if type(member) not in (float, int):
-                    raise SchemaError(f'Expected type {member_type.__name__} for member \'{key}\', '
-                                      f'found {member.__class__.__name__}({repr(member)}) at position {i}')
-            elif member_type in V.__constraints__:
-                if type(member) is not member_type:  # NOTE: we don't want to allow `isinstance(True, int)`
-                    raise SchemaError(f'Expected type {member_type.__name__} for member \'{key}\', '
-                                      f'found {member.__class__.__name__}({repr(member)}) at position {i}')
-            elif type(member_type) in (ListSchema, DictSchema):
+            def check_container(member: Value_T, i: int) -> None:  # noqa: unused position
                 try:
-                    member_type.ensure(member)
+                    validate_member(member)
                 except SchemaError as error:
                     raise SchemaError(f'{error}, for member \'{key}\'') from error
 
-    def __check_type(self, value: Value_T) -> None:
-        """Ensure the passed `value` is at least of type `dict`."""
-        if not isinstance(value, dict):
-            raise SchemaError(f'Expected {self}, found {value.__class__.__name__}({value})')
+            return check_container
+
+        # NOTE: we don't want to allow `isinstance(True, int)`
+        allowed = (float, int) if member_type is float else (member_type, )
+
+        def check_scalar(member: Value_T, i: int) -> None:
+            if type(member) not in allowed:
+                raise SchemaError(f'Expected type {member_type.__name__} for member \'{key}\', '
+                                  f'found {member.__class__.__name__}({repr(member)}) at position {i}')
+
+        return check_scalar
 
     def __repr__(self) -> str:
         if self.member_type is None:
@@ -0,0 +1,90 @@
+# SPDX-FileCopyrightText: 2019-2022 REFITT Team
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Sky pixelization for indexed positional queries.
+
+The sphere is divided into declination zones of fixed height, and each zone
+into right ascension cells of the same width. A position maps to a single integer
+pixel id (`zone * CELL_COUNT + cell`), so pixels within a zone are contiguous and a
+cone is covered by a small number of id ranges that a B-tree index can scan.
+"""
+
+
+# type annotations
+from typing import List, Tuple
+
+# standard libs
+import math
+
+# public interface
+__all__ = ['PIXEL_SIZE', 'ZONE_COUNT', 'CELL_COUNT', 'pixel_id', 'cone_ranges', 'separation', ]
+
+
+# Height of zones and width of cells (degrees)
+PIXEL_SIZE: float = 1 / 60  # i.e., 1 arcminute
+
+ZONE_COUNT: int = round(180 / PIXEL_SIZE)
+CELL_COUNT: int = round(360 / PIXEL_SIZE)
+
+# Beyond this many zones a cone is covered by the whole declination band
+MAX_ZONE_RANGES: int = 100
+
+
+def _zone(dec: float) -> int:
+    """Zone index for declination `dec` (degrees)."""
+    return min(max(int((dec + 90) / PIXEL_SIZE), 0), ZONE_COUNT - 1)
+
+
+def _cell(ra: float) -> int:
+    """Cell index for right ascension `ra` (degrees)."""
+    return int((ra % 360) / PIXEL_SIZE) % CELL_COUNT
+
+
+def pixel_id(ra: float, dec: float) -> int:
+    """Pixel containing position (`ra`, `dec`) in degrees."""
+    return _zone(dec) * CELL_COUNT + _cell(ra)
+
+
+def _merge(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Combine overlapping or adjacent inclusive ranges."""
+    merged = []
+    for start, stop in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = merged[-1][0], max(merged[-1][1], stop)
+        else:
+            merged.append((start, stop))
+    return merged
+
+
+def cone_ranges(ra: float, dec: float, radius: float) -> List[Tuple[int, int]]:
+    """
+    Inclusive ranges of pixel ids covering the cone at (`ra`, `dec`) with `radius`.
+    Positions are in degrees, `radius` is in arcseconds. The covering is conservative;
+    candidates should be filtered by `separation`.
+    """
+    if radius < 0:
+        raise ValueError(f'Expected non-negative radius, given {radius}')
+    radius = radius / 3600
+    first, last = _zone(dec - radius), _zone(dec + radius)
+    if abs(dec) + radius >= 90 or radius >= 90:
+        width = 180.0  # NOTE: cone contains a pole, all right ascension
+    else:
+        width = math.degrees(math.asin(min(1.0, math.sin(math.radians(radius)) / math.cos(math.radians(dec)))))
+    if width >= 180 or last - first + 1 > MAX_ZONE_RANGES:
+        return [(first * CELL_COUNT, (last + 1) * CELL_COUNT - 1)]
+    low, high = _cell(ra - width), _cell(ra + width)
+    if low <= high:
+        cells = [(low, high)]
+    else:
+        cells = [(0, high), (low, CELL_COUNT - 1)]  # NOTE: wraps around ra=0
+    return _merge([(zone * CELL_COUNT + start, zone * CELL_COUNT + stop)
+                   for zone in range(first, last + 1) for start, stop in cells])
+
+
+def separation(ra_1: float, dec_1: float, ra_2: float, dec_2: float) -> float:
+    """Angular separation between two positions (degrees) in arcseconds."""
+    ra_1, dec_1, ra_2, dec_2 = map(math.radians, (ra_1, dec_1, ra_2, dec_2))
+    value = (math.sin((dec_2 - dec_1) / 2) ** 2 +
+             math.cos(dec_1) * math.cos(dec_2) * math.sin((ra_2 - ra_1) / 2) ** 2)
+    return math.degrees(2 * math.asin(min(1.0, math.sqrt(value)))) * 3600
@@ -5,10 +5,13 @@
 
 
 # type annotations
-from typing import Tuple, Dict, Type, Callable
+from typing import List, Tuple, Dict, Type, Callable, Optional, Iterable, Any
 
 # standard libs
 import os
+import json
+from queue import Queue, Full, Empty
+from threading import Thread, Event
 
 # internal libs
 from refitt.core.config import config, ConfigurationError
@@ -18,7 +21,7 @@ from refitt.data.broker.client import ClientInterface
 from refitt.data.broker.antares import AntaresClient
 
 # public interface
-__all__ = ['BrokerService', 'broker_map', ]
+__all__ = ['BrokerService', 'broker_map', 'DEFAULT_WORKER_COUNT', 'DEFAULT_QUEUE_SIZE', ]
 
 # module logger
 log = Logger.with_name(__name__)
@@ -30,8 +33,30 @@ broker_map: Dict[str, Type[ClientInterface]] = {
 }
 
 
+# Serial processing (no pipeline) by default
+DEFAULT_WORKER_COUNT: int = 0
+
+# Maximum number of alerts held between pipeline stages
+DEFAULT_QUEUE_SIZE: int = 100
+
+# Seconds to wait on a full/empty queue before checking for failure in another stage
+QUEUE_POLL_INTERVAL: float = 1
+
+# Sentinel value signalling end of stream to pipeline stages
+STOP_ITER = None
+
+
 class BrokerService:
-    """Subscribe to remote data brokers and stream alerts."""
+    """
+    Subscribe to remote data brokers and stream alerts.
+
+    With `workers=0` (default) alerts are filtered and persisted serially in the
+    order they are received. Otherwise, alerts are processed in a pipeline:
+    the main thread pulls from the client, a pool of `workers` threads filters and
+    serializes alerts, and a single writer thread persists them to disk and database.
+    Stages are connected by queues bounded by `queue_size` so that a slow writer
+    applies backpressure to the stream. Alert order is not preserved in this mode.
+    """
 
     broker: str
     topic: str
@@ -42,12 +67,19 @@ class BrokerService:
     local_only: bool
     database_only: bool
     enable_backfill: bool
+    workers: int
+    queue_size: int
 
     def __init__(self, broker: str, topic: str, credentials: Tuple[str, str],
                  filter_name: str = 'none', output_dir: str = os.getcwd(),
                  local_only: bool = False, database_only: bool = False,
-                 enable_backfill: bool = False) -> None:
+                 enable_backfill: bool = False, workers: int = DEFAULT_WORKER_COUNT,
+                 queue_size: int = DEFAULT_QUEUE_SIZE) -> None:
         """Initialize parameters."""
+        if workers < 0:
+            raise ValueError(f'Expected non-negative number of workers, given {workers}')
+        if queue_size < 1:
+            raise ValueError(f'Expected positive queue size, given {queue_size}')
         self.broker = broker
         self.topic = topic
         self.key, self.secret = credentials
@@ -56,6 +88,10 @@ class BrokerService:
         self.local_only = local_only
         self.database_only = database_only
         self.enable_backfill = enable_backfill
+        self.workers = workers
+        self.queue_size = queue_size
+        self._failed = Event()
+        self._errors = []
 
     def run(self) -> None:
         """Connect to broker and stream alerts."""
@@ -65,8 +101,105 @@ class BrokerService:
         alert_filter = self.get_filter(client_interface)
         log.info(f'Connecting to {self.broker} (topic={self.topic}, filter={self.filter_name})')
         with client_interface(self.topic, (key, secret)) as stream:
+            if self.workers == 0:
+                for alert_instance in stream:
+                    self.process_alert(alert_instance, alert_filter)
+            else:
+                self.run_pipeline(stream, alert_filter)
+
+    def run_pipeline(self, stream: Iterable[AlertInterface], filter_alert: Callable[[AlertInterface], bool]) -> None:
+        """Process alerts from `stream` with concurrent filter/serialize workers and a single writer."""
+        log.info(f'Starting pipeline (workers={self.workers}, queue-size={self.queue_size})')
+        inbound = Queue(maxsize=self.queue_size)
+        outbound = Queue(maxsize=self.queue_size)
+        workers = [Thread(target=self._run_worker, args=(inbound, outbound, filter_alert),
+                          name=f'BrokerServiceWorker-{num + 1}', daemon=True)
+                   for num in range(self.workers)]
+        writer = Thread(target=self._run_writer, args=(outbound, ), name='BrokerServiceWriter', daemon=True)
+        for thread in [*workers, writer]:
+            thread.start()
+        try:
             for alert_instance in stream:
-                self.process_alert(alert_instance, alert_filter)
+                if not self._put(inbound, alert_instance):
+                    break
+        finally:
+            for _ in workers:
+                self._put(inbound, STOP_ITER)
+            for thread in workers:
+                thread.join()
+            self._put(outbound, STOP_ITER)
+            writer.join()
+        if self._errors:
+            raise self._errors[0]
+
+    def _put(self, queue: Queue, item: Any) -> bool:
+        """Put `item` on `queue`, blocking while full unless another stage has failed."""
+        while not self._failed.is_set():
+            try:
+                queue.put(item, timeout=QUEUE_POLL_INTERVAL)
+                return True
+            except Full:
+                continue
+        return False
+
+    def _get(self, queue: Queue) -> Any:
+        """Get next item from `queue`, returns `STOP_ITER` if another stage has failed."""
+        while not self._failed.is_set():
+            try:
+                return queue.get(timeout=QUEUE_POLL_INTERVAL)
+            except Empty:
+                continue
+        return STOP_ITER
+
+    def _fail(self, error: Exception) -> None:
+        """Record `error` and signal all pipeline stages to stop."""
+        log.critical(f'Pipeline stage failed: {error.__class__.__name__}: {error}')
+        self._errors.append(error)
+        self._failed.set()
+
+    def _run_worker(self, inbound: Queue, outbound: Queue, filter_alert: Callable[[AlertInterface], bool]) -> None:
+        """Filter and serialize alerts from `inbound` and pass accepted alerts to `outbound`."""
+        try:
+            for alert_instance in iter(lambda: self._get(inbound), STOP_ITER):
+                if self.accept_alert(alert_instance, filter_alert):
+                    content = None if self.database_only else self.serialize_alert(alert_instance)
+                    if not self._put(outbound, (alert_instance, content)):
+                        break
+        except Exception as error:
+            self._fail(error)
+
+    def _run_writer(self, outbound: Queue) -> None:
+        """Persist accepted alerts from `outbound`, writing whatever has accumulated as one batch."""
+        try:
+            for item in iter(lambda: self._get(outbound), STOP_ITER):
+                batch = [item, ]
+                while len(batch) < self.queue_size:
+                    try:
+                        item = outbound.get_nowait()
+                    except Empty:
+                        break
+                    if item is STOP_ITER:
+                        outbound.put(item)  # NOTE: re-queue so the outer loop terminates
+                        break
+                    batch.append(item)
+                self.persist_batch(batch)
+        except Exception as error:
+            self._fail(error)
+
+    def persist_batch(self, batch: List[Tuple[AlertInterface, Optional[str]]]) -> None:
+        """Persist pre-serialized alerts to disk and database (in one transaction unless backfilling)."""
+        if not self.database_only:
+            for alert_instance, content in batch:
+                self.persist_content_to_disk(alert_instance, content)
+        if not self.local_only:
+            alerts = [alert_instance for alert_instance, _ in batch]
+            if self.enable_backfill or len(alerts) == 1:
+                for alert_instance in alerts:
+                    self.persist_to_database(alert_instance, f'{self.broker}::{alert_instance.id}')
+            else:
+                AlertInterface.batch_to_database(alerts)
+                for alert_instance in alerts:
+                    log.info(f'Written to database ({self.broker}::{alert_instance.id})')
 
     def get_credential(self, name: str) -> str:
         """Fetch from command-line argument or configuration file."""
@@ -97,16 +230,27 @@ class BrokerService:
 
     def process_alert(self, alert_instance: AlertInterface, filter_alert: Callable[[AlertInterface], bool]) -> None:
         """Process incoming `alert_instance`, optionally persist to disk and/or database."""
+        if self.accept_alert(alert_instance, filter_alert):
+            if not self.database_only:
+                self.persist_to_disk(alert_instance)
+            if not self.local_only:
+                self.persist_to_database(alert_instance, f'{self.broker}::{alert_instance.id}')
+
+    def accept_alert(self, alert_instance: AlertInterface, filter_alert: Callable[[AlertInterface], bool]) -> bool:
+        """Apply `filter_alert` to incoming `alert_instance`."""
         name = f'{self.broker}::{alert_instance.id}'
         log.info(f'Received {name}')
         if filter_alert(alert_instance) is False:
             log.info(f'Rejected by filter \'{self.filter_name}\' ({name})')
+            return False
         else:
             log.info(f'Accepted by filter \'{self.filter_name}\' ({name})')
-            if not self.database_only:
-                self.persist_to_disk(alert_instance)
-            if not self.local_only:
-                self.persist_to_database(alert_instance, name)
+            return True
+
+    @staticmethod
+    def serialize_alert(alert_instance: AlertInterface, indent: int = 4) -> str:
+        """Format `alert` as JSON text for local file."""
+        return json.dumps(alert_instance.data, indent=indent)
 
     def persist_to_disk(self, alert_instance: AlertInterface) -> None:
         """Save `alert` to local file."""
@@ -114,6 +258,13 @@ class BrokerService:
         alert_instance.to_local(filepath)
         log.info(f'Written to file ({filepath})')
 
+    def persist_content_to_disk(self, alert_instance: AlertInterface, content: str) -> None:
+        """Save already serialized `content` of `alert` to local file."""
+        filepath = os.path.join(self.output_dir, f'{alert_instance.id}.json')
+        with open(filepath, mode='w') as output:
+            output.write(content)
+        log.info(f'Written to file ({filepath})')
+
     def persist_to_database(self, alert_instance: AlertInterface, name: str) -> None:
         """Save `alert` to database (backfill if requested)."""
         alert_instance.to_database()
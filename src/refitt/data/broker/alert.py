@@ -6,7 +6,7 @@
 
 # type annotations
 from __future__ import annotations
-from typing import List, Dict, Union, Any, Optional
+from typing import List, Dict, Tuple, Union, Any, Optional
 
 # standard libs
 import json
@@ -167,13 +167,13 @@ class AlertInterface(ABC):
         object_id = self._get_object_id(object_type_id, session)
         obs_type_id = self._get_observation_type(session)
         observation_id = self._create_observation(object_id, obs_type_id, session)
-        self._record = Alert.add({'epoch_id': Epoch.latest().id,
+        self._record = Alert.add({'epoch_id': Epoch.latest_id(session),
                                   'observation_id': observation_id, 'data': self.data})
         return self._record
 
     def _create_observation(self, object_id: int, obs_type_id: int, session: Session) -> int:
         """Add observation to database and return new observation id."""
-        observation = Observation.add({'epoch_id': Epoch.latest().id,
+        observation = Observation.add({'epoch_id': Epoch.latest_id(session),
                                        'object_id': object_id, 'type_id': obs_type_id,
                                        'source_id': Source.from_name(self.source_name, session).id,
                                        'value': self.observation_value, 'error': self.observation_error,
@@ -209,7 +209,7 @@ class AlertInterface(ABC):
     def _get_object_type_id(self, session: Session) -> int:
         """Check object type and persist to database if necessary."""
         if self.object_type_name is None:
-            object_type_id = ObjectType.from_name('Unknown', session)
+            object_type_id = ObjectType.from_name('Unknown', session).id
         else:
             try:
                 object_type = ObjectType.from_name(self.object_type_name, session)
@@ -222,6 +222,126 @@ class AlertInterface(ABC):
                 object_type_id = object_type.id
         return object_type_id
 
+    @classmethod
+    def batch_to_database(cls, alerts: List[AlertInterface]) -> List[Alert]:
+        """
+        Create Object, Observation, and Alert records for many `alerts` in a single transaction.
+
+        All lookups (object types, observation types, sources, object aliases, and the
+        latest epoch) are resolved in bulk rather than per alert. The resulting records are
+        the same as if each alert had been written with `to_database` in order.
+        """
+        if not alerts:
+            return []
+        session = Session()
+        try:
+            records = cls._batch_to_database(alerts, session)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        for alert, record in zip(alerts, records):
+            alert._record = record
+        log.debug(f'Added {len(records)} alerts')
+        return records
+
+    @classmethod
+    def _batch_to_database(cls, alerts: List[AlertInterface], session: Session) -> List[Alert]:
+        """Implementation of `batch_to_database` (does not commit)."""
+        object_type_ids = cls._get_object_type_ids(alerts, session)
+        obs_type_ids = cls._get_observation_type_ids(alerts, session)
+        source_ids = cls._get_source_ids(alerts, session)
+        object_ids = cls._get_object_ids(alerts, object_type_ids, session)
+        epoch_id = Epoch.latest_id(session)
+        observations = [Observation(epoch_id=epoch_id, object_id=object_id,
+                                    type_id=obs_type_ids[alert.observation_type_name],
+                                    source_id=source_ids[alert.source_name],
+                                    value=alert.observation_value, error=alert.observation_error,
+                                    time=alert.observation_time)
+                        for alert, object_id in zip(alerts, object_ids)]
+        session.add_all(observations)
+        session.flush()
+        records = [Alert(epoch_id=epoch_id, observation_id=observation.id, data=alert.data)
+                   for alert, observation in zip(alerts, observations)]
+        session.add_all(records)
+        session.flush()
+        return records
+
+    @staticmethod
+    def _get_object_type_ids(alerts: List[AlertInterface], session: Session) -> Dict[Optional[str], int]:
+        """Map object type name to id for all `alerts`, creating types if necessary."""
+        names = {alert.object_type_name for alert in alerts}
+        lookup = {name if name is not None else 'Unknown' for name in names}
+        found = {object_type.name: object_type.id
+                 for object_type in session.query(ObjectType).filter(ObjectType.name.in_(lookup))}
+        if None in names:
+            if 'Unknown' not in found:
+                raise ObjectType.NotFound('No object_type with name=Unknown')
+            found[None] = found['Unknown']
+        for alert in alerts:
+            if alert.object_type_name not in found:
+                object_type = ObjectType(name=alert.object_type_name,
+                                         description=f'Type specified by source={alert.source_name}')
+                session.add(object_type)
+                session.flush()
+                found[object_type.name] = object_type.id
+        return found
+
+    @staticmethod
+    def _get_observation_type_ids(alerts: List[AlertInterface], session: Session) -> Dict[str, int]:
+        """Map observation type name to id for all `alerts`, creating types if necessary."""
+        names = {alert.observation_type_name for alert in alerts}
+        found = {obs_type.name: obs_type.id
+                 for obs_type in session.query(ObservationType).filter(ObservationType.name.in_(names))}
+        for alert in alerts:
+            if alert.observation_type_name not in found:
+                obs_type = ObservationType(name=alert.observation_type_name,
+                                           description=f'Type specified by source={alert.source_name}')
+                session.add(obs_type)
+                session.flush()
+                found[obs_type.name] = obs_type.id
+        return found
+
+    @staticmethod
+    def _get_source_ids(alerts: List[AlertInterface], session: Session) -> Dict[str, int]:
+        """Map source name to id for all `alerts`."""
+        names = {alert.source_name for alert in alerts}
+        found = {source.name: source.id for source in session.query(Source).filter(Source.name.in_(names))}
+        for name in names:
+            if name not in found:
+                raise Source.NotFound(f'No source with name={name}')
+        return found
+
+    @staticmethod
+    def _get_object_ids(alerts: List[AlertInterface], object_type_ids: Dict[Optional[str], int],
+                        session: Session) -> List[int]:
+        """Resolve existing objects by aliases in bulk and create new objects where necessary."""
+        names: Dict[str, set] = {}
+        for alert in alerts:
+            for provider, name in alert.object_aliases.items():
+                names.setdefault(provider, set()).add(name)
+        found: Dict[Tuple[str, Union[int, str]], Object] = {}
+        for provider, provider_names in names.items():
+            for name, record in Object.from_aliases(provider, list(provider_names), session).items():
+                found[provider, name] = record
+        objects = []
+        for alert in alerts:
+            for provider, name in alert.object_aliases.items():
+                if (provider, name) in found:
+                    record = found[provider, name]
+                    break
+            else:
+                record = Object(type_id=object_type_ids[alert.object_type_name],
+                                aliases=alert.object_aliases,
+                                ra=alert.object_ra, dec=alert.object_dec,
+                                redshift=alert.object_redshift)
+                session.add(record)
+                for provider, name in alert.object_aliases.items():
+                    found[provider, name] = record
+            objects.append(record)
+        session.flush()
+        return [record.id for record in objects]
+
     def backfill_database(self) -> List[Alert]:
         """Retroactively fill database with an alert's available prior history."""
         latest = self._record or self.to_database()
@@ -231,4 +351,4 @@ class AlertInterface(ABC):
         alert_times = [alert.observation_time.astimezone() for alert in self.previous]
         missing_alerts = [alert for alert, time in zip(self.previous, alert_times) if time not in observation_times]
         log.info(f'Backfilling {len(missing_alerts)} previous alerts')
-        return [alert.to_database() for alert in missing_alerts]
+        return self.batch_to_database(missing_alerts)
@@ -6,7 +6,7 @@
 
 # type annotations
 from __future__ import annotations
-from typing import Union, IO, NamedTuple, Dict, TypeVar, Type
+from typing import Union, IO, NamedTuple, Dict, List, Iterable, TypeVar, Type, Optional
 
 # standard libs
 import os
@@ -14,10 +14,12 @@ import re
 import json
 from io import BytesIO
 from zipfile import ZipFile
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 # external libs
-from pandas import DataFrame, read_csv
+import pyarrow
+from pyarrow import feather
+from pandas import DataFrame, read_csv, concat
 
 # internal libs
 from refitt.data.tns.interface import TNSInterface, TNSQueryCatalogResult, TNSError
@@ -47,7 +49,8 @@ class TNSCatalogError(TNSError):
 class TNSCatalog:
     """Interface for downloading and transforming TNS catalog data."""
 
-    data: DataFrame
+    __data: DataFrame
+    __index: Dict[str, Dict[str, List[int]]] = None
     last_updated: datetime = None
     interface: Type[TNSInterface] = TNSInterface
 
@@ -55,6 +58,36 @@ class TNSCatalog:
         """Direct initialization with existing `data`."""
         self.data = data if isinstance(data, DataFrame) else data.data
 
+    @property
+    def data(self) -> DataFrame:
+        """Catalog data."""
+        return self.__data
+
+    @data.setter
+    def data(self, value: DataFrame) -> None:
+        """Set catalog data (index is rebuilt on next lookup)."""
+        self.__data = value
+        self.__index = None
+
+    @property
+    def index(self) -> Dict[str, Dict[str, List[int]]]:
+        """Row positions by IAU name ('name') and by each of the internal names ('internal_names')."""
+        if self.__index is None:
+            self.__index = self.__build_index(self.__data)
+        return self.__index
+
+    @staticmethod
+    def __build_index(data: DataFrame) -> Dict[str, Dict[str, List[int]]]:
+        """Map each IAU name and each comma-separated internal name to its row positions."""
+        by_name, by_internal_name = {}, {}
+        for position, name in enumerate(data.name):
+            by_name.setdefault(name, []).append(position)
+        for position, names in enumerate(data.internal_names):
+            for internal_name in {name.strip() for name in names.split(',')} if names else ():
+                if internal_name:
+                    by_internal_name.setdefault(internal_name, []).append(position)
+        return {'name': by_name, 'internal_names': by_internal_name}
+
     @classmethod
     def from_dataframe(cls, dataframe: DataFrame) -> TNSCatalog:
         """Initialize with existing `dataframe`."""
@@ -63,31 +96,60 @@ class TNSCatalog:
     DEFAULT_EXPIRED_AFTER = timedelta(days=1)
     DEFAULT_CACHE_DIR = os.path.join(default_path.lib, 'tns')
     DEFAULT_CACHE_PATH = os.path.join(DEFAULT_CACHE_DIR, 'tns_public_objects.csv')
+    DEFAULT_BINARY_CACHE_PATH = os.path.join(DEFAULT_CACHE_DIR, 'tns_public_objects.feather')
 
     @classmethod
     def remove_cache(cls) -> None:
         """Delete cached data if it exists."""
-        if os.path.exists(cls.DEFAULT_CACHE_PATH):
-            os.remove(cls.DEFAULT_CACHE_PATH)
+        for path in (cls.DEFAULT_CACHE_PATH, cls.DEFAULT_BINARY_CACHE_PATH):
+            if os.path.exists(path):
+                os.remove(path)
 
     @classmethod
     def from_web(cls, cache: bool = True, expired_after: timedelta = DEFAULT_EXPIRED_AFTER) -> TNSCatalog:
         """Query TNS and return new catalog."""
         os.makedirs(cls.DEFAULT_CACHE_DIR, exist_ok=True)
         if cache and cls.__cache_valid(expired_after):
-            log.info(f'Loading from cache: {cls.DEFAULT_CACHE_PATH}')
-            self = cls.from_local(cls.DEFAULT_CACHE_PATH)
-            self.last_updated = datetime.fromtimestamp(os.stat(cls.DEFAULT_CACHE_PATH).st_mtime)
-            return self
+            return cls.from_cache()
         else:
             log.info(f'Fetching latest catalog')
             self = cls.from_query(cls.interface().search_catalog())
             self.last_updated = datetime.now()
             if cache:
-                log.debug(f'Writing catalog to cache: {cls.DEFAULT_CACHE_PATH}')
-                self.to_local(cls.DEFAULT_CACHE_PATH)
+                self.to_cache()
             return self
 
+    @classmethod
+    def from_cache(cls) -> TNSCatalog:
+        """Load cached catalog, from the binary cache if it is up-to-date with the CSV."""
+        self = cls.__load_binary_cache()
+        if self is None:
+            log.info(f'Loading from cache: {cls.DEFAULT_CACHE_PATH}')
+            self = cls.from_local(cls.DEFAULT_CACHE_PATH)
+            self.to_binary(cls.DEFAULT_BINARY_CACHE_PATH, source=cls.DEFAULT_CACHE_PATH)
+        self.last_updated = datetime.fromtimestamp(os.stat(cls.DEFAULT_CACHE_PATH).st_mtime)
+        return self
+
+    def to_cache(self) -> None:
+        """Write catalog to cache (CSV and binary)."""
+        log.debug(f'Writing catalog to cache: {self.DEFAULT_CACHE_PATH}')
+        self.to_local(self.DEFAULT_CACHE_PATH)
+        self.to_binary(self.DEFAULT_BINARY_CACHE_PATH, source=self.DEFAULT_CACHE_PATH)
+
+    @classmethod
+    def __load_binary_cache(cls) -> Optional[TNSCatalog]:
+        """Load binary cache if it exists and was written from the current CSV."""
+        try:
+            self = cls.from_binary(cls.DEFAULT_BINARY_CACHE_PATH, source=cls.DEFAULT_CACHE_PATH)
+        except FileNotFoundError:
+            log.debug(f'Binary cache not found: {cls.DEFAULT_BINARY_CACHE_PATH}')
+            return None
+        except (TNSCatalogError, pyarrow.ArrowException) as error:
+            log.debug(f'Binary cache invalid ({error})')
+            return None
+        log.info(f'Loaded from binary cache: {cls.DEFAULT_BINARY_CACHE_PATH}')
+        return self
+
     @classmethod
     def __cache_valid(cls, expired_after: timedelta) -> bool:
         """Check cache file is expired or missing."""
@@ -108,9 +170,12 @@ class TNSCatalog:
 
     @classmethod
     def from_zip(cls, file_or_stream: Union[str, IO]) -> TNSCatalog:
-        """Extract CSV data from inside Zip archive."""
+        """Extract CSV data from inside Zip archive (full catalog or daily changes)."""
         with ZipFile(file_or_stream) as archive:
-            with archive.open('tns_public_objects.csv') as stream:
+            names = [name for name in archive.namelist() if name.endswith('.csv')]
+            if len(names) != 1:
+                raise TNSCatalogError(f'Expected one CSV file in archive, found {names}')
+            with archive.open(names[0]) as stream:
                 return cls.from_local(BytesIO(stream.read()), skiprows=1)  # NOTE: first row is date of last change
 
     @classmethod
@@ -134,13 +199,84 @@ class TNSCatalog:
         """Write data to local disk at `filepath`."""
         self.data.to_csv(filepath, index=False, **options)  # noqa: stupid type annotations
 
-    def refresh(self, expired_after: timedelta = DEFAULT_EXPIRED_AFTER) -> None:
-        """Updates catalog if necessary."""
+    # Key in binary file metadata for the signature of the CSV it was written from
+    SOURCE_KEY = b'refitt:source'
+
+    @staticmethod
+    def __signature(filepath: str) -> bytes:
+        """Identify current contents of `filepath` by its size and modification time."""
+        stat = os.stat(filepath)
+        return f'{stat.st_size}:{stat.st_mtime_ns}'.encode()
+
+    @classmethod
+    def from_binary(cls, filepath: str, source: str = None) -> TNSCatalog:
+        """Read Feather (Arrow IPC) formatted data from local `filepath`, checking it against `source` CSV."""
+        table = feather.read_table(filepath, memory_map=True)
+        if source is not None:
+            signature = (table.schema.metadata or {}).get(cls.SOURCE_KEY)
+            if signature != cls.__signature(source):
+                raise cls.CacheInvalid(f'Binary data at {filepath} is not from the current {source}')
+        self = cls.from_dataframe(table.to_pandas())
+        self.last_updated = datetime.fromtimestamp(os.stat(filepath).st_mtime)
+        return self
+
+    def to_binary(self, filepath: str, source: str = None) -> None:
+        """Write data to local disk at `filepath` in Feather (Arrow IPC) format, signed with `source` CSV."""
+        table = pyarrow.Table.from_pandas(self.data, preserve_index=False)
+        if source is not None:
+            table = table.replace_schema_metadata({**table.schema.metadata, self.SOURCE_KEY: self.__signature(source)})
+        # NOTE: written uncompressed so it can be memory-mapped, and moved into place so readers
+        # in other processes never see a partial file
+        partial = f'{filepath}.{os.getpid()}.partial'
+        feather.write_feather(table, partial, compression='uncompressed')
+        os.replace(partial, filepath)
+
+    # Daily changes are applied for at most this many days before a full download is preferred
+    MAX_DELTA_DAYS = 30
+
+    def refresh(self, expired_after: timedelta = DEFAULT_EXPIRED_AFTER, incremental: bool = True) -> None:
+        """Updates catalog if necessary, applying daily changes if possible or otherwise downloading in full."""
         age = datetime.now() - self.last_updated
         if age > expired_after:
-            log.info(f'Catalog expired ({age} > {expired_after}')
-            self.data = self.from_web(cache=False).data
-            self.to_local(self.DEFAULT_CACHE_PATH)
+            log.info(f'Catalog expired ({age} > {expired_after})')
+            if not incremental or not self.__apply_daily_deltas():
+                log.info(f'Fetching latest catalog')
+                self.data = self.from_web(cache=False).data
+            self.last_updated = datetime.now()
+            self.to_cache()
+
+    def __apply_daily_deltas(self) -> bool:
+        """Apply TNS daily changes since last update (true if successful)."""
+        # NOTE: the day of the last update is included as it may have changed since
+        first = self.last_updated.astimezone(timezone.utc).date()
+        last = datetime.now(timezone.utc).date() - timedelta(days=1)  # published after end of day
+        days = (last - first).days + 1
+        if days < 1 or days > self.MAX_DELTA_DAYS:
+            log.debug(f'No daily changes applicable from {first} ({days} days)')
+            return False
+        interface = self.interface()
+        deltas = []
+        for day in (first + timedelta(days=i) for i in range(days)):
+            try:
+                log.debug(f'Fetching catalog changes for {day}')
+                deltas.append(self.from_query(interface.search_catalog_delta(day)))
+            except TNSError as error:
+                log.warning(f'Failed to fetch catalog changes for {day} ({error})')
+                return False
+        for delta in deltas:
+            self.apply_delta(delta)
+        return True
+
+    def apply_delta(self, delta: Union[TNSCatalog, DataFrame]) -> None:
+        """Update catalog with new or changed records from `delta` (matched by 'objid')."""
+        delta = delta if isinstance(delta, DataFrame) else delta.data
+        delta = delta.drop_duplicates('objid', keep='last')
+        data = concat([self.data.loc[~self.data.objid.isin(delta.objid)], delta], ignore_index=True)
+        self.data = data.sort_values('objid', ascending=False, kind='stable', ignore_index=True)
+        log.info(f'Applied {len(delta)} changed records to catalog')
+
+    class CacheInvalid(TNSCatalogError):
+        """Binary cache does not match the CSV data."""
 
     class NoRecordsFound(TNSCatalogError):
         """No records found for the given filters."""
@@ -150,36 +286,58 @@ class TNSCatalog:
 
     def get(self, name: str) -> TNSRecord:
         """Look up object by `name` in catalog."""
+        record, = self.__build_records([self.__find(name)])
+        return record
+
+    def get_many(self, names: Iterable[str]) -> Dict[str, TNSRecord]:
+        """Look up objects by `names` in catalog (names without a unique record are left out)."""
+        positions = {}
+        for name in names:
+            try:
+                positions[name] = self.__find(name)
+            except TNSCatalogError as error:
+                log.debug(str(error))
+        return dict(zip(positions, self.__build_records(list(positions.values()))))
+
+    def __find(self, name: str) -> int:
+        """Row position of unique record for `name`."""
         for provider, pattern in OBJECT_NAMING_PATTERNS.items():
             if pattern.match(name):
                 if provider == 'iau':
-                    return self.__get_from_iau(name)
+                    return self.__find_from_iau(name)
                 else:
-                    return self.__get_from_internal_names(name)
+                    return self.__find_from_internal_names(name)
         else:
             raise self.NoRecordsFound(f'Unrecognized name pattern \'{name}\'')
 
-    def __get_from_iau(self, name: str) -> TNSRecord:
+    def __find_from_iau(self, name: str) -> int:
         """Look up record against exact matching IAU `name`."""
-        results = self.data.loc[self.data.name == name]
-        if len(results) == 0:
+        positions = self.index['name'].get(name, [])
+        if len(positions) == 0:
             raise self.NoRecordsFound(f'No record with name == {name}')
-        if len(results) == 1:
-            return TNSRecord(**json.loads(results.iloc[0].to_json()))
+        if len(positions) == 1:
+            return positions[0]
         else:
             raise self.MultipleRecordsFound(f'Multiple records with name == {name}')
 
-    def __get_from_internal_names(self, name: str) -> TNSRecord:
-        """Fuzzy match of `name` against `internal_names` list."""
-        results = self.data.loc[self.data.internal_names.str.contains(name)]
-        if len(results) == 0:
+    def __find_from_internal_names(self, name: str) -> int:
+        """Match of `name` against any one of the `internal_names`."""
+        positions = self.index['internal_names'].get(name, [])
+        if len(positions) == 0:
             raise self.NoRecordsFound(f'No record with object_names ~ {name}')
-        if len(results) == 1:
-            # NOTE: only safe way to guarantee json-safe types is to rely on pandas to do it :(
-            return TNSRecord(**json.loads(results.iloc[0].to_json()))
+        if len(positions) == 1:
+            return positions[0]
         else:
             raise self.MultipleRecordsFound(f'Multiple records with object_names ~ {name}')
 
+    def __build_records(self, positions: List[int]) -> List[TNSRecord]:
+        """Build records for rows at `positions`."""
+        # NOTE: only safe way to guarantee json-safe types is to rely on pandas to do it :(
+        if not positions:
+            return []
+        return [TNSRecord(**record) for record in
+                json.loads(self.data.iloc[positions].to_json(orient='records'))]
+
 
 TNSValue = TypeVar('TNSValue', int, float, str)
 class TNSRecord(NamedTuple):
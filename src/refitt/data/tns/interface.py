@@ -6,10 +6,14 @@
 
 # type annotations
 from __future__ import annotations
-from typing import Dict, Any, Optional, Union, Type, Tuple
+from typing import Dict, Any, Optional, Union, Type, Tuple, Mapping
 
 # standard libs
 import json
+import time
+import random
+import threading
+from datetime import date
 from dataclasses import dataclass
 from functools import cached_property
 from abc import ABC, abstractclassmethod
@@ -25,7 +29,7 @@ from refitt.core.schema import DictSchema, SchemaError, ListSchema
 
 # public interface
 __all__ = ['TNSInterface', 'TNSError', 'TNSConfig', 'TNSNameSearchResult', 'TNSObjectSearchResult',
-           'TNSQueryCatalogResult', ]
+           'TNSQueryCatalogResult', 'RateLimiter', ]
 
 # module logger
 log = Logger.with_name(__name__)
@@ -74,42 +78,140 @@ class TNSConfig:
 
 
 TNS_URL_BASE = 'https://www.wis-tns.org'
-TNS_URL_SEARCH = f'{TNS_URL_BASE}/api/get/search'
-TNS_URL_OBJECT = f'{TNS_URL_BASE}/api/get/object'
-TNS_URL_CATALOG = f'{TNS_URL_BASE}/system/files/tns_public_objects/tns_public_objects.csv.zip'
+TNS_PATH_SEARCH = '/api/get/search'
+TNS_PATH_OBJECT = '/api/get/object'
+TNS_PATH_CATALOG = '/system/files/tns_public_objects/tns_public_objects.csv.zip'
+TNS_PATH_CATALOG_DELTA = '/system/files/tns_public_objects/tns_public_objects_{date}.csv.zip'
 
 
 class TNSError(Exception):
     """Exception raises from bad requests to TNS service."""
 
 
+class RateLimiter:
+    """Token bucket allowing `rate` requests per second with bursts of up to `burst` (thread-safe)."""
+
+    rate: float
+    burst: int
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        """Initialize with full bucket."""
+        self.rate = rate
+        self.burst = burst
+        self.__tokens = float(burst)
+        self.__updated = time.monotonic()
+        self.__paused_until = 0.0
+        self.__lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Block until next request is allowed, returns seconds waited."""
+        waited = 0.0
+        while True:
+            with self.__lock:
+                now = time.monotonic()
+                if now < self.__paused_until:
+                    delay = self.__paused_until - now
+                else:
+                    self.__tokens = min(self.burst, self.__tokens + (now - self.__updated) * self.rate)
+                    self.__updated = now
+                    if self.__tokens >= 1:
+                        self.__tokens -= 1
+                        return waited
+                    delay = (1 - self.__tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def pause(self, seconds: float) -> None:
+        """Allow no requests for the next `seconds` (bucket refills only afterward)."""
+        with self.__lock:
+            self.__paused_until = max(self.__paused_until, time.monotonic() + seconds)
+            self.__tokens = 0.0
+            self.__updated = self.__paused_until
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        """Pause if rate-limit `headers` from server say no requests remain until reset."""
+        try:
+            remaining = int(headers.get('x-rate-limit-remaining', 1))
+            reset = float(headers.get('x-rate-limit-reset', 0))
+        except ValueError:
+            return
+        if remaining <= 0 and reset > 0:
+            log.info(f'TNS rate limit reached (reset in {reset} seconds)')
+            self.pause(reset)
+
+
+# NOTE: TNS allows bots about 90 requests per minute
+DEFAULT_RATE_LIMIT: float = 1.5
+DEFAULT_RATE_BURST: int = 10
+
+
 class TNSInterface:
     """Query interface for Transient Name Server."""
 
     config: TNSConfig
+    session: requests.Session
+    url_base: str = TNS_URL_BASE
 
-    def __init__(self, cfg: Union[dict, TNSConfig] = None) -> None:
+    # NOTE: shared by all instances (e.g., across threads) unless given explicitly
+    limiter: RateLimiter = RateLimiter(DEFAULT_RATE_LIMIT, DEFAULT_RATE_BURST)
+
+    timeout: float = 60          # Seconds to wait on server before giving up
+    max_retries: int = 5         # Retries on rate-limited (429) or server error (5xx) responses
+    backoff_base: float = 1      # Seconds before first retry (doubled on each retry, with jitter)
+    backoff_max: float = 60      # Upper limit on seconds between retries
+
+    def __init__(self, cfg: Union[dict, TNSConfig] = None, url_base: str = None, limiter: RateLimiter = None) -> None:
         """Initialize TNSConfig with `cfg`."""
         self.config = cfg if isinstance(cfg, TNSConfig) else TNSConfig.from_config(cfg)
+        self.url_base = url_base or self.url_base
+        self.limiter = limiter or self.limiter
+        self.session = requests.Session()
+        self.session.headers.update(self.config.headers)
 
     @cached_property
     def endpoint_map(self) -> Dict[str, Tuple[str, Type[TNSQueryResult]]]:
         """Map of endpoint label with request URL and result interface."""
         return {
-            'name': (TNS_URL_SEARCH, TNSNameSearchResult),
-            'object': (TNS_URL_OBJECT, TNSObjectSearchResult),
-            'catalog': (TNS_URL_CATALOG, TNSQueryCatalogResult),
+            'name': (self.url_base + TNS_PATH_SEARCH, TNSNameSearchResult),
+            'object': (self.url_base + TNS_PATH_OBJECT, TNSObjectSearchResult),
+            'catalog': (self.url_base + TNS_PATH_CATALOG, TNSQueryCatalogResult),
+            'catalog_delta': (self.url_base + TNS_PATH_CATALOG_DELTA, TNSQueryCatalogResult),
         }
 
-    def query(self, endpoint: str, **parameters) -> requests.Response:
-        """Issue request to TNS endpoint `url` with `data` and `headers`."""
+    def query(self, endpoint: str, url_args: Dict[str, str] = None, **parameters) -> requests.Response:
+        """Issue request to TNS endpoint `url` (formatted with `url_args`) with `data` and `headers`."""
         data = self.config.format_data(**parameters)
         url, response_type = self.endpoint_map[endpoint]
-        response = requests.post(url, data=data, headers=self.config.headers)
-        if response.status_code == 200:
-            return response
-        else:
-            raise TNSError(response.status_code, endpoint)
+        url = url.format(**(url_args or {}))
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            response = self.session.post(url, data=data, timeout=self.timeout)
+            self.limiter.update(response.headers)
+            if response.status_code == 200:
+                return response
+            if not self.__retry_allowed(response.status_code) or attempt == self.max_retries:
+                break
+            delay = self.__backoff(attempt, response.headers)
+            log.warning(f'TNS responded {response.status_code} for {endpoint} '
+                        f'(retry {attempt + 1} of {self.max_retries} in {delay:.2f} seconds)')
+            if response.status_code == 429:
+                self.limiter.pause(delay)  # hold off other threads as well
+            else:
+                time.sleep(delay)
+        raise TNSError(response.status_code, endpoint)
+
+    @staticmethod
+    def __retry_allowed(status_code: int) -> bool:
+        """Response may succeed on retry (rate-limited or server error)."""
+        return status_code == 429 or 500 <= status_code < 600
+
+    def __backoff(self, attempt: int, headers: Mapping[str, str]) -> float:
+        """Seconds to wait before retry with exponential backoff and full jitter (or as server requests)."""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        try:
+            return max(delay, float(headers.get('retry-after', 0)))
+        except ValueError:
+            return delay
 
     def search_name(self, ztf_id: str) -> TNSNameSearchResult:
         """Query TNS with internal `ztf_id`."""
@@ -123,6 +225,10 @@ class TNSInterface:
         """Query TNS for full data catalog."""
         return TNSQueryCatalogResult.from_response(self.query('catalog'))
 
+    def search_catalog_delta(self, day: date) -> TNSQueryCatalogResult:
+        """Query TNS for catalog records added or changed on `day` (UTC)."""
+        return TNSQueryCatalogResult.from_response(self.query('catalog_delta', url_args={'date': f'{day:%Y%m%d}'}))
+
 
 @dataclass
 class TNSQueryResult(ABC):
@@ -10,9 +10,13 @@ from typing import Union, Dict
 
 # standard libs
 import re
+import time
 from datetime import datetime
 from abc import ABC, abstractmethod
 
+# external libs
+from sqlalchemy.exc import IntegrityError, DatabaseError, OperationalError
+
 # internal libs
 from refitt.core.logging import Logger
 from refitt.database.model import Object, ObjectType
@@ -26,19 +30,108 @@ __all__ = ['TNSManager', 'TNSQueryManager', 'TNSCatalogManager', ]
 log = Logger.with_name(__name__)
 
 
+# Object updates are written together once this many are pending
+DEFAULT_FLUSH_SIZE: int = 100
+
+# Object updates are not left pending for longer than this (seconds)
+DEFAULT_FLUSH_INTERVAL: float = 10
+
+
 class TNSManager(ABC):
-    """Generic interface for managing the TNSInterface to update objects in the database."""
+    """
+    Generic interface for managing the TNSInterface to update objects in the database.
+
+    Object updates are held as pending and written in batches by `flush`, which
+    callers must invoke when done (e.g., `TNSServiceWorker.run`).
+    """
 
     tns: TNSInterface
+    flush_size: int
+    flush_interval: float
 
-    def __init__(self, tns: TNSInterface = None) -> None:
+    __pending: Dict[int, dict]
+    __pending_since: float = None
+
+    def __init__(self, tns: TNSInterface = None, flush_size: int = DEFAULT_FLUSH_SIZE,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL) -> None:
         """Initialize from existing TNSInterface (or create from configuration)."""
         self.tns = tns or TNSInterface()
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.__pending = {}
 
     @classmethod
-    def from_config(cls, config: Union[dict, TNSConfig] = None) -> TNSManager:
+    def from_config(cls, config: Union[dict, TNSConfig] = None, **options) -> TNSManager:
         """Initialized manager from TNSConfig."""
-        return cls(TNSInterface(config))
+        return cls(TNSInterface(config), **options)
+
+    def get_object(self, name: str) -> Object:
+        """Look up object by `name` (pending updates to the object are written first)."""
+        object = Object.from_name(name)
+        if object.id in self.__pending:
+            self.flush()  # NOTE: commit expires `object` so it reloads with the new values
+        return object
+
+    def queue_update(self, object_id: int, info: dict) -> None:
+        """Add `info` to pending updates, written when enough are pending or after some time."""
+        if not self.__pending:
+            self.__pending_since = time.monotonic()
+        self.__pending[object_id] = info
+        self.check_flush()
+
+    @property
+    def pending(self) -> int:
+        """Count of pending object updates."""
+        return len(self.__pending)
+
+    def check_flush(self) -> None:
+        """Write pending updates if there are enough of them or the oldest is too old."""
+        if self.__pending and (len(self.__pending) >= self.flush_size or
+                               time.monotonic() - self.__pending_since >= self.flush_interval):
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write all pending object updates to the database.
+
+        If the batch fails, updates are retried one object at a time. Those that still fail
+        are logged and dropped. If the database cannot be reached, updates not yet written
+        remain pending and the error is raised.
+        """
+        if not self.__pending:
+            return
+        pending, self.__pending = self.__pending, {}
+        latency = time.monotonic() - self.__pending_since
+        start = time.monotonic()
+        try:
+            Object.update_all(pending)
+        except OperationalError:
+            self.__restore(pending)
+            raise
+        except (AttributeError, IntegrityError, DatabaseError) as error:
+            log.warning(f'Failed to write {len(pending)} object updates together ({error}), retrying separately')
+            self.__write_each(pending)
+        else:
+            log.info(f'Wrote {len(pending)} object updates ({time.monotonic() - start:.3f} seconds, '
+                     f'oldest pending {latency:.3f} seconds)')
+
+    def __write_each(self, pending: Dict[int, dict]) -> None:
+        """Write `pending` updates one object at a time, logging (and dropping) those that fail."""
+        remaining = dict(pending)
+        for object_id, info in pending.items():
+            try:
+                Object.update_all({object_id: info})
+            except OperationalError:
+                self.__restore(remaining)
+                raise
+            except (AttributeError, IntegrityError, DatabaseError) as error:
+                log.error(f'Failed to update object ({object_id}): {error}')
+            remaining.pop(object_id)
+
+    def __restore(self, pending: Dict[int, dict]) -> None:
+        """Put unwritten updates back (behind any queued since)."""
+        self.__pending = {**pending, **self.__pending}
+        log.error(f'Failed to write {len(pending)} object updates (kept pending)')
 
     @abstractmethod
     def update_object(self, name: str) -> None:
@@ -52,6 +145,10 @@ class TNSManager(ABC):
         is appended with the previous values (if different).
 
         The full TNS payload is retained within `object.data.tns` less the 'photometry'.
+
+        Changes to existing objects are only queued; nothing is written to the database
+        until `flush` is called (automatically once `flush_size` updates are pending or the
+        oldest is `flush_interval` seconds old, see `check_flush`).
         """
 
 
@@ -70,9 +167,10 @@ class TNSQueryManager(TNSManager):
         """
         Information gathered by querying the live TNS service.
         First for the IAU name if not given explicitly, and then for the data.
+        The update is queued, not written until `flush` is called.
         """
         try:
-            object = Object.from_name(name)
+            object = self.get_object(name)
         except Object.NotFound as error:
             log.warning(f'Cannot add new objects using TNSQueryManager')
             raise TNSError(str(error)) from error
@@ -92,13 +190,13 @@ class TNSQueryManager(TNSManager):
             raise TNSError(f'No data on object {name}')
         else:
             if info := self.__build_info(name, object, response):
-                Object.update(object.id, **info)
+                self.queue_update(object.id, info)
             else:
                 log.info(f'No changes for {name}')
 
     def __build_info(self, iau_name: str, obj: Object, tns_response: TNSObjectSearchResult) -> dict:
         """
-        Build attributes for `Object.update` method.
+        Build attributes for `Object.update_all` method.
         If the new info is different, the `history` section is appended.
         """
         type_id = self.__get_type_id(tns_response)
@@ -145,9 +243,12 @@ class TNSCatalogManager(TNSManager):
     __catalog: TNSCatalog = None
 
     def update_object(self, name: str) -> None:
-        """Look up object by `name` and update database with info from TNSCatalog."""
+        """
+        Look up object by `name` and update database with info from TNSCatalog.
+        New objects are added immediately, changes to existing objects are queued until `flush`.
+        """
         try:
-            object = Object.from_name(name)
+            object = self.get_object(name)
         except Object.NotFound:
             record = self.catalog.get(name)  # must be name pattern recognized by catalog
             log.info(f'Creating new object for {name}')
@@ -167,7 +268,7 @@ class TNSCatalogManager(TNSManager):
             record = self.catalog.get(name)
             self.__ensure_iau_pattern(record.name)
             if info := self.__build_info(object, record):
-                Object.update(object.id, **info)
+                self.queue_update(object.id, info)
             else:
                 log.info(f'No changes found for {name}')
 
@@ -198,7 +299,7 @@ class TNSCatalogManager(TNSManager):
 
     def __build_info(self, obj: Object, record: TNSRecord) -> dict:
         """
-        Build attributes for `Object.update` method.
+        Build attributes for `Object.update_all` method.
         If the new info is different, the `history` section is appended.
         """
         type_id = self.__get_type_id(record)
@@ -6,12 +6,12 @@
 
 # type annotations
 from __future__ import annotations
-from typing import List, Dict, IO, Iterable, Iterator, Type
+from typing import List, Dict, IO, Iterable, Iterator, Type, Optional
 
 # standard libs
 import re
 from abc import ABC
-from queue import Queue
+from queue import Queue, Empty
 from threading import Thread
 
 # external libs
@@ -20,7 +20,8 @@ from streamkit.subscriber import Subscriber
 # internal libs
 from refitt.core.logging import Logger
 from refitt.data.tns.interface import TNSError
-from refitt.data.tns.manager import TNSManager, TNSQueryManager, TNSCatalogManager
+from refitt.data.tns.manager import (TNSManager, TNSQueryManager, TNSCatalogManager,
+                                     DEFAULT_FLUSH_SIZE, DEFAULT_FLUSH_INTERVAL)
 
 # public interface
 __all__ = ['TNSServiceWorker', 'TNSServiceThread', 'TNSService', ]
@@ -36,21 +37,28 @@ MESSAGE_PATTERN = re.compile(r'Written to database \(([a-z]+)::([a-zA-Z0-9]+)\)'
 # Sentinel value signalling stop iteration on queue-based service workers
 STOP_ITER = ''
 
+# Value signalling no names arrived on queue-based service workers within the flush interval
+IDLE = None
+
 
 class TNSServiceWorker(ABC):
     """Object info update service worker using TNS query interface."""
 
-    source: Iterable[str]
+    source: Iterable[Optional[str]]
     manager: TNSManager  # NOTE: implementation class must initialize manager
 
-    def __init__(self, source: Iterable[str]) -> None:
-        """Directly initialize TNS service worker with a `source` of names."""
+    def __init__(self, source: Iterable[Optional[str]], **options) -> None:
+        """Directly initialize TNS service worker with a `source` of names (`options` for manager)."""
         self.source = source
 
     def run(self) -> None:
-        """Run service until `source` exhausted (if ever)."""
+        """Run service until `source` exhausted (if ever), writing pending updates while idle and at the end."""
         for name in self.source:
-            self.update_object(name)
+            if name is IDLE:
+                self.manager.check_flush()
+            else:
+                self.update_object(name)
+        self.manager.flush()
 
     def update_object(self, name: str) -> None:
         """Attempt to update information on object (`name`) in database."""
@@ -60,27 +68,41 @@ class TNSServiceWorker(ABC):
             log.error(str(error))
 
     @classmethod
-    def from_queue(cls, queue: Queue) -> TNSServiceWorker:
+    def from_queue(cls, queue: Queue, **options) -> TNSServiceWorker:
         """Initialize from iterable `queue`."""
-        return cls(iter(queue.get, STOP_ITER))
+        timeout = options.get('flush_interval', DEFAULT_FLUSH_INTERVAL)
+        return cls(cls.__yield_from_queue(queue, timeout), **options)
+
+    @staticmethod
+    def __yield_from_queue(queue: Queue, timeout: float) -> Iterator[Optional[str]]:
+        """Yield names from `queue` until STOP_ITER, or IDLE after waiting `timeout` seconds."""
+        while True:
+            try:
+                name = queue.get(timeout=timeout)
+            except Empty:
+                yield IDLE
+            else:
+                if name == STOP_ITER:
+                    return
+                yield name
 
 
 class TNSQueryServerWorker(TNSServiceWorker):
     """TNS service working using the query manager for its interface."""
 
-    def __init__(self, source: Iterable[str]) -> None:
+    def __init__(self, source: Iterable[Optional[str]], **options) -> None:
         """Directly initialize TNS service worker with a `source` of names."""
         super().__init__(source)
-        self.manager = TNSQueryManager.from_config()
+        self.manager = TNSQueryManager.from_config(**options)
 
 
 class TNSCatalogServerWorker(TNSServiceWorker):
     """TNS service working using the catalog manager for its interface."""
 
-    def __init__(self, source: Iterable[str]) -> None:
+    def __init__(self, source: Iterable[Optional[str]], **options) -> None:
         """Directly initialize TNS service worker with a `source` of names."""
         super().__init__(source)
-        self.manager = TNSCatalogManager.from_config()
+        self.manager = TNSCatalogManager.from_config(**options)
 
 
 SERVICE_WORKER_TYPES: Dict[str, Type[TNSServiceWorker]] = {
@@ -98,9 +120,9 @@ class TNSServiceThread(Thread):
 
     service: TNSServiceWorker
 
-    def __init__(self, thread_id: int, queue: Queue, provider: str = DEFAULT_PROVIDER) -> None:
-        """Initialize thread with integer identifier and queue for names."""
-        self.service = SERVICE_WORKER_TYPES[provider].from_queue(queue)
+    def __init__(self, thread_id: int, queue: Queue, provider: str = DEFAULT_PROVIDER, **options) -> None:
+        """Initialize thread with integer identifier and queue for names (`options` for manager)."""
+        self.service = SERVICE_WORKER_TYPES[provider].from_queue(queue, **options)
         super().__init__(name=f'TNSServerThread-{thread_id}')
 
     def run(self) -> None:
@@ -121,13 +143,16 @@ class TNSService:
     workers: List[TNSServiceThread]
 
     def __init__(self, source: Iterable[str], threads: int = DEFAULT_THREAD_COUNT,
-                 provider: str = DEFAULT_PROVIDER) -> None:
+                 provider: str = DEFAULT_PROVIDER, flush_size: int = DEFAULT_FLUSH_SIZE,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL) -> None:
         """Initialize service from iterable `source` of names."""
         if provider == 'catalog' and threads > 1:
             raise ValueError(f'Cannot have multiple threads for TNSCatalogServiceWorker')
         self.source = source
         self.queue = Queue(maxsize=threads)
-        self.workers = [TNSServiceThread(num + 1, self.queue, provider) for num in range(threads)]
+        self.workers = [TNSServiceThread(num + 1, self.queue, provider,
+                                         flush_size=flush_size, flush_interval=flush_interval)
+                        for num in range(threads)]
 
     def run(self) -> None:
         """Start worker threads and feed queue names."""
@@ -141,15 +166,16 @@ class TNSService:
             worker.join()
 
     @classmethod
-    def from_io(cls, stream: IO, threads: int = DEFAULT_THREAD_COUNT, provider: str = DEFAULT_PROVIDER) -> TNSService:
+    def from_io(cls, stream: IO, threads: int = DEFAULT_THREAD_COUNT, provider: str = DEFAULT_PROVIDER,
+                **options) -> TNSService:
         """Initialize TNSServiceWorker from iterable I/O `stream`."""
-        return cls(cls.__yield_names_from_io(stream), threads=threads, provider=provider)
+        return cls(cls.__yield_names_from_io(stream), threads=threads, provider=provider, **options)
 
     @classmethod
     def from_subscriber(cls, subscriber: Subscriber, threads: int = DEFAULT_THREAD_COUNT,
-                        provider: str = DEFAULT_PROVIDER) -> TNSService:
+                        provider: str = DEFAULT_PROVIDER, **options) -> TNSService:
         """Initialize TNSServiceWorker with subscriber stream."""
-        return cls(cls.__yield_names_from_subscriber(subscriber), threads=threads, provider=provider)
+        return cls(cls.__yield_names_from_subscriber(subscriber), threads=threads, provider=provider, **options)
 
     @staticmethod
     def __yield_names_from_subscriber(subscriber: Subscriber) -> Iterator[str]:
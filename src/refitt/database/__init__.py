@@ -12,6 +12,7 @@ from typing import List, Dict, Any, Type
 import json
 
 # external libs
+from sqlalchemy import Column, Index, inspect
 from sqlalchemy.engine import Engine
 
 # internal libs
@@ -21,7 +22,7 @@ from refitt.database.interface import engine as __engine, Session, config
 from refitt.database.model import ModelInterface, tables
 
 # public interface
-__all__ = ['create_all', 'drop_all', 'load_all', 'config', ]
+__all__ = ['create_all', 'drop_all', 'load_all', 'add_column', 'add_index', 'config', ]
 
 # module logger
 log = Logger.with_name(__name__)
@@ -39,6 +40,26 @@ def drop_all(base: Type[ModelInterface] = ModelInterface, engine: Engine = __eng
     base.metadata.drop_all(engine)
 
 
+def add_column(column: Column, engine: Engine = __engine) -> bool:
+    """Add `column` to its existing table if missing (returns True if added)."""
+    table = column.table
+    existing = [info['name'] for info in inspect(engine).get_columns(table.name, schema=table.schema)]
+    if column.name in existing:
+        return False
+    name = table.name if not table.schema else f'{table.schema}.{table.name}'
+    log.info(f'Adding column {column.name} to {name}')
+    with engine.begin() as connection:
+        connection.exec_driver_sql(f'ALTER TABLE {name} ADD COLUMN {column.name} '
+                                   f'{column.type.compile(dialect=engine.dialect)}')
+    return True
+
+
+def add_index(index: Index, engine: Engine = __engine) -> None:
+    """Create `index` if it does not already exist."""
+    log.info(f'Creating index {index.name}')
+    index.create(engine, checkfirst=True)
+
+
 def __load_records(base: Type[ModelInterface], path: str) -> List[Dict[str, Any]]:
     """Load all records from JSON file `path` into model of type `base`."""
     return [base.from_json(record) for record in json.loads(assets.load_asset(path))]
@@ -6,15 +6,19 @@
 
 # type annotations
 from __future__ import annotations
+from typing import Dict, Any
 
 # standard libs
 import sys
+import time
+import threading
 from contextlib import contextmanager
 
 # external libs
 from cmdkit.app import exit_status
 from sqlalchemy.engine import Engine, create_engine
 from sqlalchemy.exc import IntegrityError, ArgumentError
+from sqlalchemy.pool import Pool, QueuePool
 from sqlalchemy.orm import sessionmaker, scoped_session
 
 # internal libs
@@ -24,7 +28,8 @@ from refitt.core.config import config, Namespace, ConfigurationError
 from refitt.database.url import DatabaseURL
 
 # public interface
-__all__ = ['providers', 'engine', 'schema', 'Session', 'config', ]
+__all__ = ['providers', 'engine', 'schema', 'Session', 'config', 'epoch_config', 'pool_config',
+           'TimedQueuePool', 'pool_status', ]
 
 
 # Allowed database providers
@@ -42,6 +47,18 @@ config = Namespace(config.database)
 schema = config.pop('schema', None)
 engine_echo = config.pop('echo', False)
 connect_args = config.pop('connect_args', {})
+epoch_config = Namespace(config.pop('epoch', {}))
+pool_config = Namespace(config.pop('pool', {}))
+
+
+# Allowed options in 'database.pool' with their types and create_engine() argument names
+pool_options = {
+    'size': (int, 'pool_size'),
+    'max_overflow': (int, 'max_overflow'),
+    'recycle': (int, 'pool_recycle'),
+    'timeout': ((int, float), 'pool_timeout'),
+    'pre_ping': (bool, 'pool_pre_ping'),
+}
 
 
 def get_url() -> DatabaseURL:
@@ -56,6 +73,55 @@ def get_url() -> DatabaseURL:
         raise ConfigurationError(str(error)) from error
 
 
+class TimedQueuePool(QueuePool):
+    """Connection pool which records time spent waiting on connections at checkout."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        """Initialize with counters for wait statistics."""
+        super().__init__(*args, **kwargs)
+        self.__lock = threading.Lock()
+        self.__wait_count = 0
+        self.__wait_total = 0.0
+        self.__wait_max = 0.0
+
+    def _do_get(self):
+        """Checkout connection and record elapsed time."""
+        start = time.monotonic()
+        try:
+            return super()._do_get()
+        finally:
+            self.__record(time.monotonic() - start)
+
+    def __record(self, elapsed: float) -> None:
+        """Add `elapsed` seconds to wait statistics."""
+        with self.__lock:
+            self.__wait_count += 1
+            self.__wait_total += elapsed
+            self.__wait_max = max(self.__wait_max, elapsed)
+
+    def wait_stats(self) -> Dict[str, float]:
+        """Count of checkouts with total and maximum wait time (seconds)."""
+        with self.__lock:
+            return {'count': self.__wait_count, 'total': self.__wait_total, 'max': self.__wait_max}
+
+
+def get_pool_options() -> Dict[str, Any]:
+    """Prepare create_engine() pool arguments from 'database.pool' configuration."""
+    options = {}
+    for name, value in pool_config.items():
+        if name not in pool_options:
+            raise ConfigurationError(f'Unsupported option \'database.pool.{name}\' '
+                                     f'(expected one of {list(pool_options)})')
+        types, argument = pool_options[name]
+        if not isinstance(value, types) or (types is int and isinstance(value, bool)):
+            raise ConfigurationError(f'Unexpected type for \'database.pool.{name}\' '
+                                     f'({value.__class__.__name__}: {value})')
+        options[argument] = value
+    if config.provider != 'sqlite':
+        options['poolclass'] = TimedQueuePool
+    return options
+
+
 def get_engine() -> Engine:
     """Create engine instance from DatabaseURL."""
     if not isinstance(engine_echo, bool):
@@ -65,9 +131,25 @@ def get_engine() -> Engine:
             log = Logger.with_name('sqlalchemy.engine')
             log.addHandler(handler)
             log.setLevel(INFO)
-        return create_engine(get_url().encode(), connect_args=connect_args)
+        return create_engine(get_url().encode(), connect_args=connect_args, **get_pool_options())
     except ArgumentError as error:
         raise ConfigurationError(f'Database engine: ({error})') from error
+    except TypeError as error:
+        # NOTE: SQLite uses a pool without sizing (e.g., NullPool) and rejects those options
+        raise ConfigurationError(f'Database pool: ({error})') from error
+
+
+def pool_status(pool: Pool = None) -> Dict[str, Any]:
+    """Current statistics for connection `pool` (default is that of the global engine)."""
+    pool = pool or engine.pool
+    status = {'class': pool.__class__.__name__}
+    if isinstance(pool, QueuePool):
+        status.update({'size': pool.size(), 'checked_in': pool.checkedin(),
+                       'checked_out': pool.checkedout(), 'overflow': pool.overflow(),
+                       'timeout': pool.timeout()})
+    if isinstance(pool, TimedQueuePool):
+        status['wait'] = pool.wait_stats()
+    return status
 
 
 try:
@@ -6,7 +6,7 @@
 
 # type annotations
 from __future__ import annotations
-from typing import List, Tuple, Dict, Any, Type, Optional, Callable, TypeVar, Union, Protocol
+from typing import List, Tuple, Dict, Any, Type, Optional, Callable, TypeVar, Union, Protocol, Iterator
 
 # standard libs
 import re
@@ -18,28 +18,35 @@ from functools import lru_cache, cached_property
 from dataclasses import dataclass
 
 # external libs
-from pandas import DataFrame
+import numpy as np
 from names_generator.names import LEFT, RIGHT
-from sqlalchemy import Column, ForeignKey, Index, func, type_coerce, or_
+from sqlalchemy import Column, ForeignKey, Index, func, or_, and_, select, event, inspect, literal
+from sqlalchemy.engine import Connection
 from sqlalchemy.ext.declarative import declared_attr, declarative_base
-from sqlalchemy.orm import relationship, aliased, joinedload, Query
+from sqlalchemy.orm import relationship, joinedload, selectinload, deferred, Query
 from sqlalchemy.exc import IntegrityError, NoResultFound, MultipleResultsFound
-from sqlalchemy.types import Integer, BigInteger, DateTime, Float, Text, String, JSON, Boolean, LargeBinary
+from sqlalchemy.types import (Integer, BigInteger, DateTime, Float, Text, String, JSON, Boolean, LargeBinary,
+                              TypeDecorator)
 from sqlalchemy.schema import Sequence, CheckConstraint
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import JSONB, ARRAY, DOUBLE_PRECISION
 
 # internal libs
+from refitt.core import sky, airmass, arrays
+from refitt.core.cache import TTLCache
+from refitt.core.config import ConfigurationError
 from refitt.core.logging import Logger
-from refitt.database.interface import schema, config, Session as _Session
+from refitt.database import store
+from refitt.database.interface import schema, config, epoch_config, Session as _Session
 from refitt.web.token import Key, Secret, Token, JWT
 
 # public interface
 __all__ = ['DatabaseError', 'NotFound', 'NotDistinct', 'AlreadyExists', 'IntegrityError',
            'ModelInterface', 'Level', 'Topic', 'Host', 'Subscriber', 'Message', 'Access',
-           'User', 'Facility', 'FacilityMap', 'ObjectType', 'Object', 'SourceType',
+           'User', 'Facility', 'FacilityMap', 'ObjectType', 'Object', 'ObjectAlias', 'SourceType',
            'Source', 'ObservationType', 'Observation', 'Alert', 'FileType', 'File',
-           'RecommendationTag', 'Epoch', 'Recommendation', 'ModelType', 'Model',
-           'Client', 'Session', 'tables', 'indices', 'DEFAULT_EXPIRE_TIME', 'DEFAULT_CLIENT_LEVEL', ]
+           'RecommendationTag', 'Epoch', 'Recommendation', 'RecommendationQueue', 'ModelType', 'Model',
+           'Client', 'Session', 'tables', 'indices', 'DEFAULT_EXPIRE_TIME', 'DEFAULT_CLIENT_LEVEL',
+           'FILE_CHUNKSIZE', ]
 
 # module logger
 log = Logger.with_name(__name__)
@@ -124,6 +131,47 @@ def _dump(value: __RT) -> __VT:
     return __dump_imp(value, __dumpers)
 
 
+# Column types needing conversion for JSON (see `ModelBase.to_json`)
+_json_dumpers: Dict[type, __DM] = {datetime: __dump_datetime, bytes: __dump_bytes, }
+
+
+class FloatArray(TypeDecorator):
+    """
+    One-dimensional array of floats, loaded as a numpy array.
+    Stored as a native DOUBLE PRECISION[] on PostgreSQL, otherwise packed little-endian doubles.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        """Use native array type if available."""
+        if dialect.name == 'postgresql':
+            return dialect.type_descriptor(ARRAY(DOUBLE_PRECISION()))
+        return dialect.type_descriptor(LargeBinary())
+
+    def process_bind_param(self, value, dialect) -> Optional[Union[List[float], bytes]]:
+        """Convert array-like to list or packed bytes."""
+        if value is None:
+            return None
+        value = np.asarray(value, dtype='<f8')
+        return value.tolist() if dialect.name == 'postgresql' else value.tobytes()
+
+    def process_result_value(self, value, dialect) -> Optional[np.ndarray]:
+        """Convert stored value to numpy array."""
+        if value is None:
+            return None
+        if dialect.name == 'postgresql':
+            return np.asarray(value, dtype=float)
+        return np.frombuffer(value, dtype='<f8')
+
+    def compare_values(self, x, y) -> bool:
+        """Arrays are compared element-wise for change detection."""
+        if x is None or y is None:
+            return x is y
+        return np.array_equal(x, y)
+
+
 class ModelBase:
     """Core mixin class for all models."""
 
@@ -140,6 +188,14 @@ class ModelBase:
     columns: Dict[str, type] = {}
     relationships: Dict[str, Type[ModelInterface]] = {}
 
+    # Column names with JSON conversion by declared type (None if value is used as is)
+    _json_columns: List[Tuple[str, Optional[Callable]]] = []
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        """Build JSON conversion for `columns` once for each model."""
+        super().__init_subclass__(**kwargs)
+        cls._json_columns = [(name, _json_dumpers.get(kind)) for name, kind in cls.columns.items()]
+
     def __repr__(self) -> str:
         """String representation of record."""
         return (f'<{self.__class__.__name__}(' +
@@ -169,19 +225,25 @@ class ModelBase:
         """Build record from JSON data (already loaded as dictionary)."""
         return cls.from_dict({k: _load(v) for k, v in data.items()})
 
-    def to_json(self, pop: List[str] = None, join: bool = False) -> Dict[str, __VT]:
-        """Convert record values into JSON formatted types."""
-        data = {k: _dump(v) for k, v in self.to_dict().items()}
+    def to_json(self, pop: List[str] = None, join: Union[bool, int] = False) -> Dict[str, __VT]:
+        """
+        Convert record values into JSON formatted types.
+        With `join`, related records are included recursively (only `join` levels deep if an integer).
+        Query with `join_options` to load these up front for many records.
+        """
+        data = {name: getattr(self, name) if dump is None else dump(getattr(self, name))
+                for name, dump in self._json_columns}
         if pop is not None:
             for field in pop:
                 data.pop(field)
-        if join is True:
+        if join is True or (join is not False and join > 0):
+            inner = join if join is True else join - 1
             for name in self.relationships:
                 relation = getattr(self, name)
                 if isinstance(relation, list):
-                    data[name] = [record.to_json(join=True) for record in relation]
+                    data[name] = [record.to_json(join=inner) for record in relation]
                 elif isinstance(relation, ModelInterface):
-                    data[name] = relation.to_json(join=True)
+                    data[name] = relation.to_json(join=inner)
                 elif relation is None:
                     pass
                 else:
@@ -253,8 +315,29 @@ class ModelBase:
         return cls.query().count()
 
     @classmethod
-    def query(cls: Type[ModelInterface]) -> Query:
-        return _Session.query(cls)
+    def join_options(cls: Type[ModelInterface], join: Union[bool, int] = True) -> list:
+        """
+        Loader options to eagerly load the related records included by `to_json(join=...)`.
+        Many-to-one relationships are joined into the same query, collections are loaded
+        with one additional query each, so serializing many records does not load each
+        relationship lazily one record at a time.
+        """
+        if join is False or (join is not True and join < 1):
+            return []
+        inner = join if join is True else join - 1
+        options = []
+        for name, related in cls.relationships.items():
+            attribute = getattr(cls, name)
+            loader = selectinload(attribute) if attribute.property.uselist else joinedload(attribute)
+            nested = related.join_options(inner)
+            options.append(loader.options(*nested) if nested else loader)
+        return options
+
+    @classmethod
+    def query(cls: Type[ModelInterface], join: Union[bool, int] = False) -> Query:
+        """Query on this table, eagerly loading relationships if `join` (see `join_options`)."""
+        query = _Session.query(cls)
+        return query.options(*cls.join_options(join)) if join else query
 
 
 # declarative base inherits common interface
@@ -648,6 +731,10 @@ OBJECT_NAMING_PATTERNS: Dict[str, re.Pattern] = {
 }
 
 
+# Maximum number of names in a single bulk alias query (bound parameter limits)
+ALIAS_QUERY_CHUNKSIZE: int = 500
+
+
 class Object(ModelInterface):
     """An astronomical object defines names, position, and other attributes."""
 
@@ -661,6 +748,9 @@ class Object(ModelInterface):
     history = Column('history', JSON().with_variant(JSONB(), 'postgresql'), nullable=False, default={})
     data = Column('data', JSON().with_variant(JSONB(), 'postgresql'), nullable=False, default={})
 
+    # NOTE: derived from `ra` and `dec` on flush for indexed cone search (not part of `columns`)
+    pixel = Column('pixel', Integer(), nullable=True)
+
     type = relationship(ObjectType, foreign_keys=[type_id, ])
 
     relationships = {'type': ObjectType}
@@ -684,19 +774,41 @@ class Object(ModelInterface):
 
     @classmethod
     def from_alias(cls, session: _Session = None, **alias: str) -> Object:
-        """Query by named field in `aliases`."""
+        """Query by named field in `aliases` (uses `object_alias` index, type must match, e.g., 42 != '42')."""
         if len(alias) == 1:
             (provider, name), = alias.items()
         else:
             raise AttributeError(f'Expected single named alias')
         try:
             session = session or _Session()
-            return session.query(Object).filter(Object.aliases[provider] == type_coerce(name, JSON)).one()
+            return (session.query(Object).join(ObjectAlias, ObjectAlias.object_id == Object.id)
+                    .filter(ObjectAlias.provider == provider, ObjectAlias.name == ObjectAlias.format_name(name)).one())
         except NoResultFound as error:
             raise Object.NotFound(f'No object with alias {provider}={name}') from error
         except MultipleResultsFound as error:
             raise NotDistinct(f'Multiple objects with alias {provider}={name}') from error
 
+    @classmethod
+    def from_aliases(cls, provider: str, names: List[Union[int, str]],
+                     session: _Session = None) -> Dict[Union[int, str], Object]:
+        """
+        Query many `names` for a single `provider` in one statement.
+        Returns mapping of names to objects, names without an object are omitted.
+        As with `from_alias`, names only match aliases of the same type (e.g., 42 != '42').
+        """
+        session = session or _Session()
+        lookup = {ObjectAlias.format_name(name): name for name in names}
+        chunks = [list(lookup)[i:i + ALIAS_QUERY_CHUNKSIZE] for i in range(0, len(lookup), ALIAS_QUERY_CHUNKSIZE)]
+        found = {}
+        for chunk in chunks:
+            for name, record in (session.query(ObjectAlias.name, Object)
+                                 .join(Object, ObjectAlias.object_id == Object.id)
+                                 .filter(ObjectAlias.provider == provider, ObjectAlias.name.in_(chunk))):
+                if lookup[name] in found and found[lookup[name]].id != record.id:
+                    raise NotDistinct(f'Multiple objects with alias {provider}={lookup[name]}')
+                found[lookup[name]] = record
+        return found
+
     @classmethod
     def from_name(cls, name: str, session: _Session = None) -> Object:
         """Smart detection of alias by name syntax."""
@@ -709,6 +821,68 @@ class Object(ModelInterface):
         else:
             raise Object.NotFound(f'Unrecognized name pattern \'{name}\'')
 
+    @classmethod
+    def cone_search(cls, ra: float, dec: float, radius: float, session: _Session = None) -> List[Object]:
+        """
+        Objects within `radius` (arcseconds) of (`ra`, `dec`) in degrees, nearest first.
+        Candidates are selected by indexed `pixel` ranges and then filtered by exact separation.
+        """
+        session = session or _Session()
+        ranges = sky.cone_ranges(ra, dec, radius)
+        query = session.query(cls).filter(or_(*[cls.pixel.between(start, stop) for start, stop in ranges]))
+        matches = []
+        for record in query:
+            distance = sky.separation(ra, dec, record.ra, record.dec)
+            if distance <= radius:
+                matches.append((distance, record.id, record))
+        return [record for _, _, record in sorted(matches, key=lambda match: match[:2])]
+
+    @classmethod
+    def reindex_pixels(cls, session: _Session = None) -> int:
+        """Recompute `pixel` for all objects, returns number of objects."""
+        session = session or _Session()
+        try:
+            mappings = [{'id': id, 'pixel': sky.pixel_id(ra, dec)}
+                        for id, ra, dec in session.query(cls.id, cls.ra, cls.dec)]
+            session.bulk_update_mappings(cls, mappings)
+            session.commit()
+            log.info(f'Updated pixel for {len(mappings)} objects')
+            return len(mappings)
+        except (IntegrityError, DatabaseError):
+            session.rollback()
+            raise
+
+    @classmethod
+    def update_all(cls, updates: Dict[int, Dict[str, Any]], session: _Session = None) -> int:
+        """
+        Update named columns of many objects (by id) with bulk UPDATE statements.
+        The alias index and `pixel` are maintained here as bulk updates do not trigger flush events.
+        """
+        session = session or _Session()
+        mappings = []
+        for id, data in updates.items():
+            for field in data:
+                if field not in cls.columns or field == 'id':
+                    raise AttributeError(f'Cannot bulk update \'{field}\' for object ({id})')
+            if ('ra' in data) != ('dec' in data):
+                raise AttributeError(f'Expected both \'ra\' and \'dec\' for object ({id})')
+            mapping = {**data, 'id': id}
+            if 'ra' in data:
+                mapping['pixel'] = sky.pixel_id(data['ra'], data['dec'])
+            mappings.append(mapping)
+        try:
+            session.bulk_update_mappings(cls, mappings)
+            connection = session.connection()
+            for mapping in mappings:
+                if 'aliases' in mapping:
+                    ObjectAlias.sync(connection, mapping['id'], mapping['aliases'])
+            session.commit()
+            log.info(f'Updated {len(mappings)} objects')
+            return len(mappings)
+        except (IntegrityError, DatabaseError):
+            session.rollback()
+            raise
+
     @classmethod
     def add_alias(cls, object_id: int, session: _Session = None, **aliases: str) -> None:
         """Add alias(es) to the given object."""
@@ -728,6 +902,109 @@ class Object(ModelInterface):
             raise
 
 
+# index for cone search
+object_pixel_index = Index('object_pixel_index', Object.pixel)
+
+
+@event.listens_for(Object, 'before_insert')
+@event.listens_for(Object, 'before_update')
+def _object_set_pixel(mapper, connection: Connection, target: Object) -> None:  # noqa: unused mapper, connection
+    """Derive `pixel` from position."""
+    if target.ra is not None and target.dec is not None:
+        target.pixel = sky.pixel_id(target.ra, target.dec)
+
+
+class ObjectAlias(ModelInterface):
+    """
+    Normalized (indexed) copy of `Object.aliases`, maintained automatically on flush.
+    Names are stored in their JSON form (see `format_name`) so that aliases of different
+    types remain distinct (e.g., 42 and '42').
+    """
+
+    object_id = Column('object_id', Integer(), ForeignKey(Object.id, ondelete='cascade'),
+                       primary_key=True, nullable=False)
+    provider = Column('provider', Text(), primary_key=True, nullable=False)
+    name = Column('name', Text(), nullable=False)
+
+    columns = {
+        'object_id': int,
+        'provider': str,
+        'name': str,
+    }
+
+    @staticmethod
+    def format_name(name: Union[int, str]) -> str:
+        """Stored form of alias `name` (its JSON representation, e.g., '"ZTF20actrfli"' or '42')."""
+        return json.dumps(name)
+
+    @classmethod
+    def sync(cls, connection: Connection, object_id: int, aliases: Dict[str, Union[int, str]] = None) -> None:
+        """Replace stored aliases for `object_id`."""
+        table = cls.__table__
+        connection.execute(table.delete().where(table.c.object_id == object_id))
+        if aliases:
+            connection.execute(table.insert(), [{'object_id': object_id, 'provider': provider,
+                                                 'name': cls.format_name(name)}
+                                                for provider, name in aliases.items()])
+
+    @classmethod
+    def rebuild(cls, session: _Session = None) -> int:
+        """Rebuild entire alias index from `Object.aliases`, returns number of objects."""
+        session = session or _Session()
+        try:
+            connection = session.connection()
+            connection.execute(cls.__table__.delete())
+            count = 0
+            for object_id, aliases in session.query(Object.id, Object.aliases).yield_per(1000):
+                cls.sync(connection, object_id, aliases)
+                count += 1
+            session.commit()
+            log.info(f'Rebuilt aliases for {count} objects')
+            return count
+        except (IntegrityError, DatabaseError):
+            session.rollback()
+            raise
+
+    @classmethod
+    def from_id(cls, id: int, session: _Session = None) -> ObjectAlias:
+        raise NotImplementedError()
+
+    @classmethod
+    def add(cls, data: dict, session: _Session = None) -> Optional[int]:
+        raise NotImplementedError()
+
+    @classmethod
+    def delete(cls, id: int, session: _Session = None) -> None:
+        raise NotImplementedError()
+
+    @classmethod
+    def update(cls, id: int, session: _Session = None, **data) -> None:
+        raise NotImplementedError()
+
+
+# index for alias lookups
+object_alias_provider_name_index = Index('object_alias_provider_name_index', ObjectAlias.provider, ObjectAlias.name)
+
+
+@event.listens_for(Object, 'after_insert')
+def _object_after_insert(mapper, connection: Connection, target: Object) -> None:  # noqa: unused mapper
+    """Populate alias index for new object."""
+    ObjectAlias.sync(connection, target.id, target.aliases)
+
+
+@event.listens_for(Object, 'after_update')
+def _object_after_update(mapper, connection: Connection, target: Object) -> None:  # noqa: unused mapper
+    """Update alias index if aliases have changed."""
+    if inspect(target).attrs.aliases.history.has_changes():
+        ObjectAlias.sync(connection, target.id, target.aliases)
+
+
+@event.listens_for(Object, 'before_delete')
+def _object_before_delete(mapper, connection: Connection, target: Object) -> None:  # noqa: unused mapper
+    """Remove alias index for deleted object."""
+    ObjectAlias.sync(connection, target.id)
+
+
 class ObservationType(ModelInterface):
     """Observation types (e.g., 'g-ztf')."""
 
@@ -872,15 +1149,45 @@ class Epoch(ModelInterface):
         return cls.add({}, session=session)
 
     @classmethod
-    def latest(cls, session: _Session = None) -> Epoch:
+    def latest(cls, session: _Session = None) -> Optional[Epoch]:
         """Get the most recent epoch."""
         session = session or _Session()
-        return session.query(cls).order_by(cls.id.desc()).first()
+        epoch_id = cls.latest_id(session)
+        return None if epoch_id is None else session.query(cls).get(epoch_id)
+
+    @classmethod
+    def latest_id(cls, session: _Session = None) -> Optional[int]:
+        """Get the most recent epoch ID (cached, see `EPOCH_CACHE_TTL`)."""
+        epoch_id = epoch_cache.get('latest')
+        if epoch_id is None:
+            session = session or _Session()
+            epoch_id = session.query(func.max(cls.id)).scalar()
+            if epoch_id is not None:
+                epoch_cache.put('latest', epoch_id)
+        return epoch_id
 
     @classmethod
     def select(cls, limit: int, offset: int = 0) -> List[Epoch]:
         """Select a range of epochs."""
-        return cls.query().order_by(cls.id.desc()).filter(cls.id <= cls.latest().id - offset).limit(limit).all()
+        return cls.query().order_by(cls.id.desc()).filter(cls.id <= cls.latest_id() - offset).limit(limit).all()
+
+
+try:
+    EPOCH_CACHE_TTL: float = float(epoch_config.get('ttl', 5))
+except (TypeError, ValueError) as _error:
+    raise ConfigurationError(f'database.epoch.ttl: ({_error})') from _error
+
+
+# NOTE: Each process holds its own latest epoch ID. Creating an epoch within the process
+# invalidates it immediately, epochs created elsewhere are seen within `EPOCH_CACHE_TTL`.
+epoch_cache = TTLCache(maxsize=1, ttl=EPOCH_CACHE_TTL)
+
+
+@event.listens_for(Epoch, 'after_insert')
+@event.listens_for(Epoch, 'after_delete')
+def _epoch_invalidate(mapper, connection: Connection, target: Epoch) -> None:  # noqa: unused mapper, connection, target
+    """Invalidate cached latest epoch."""
+    epoch_cache.clear()
 
 
 class Observation(ModelInterface):
@@ -1012,6 +1319,10 @@ class FileType(ModelInterface):
         return [file_type.name for file_type in cls.query().all()]
 
 
+# Size of individual reads when streaming file data (bytes)
+FILE_CHUNKSIZE: int = 1024**2  # i.e., 1 MB
+
+
 class File(ModelInterface):
     """File table."""
 
@@ -1021,7 +1332,8 @@ class File(ModelInterface):
                             ForeignKey(Observation.id), unique=True, nullable=False)
     type_id = Column('type_id', Integer(), ForeignKey(FileType.id), nullable=False)
     name = Column('name', Text(), nullable=False)
-    data = Column('data', LargeBinary(), nullable=False)
+    storage_key = Column('storage_key', Text(), nullable=True)  # NOTE: null if data is in this table
+    _data = deferred(Column('data', LargeBinary(), nullable=False))  # NOTE: only loaded on access
 
     epoch = relationship(Epoch, backref='file')
     type = relationship(FileType, backref='file')
@@ -1049,6 +1361,117 @@ class File(ModelInterface):
         except NoResultFound as error:
             raise File.NotFound(f'No file with observation_id={observation_id}') from error
 
+    @property
+    def data(self) -> bytes:
+        """File contents (from external store if `storage_key` is set)."""
+        if self.storage_key is None:
+            return self._data
+        return b''.join(store.read(self.storage_key))
+
+    @data.setter
+    def data(self, value: store.Content) -> None:
+        """Write file contents to the configured store (or this table if none)."""
+        provider = store.default_provider()
+        if provider is None:
+            self._data, self.storage_key = value, None
+        else:
+            self._data, self.storage_key = b'', store.write(value, provider)
+        self.__dict__.pop('size', None)
+
+    @cached_property
+    def size(self) -> int:
+        """Size of file data in bytes (without loading the data)."""
+        if self.storage_key is not None:
+            return store.size(self.storage_key)
+        return _Session.query(func.length(File._data)).filter(File.id == self.id).scalar()
+
+    def stream(self, start: int = 0, stop: int = None, chunksize: int = FILE_CHUNKSIZE,
+               session: _Session = None) -> Iterator[bytes]:
+        """
+        Iterate over file data from byte `start` up to `stop` (default: end of file).
+        For data in this table, each chunk is a separate query returning at most `chunksize` bytes.
+        Without `session`, queries use a dedicated session closed when iteration ends,
+        as iteration may outlive the request (e.g., a streaming response).
+
+        On PostgreSQL, slices only read the storage they cover if `data` is stored
+        uncompressed (see `set_data_storage`). Rows written while the column was compressed
+        (the default) are decompressed from the start on every chunk, making large files
+        quadratic to stream until rewritten (see `rewrite_data`).
+        """
+        stop = self.size if stop is None else min(stop, self.size)
+        if self.storage_key is not None:
+            return store.read(self.storage_key, start, stop, chunksize)
+        return self.__stream_data(start, stop, chunksize, session)
+
+    def __stream_data(self, start: int, stop: int, chunksize: int, session: _Session = None) -> Iterator[bytes]:
+        """Iterate over chunks of file data held in this table."""
+        dedicated = session is None
+        session = session or _Session.session_factory()
+        try:
+            for offset in range(start, stop, chunksize):
+                length = min(chunksize, stop - offset)
+                chunk = (session.query(func.substr(File._data, offset + 1, length))  # NOTE: substr is 1-indexed
+                         .filter(File.id == self.id).scalar())
+                yield bytes(chunk)
+        finally:
+            if dedicated:
+                session.close()
+
+    @staticmethod
+    def set_data_storage(connection: Connection) -> bool:
+        """
+        Store `data` uncompressed out-of-line on PostgreSQL (returns False for other databases).
+        Only applies to rows written afterwards (see `rewrite_data`).
+        """
+        if connection.dialect.name != 'postgresql':
+            return False
+        connection.exec_driver_sql(f'ALTER TABLE {File.__table__.fullname} ALTER COLUMN data SET STORAGE EXTERNAL')
+        return True
+
+    @classmethod
+    def rewrite_data(cls, session: _Session = None) -> int:
+        """
+        Rewrite file data held in this table one file at a time, so it is stored
+        as currently configured (see `set_data_storage`). Returns number of files rewritten
+        (none for databases other than PostgreSQL).
+        """
+        session = session or _Session()
+        if session.get_bind().dialect.name != 'postgresql':
+            return 0
+        table = cls.__table__
+        file_ids = [id for id, in session.query(cls.id).filter(cls.storage_key.is_(None)).order_by(cls.id)]
+        for count, file_id in enumerate(file_ids, start=1):
+            # NOTE: concatenation forces a new value (an unchanged value would keep its existing storage)
+            session.execute(table.update().where(table.c.id == file_id)
+                            .values(data=table.c.data.op('||')(literal(b'', LargeBinary()))))
+            session.commit()
+            log.info(f'Rewrote file ({file_id}) ({count}/{len(file_ids)})')
+        return len(file_ids)
+
+    @classmethod
+    def move_to_store(cls, provider: str = None, session: _Session = None) -> int:
+        """
+        Move file data held in this table to external store (default: configured provider).
+        Files are moved one at a time and read in chunks. Returns number of files moved.
+        """
+        provider = provider or store.default_provider()
+        if provider is None:
+            raise ConfigurationError('No external file store configured (store.provider = \'database\')')
+        session = session or _Session()
+        file_ids = [id for id, in session.query(cls.id).filter(cls.storage_key.is_(None)).order_by(cls.id)]
+        for count, file_id in enumerate(file_ids, start=1):
+            file = session.query(cls).filter(cls.id == file_id).one()
+            file._data, file.storage_key = b'', store.write(file.stream(session=session), provider)
+            session.commit()
+            log.info(f'Moved file ({file_id}) to {provider} store ({count}/{len(file_ids)})')
+        return len(file_ids)
+
+
+@event.listens_for(File.__table__, 'after_create')
+def _file_after_create(target, connection: Connection, **kwargs) -> None:  # noqa: unused target, kwargs
+    """Set storage of file data for new table (see `File.stream`)."""
+    File.set_data_storage(connection)
+
 
 class ModelType(ModelInterface):
     """Model type table."""
@@ -1114,9 +1537,21 @@ class Model(ModelInterface):
         'data': dict,
     }
 
+    # Members of `data` which may be stored as encoded arrays (see `refitt.core.arrays`)
+    array_keys: Tuple[str, ...] = ('mjd_arr', 'mag_arr', 'err_arr')
+
     class NotFound(NotFound):
         """NotFound exception specific to Model."""
 
+    def array(self, key: str) -> np.ndarray:
+        """Member `key` of data as numpy array (whether stored as list or encoded)."""
+        value = self.data[key]
+        return arrays.decode(value) if arrays.is_encoded(value) else np.asarray(value, dtype=float)
+
+    def data_as(self, array_format: str, dtype: str = 'float64') -> dict:
+        """Model data with arrays as JSON lists ('list') or encoded as `dtype` ('binary')."""
+        return arrays.convert_all(self.data, self.array_keys, array_format, dtype=dtype)
+
     @classmethod
     def for_object(cls, object_id: int, epoch_id: int = None) -> List[Model]:
         """Select models for the given object and epoch."""
@@ -1202,7 +1637,8 @@ class RecommendationTag(ModelInterface):
 class QueryMethod(Protocol):
     """Function call signature for recommendation query modes."""
     def __call__(self, user_id: int, epoch_id: int = None, limit: int = None,
-                 facility_id: int = None, limiting_magnitude: int = None) -> List[Recommendation]: ...
+                 facility_id: int = None, limiting_magnitude: int = None,
+                 join: Union[bool, int] = False) -> List[Recommendation]: ...
 
 
 class Recommendation(ModelInterface):
@@ -1224,6 +1660,12 @@ class Recommendation(ModelInterface):
     rejected = Column('rejected', Boolean(), nullable=False, default=False)
     data = Column('data', JSON().with_variant(JSONB(), 'postgresql'), nullable=False, default={})
 
+    # NOTE: airmass curve (POSIX seconds) and visibility window are derived from data['airmass'] on flush
+    airmass_time = Column('airmass_time', FloatArray(), nullable=True)
+    airmass_value = Column('airmass_value', FloatArray(), nullable=True)
+    visible_start = Column('visible_start', DateTime(timezone=True), nullable=True)
+    visible_end = Column('visible_end', DateTime(timezone=True), nullable=True)
+
     epoch = relationship(Epoch, backref='recommendation')
     tag = relationship(RecommendationTag, backref='recommendation')
     user = relationship(User, backref='recommendation')
@@ -1254,6 +1696,57 @@ class Recommendation(ModelInterface):
     class NotFound(NotFound):
         """NotFound exception specific to Recommendation."""
 
+    def to_json(self, pop: List[str] = None, join: Union[bool, int] = False) -> Dict[str, Any]:
+        """Convert record values into JSON formatted types (airmass curve is given in `data` as before)."""
+        data = super().to_json(pop=pop, join=join)
+        if 'data' in data and self.airmass_time is not None:
+            data['data'] = {**data['data'], 'airmass': airmass.format_curve(*self.airmass)}
+        return data
+
+    @property
+    def airmass(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Airmass curve as arrays of times (POSIX seconds) and values."""
+        if self.airmass_time is not None:
+            return self.airmass_time, self.airmass_value
+        return airmass.parse_curve(self.data['airmass'])  # NOTE: not yet flushed or migrated
+
+    @airmass.setter
+    def airmass(self, curve: Union[str, Dict[str, float], Tuple[np.ndarray, np.ndarray]]) -> None:
+        """Set airmass curve (as with `data['airmass']`, or as arrays) and derive visibility window."""
+        times, values = curve if isinstance(curve, tuple) else airmass.parse_curve(curve)
+        self.airmass_time, self.airmass_value = np.asarray(times, dtype=float), np.asarray(values, dtype=float)
+        window = airmass.visible_window(self.airmass_time, self.airmass_value)
+        self.visible_start, self.visible_end = (None, None) if window is None else (
+            datetime.fromtimestamp(window[0]).astimezone(), datetime.fromtimestamp(window[1]).astimezone())
+
+    def _move_airmass(self) -> bool:
+        """Move JSON-encoded `data['airmass']` to typed columns (returns True if moved)."""
+        if not self.data or 'airmass' not in self.data:
+            return False
+        data = dict(self.data)
+        try:
+            self.airmass = data.pop('airmass')
+        except Exception as err:
+            log.warning(f'Failed to decode airmass data for recommendation ({self.id}): {err}')
+            return False
+        self.data = data
+        return True
+
+    @classmethod
+    def backfill_airmass(cls, batch_size: int = 1000, session: _Session = None) -> int:
+        """Move airmass curves for existing recommendations to typed columns, returns number moved."""
+        session = session or _Session()
+        count, last_id = 0, 0
+        while True:
+            records = (session.query(cls).filter(cls.id > last_id, cls.airmass_time.is_(None))
+                       .order_by(cls.id).limit(batch_size).all())
+            if not records:
+                return count
+            count += sum(record._move_airmass() for record in records)
+            last_id = records[-1].id
+            session.commit()
+            log.info(f'Moved airmass for {count} recommendations (up to id={last_id})')
+
     @cached_property
     def model_info(self) -> List[ModelInfo]:
         """Listing of available models for this recommendation without the data itself."""
@@ -1280,7 +1773,7 @@ class Recommendation(ModelInterface):
     def for_user(cls, user_id: int, epoch_id: int = None, session: _Session = None) -> List[Recommendation]:
         """Select recommendations for the given user and epoch."""
         session = session or _Session()
-        epoch_id = epoch_id or Epoch.latest(session).id
+        epoch_id = epoch_id or Epoch.latest_id(session)
         return (session.query(cls).order_by(cls.priority)
                 .filter(cls.epoch_id == epoch_id, cls.user_id == user_id)).all()
 
@@ -1300,7 +1793,8 @@ class Recommendation(ModelInterface):
 
     @classmethod
     def next(cls, user_id: int, epoch_id: int = None, limit: int = None, mode: str = DEFAULT_QUERY_MODE,
-             facility_id: int = None, limiting_magnitude: float = None) -> List[Recommendation]:
+             facility_id: int = None, limiting_magnitude: float = None,
+             join: Union[bool, int] = False) -> List[Recommendation]:
         """
         Select next recommendation(s) for the given user and epoch, in priority order,
         that has neither been 'accepted' nor 'rejected', up to some `limit`.
@@ -1308,83 +1802,68 @@ class Recommendation(ModelInterface):
         If `facility_id` is provided, only recommendations for the given facility are returned.
         If `limiting_magnitude` is provided, only recommendations with a 'predicted' magnitude
         brighter than this value are returned.
+        Related records are loaded up front for `to_json(join=...)` if `join` is given.
         """
         query_method = cls._get_query_method(mode)
         return query_method(user_id, epoch_id=epoch_id, limit=limit,
-                            facility_id=facility_id, limiting_magnitude=limiting_magnitude)
+                            facility_id=facility_id, limiting_magnitude=limiting_magnitude, join=join)
 
     @classmethod
     def _query_normal(cls, user_id: int, epoch_id: int = None, limit: int = None,
-                      facility_id: int = None, limiting_magnitude: float = None) -> List[Recommendation]:
+                      facility_id: int = None, limiting_magnitude: float = None,
+                      join: Union[bool, int] = False) -> List[Recommendation]:
         """Simple priority ordering."""
         query = cls._base_query(user_id, epoch_id=epoch_id, facility_id=facility_id,
-                                limiting_magnitude=limiting_magnitude)
-        query = query.order_by(cls.priority)
+                                limiting_magnitude=limiting_magnitude, join=join)
+        query = query.order_by(RecommendationQueue.priority, RecommendationQueue.recommendation_id)
         if limit:
             query = query.limit(limit)
         return query.all()
 
     @classmethod
     def _query_realtime(cls, user_id: int, epoch_id: int = None, limit: int = None,
-                        facility_id: int = None, limiting_magnitude: float = None) -> List[Recommendation]:
+                        facility_id: int = None, limiting_magnitude: float = None,
+                        join: Union[bool, int] = False) -> List[Recommendation]:
         """Facility-based 'realtime' ordering, epoch=<latest> always."""
         now = datetime.now().astimezone()
         query = cls._base_query(user_id, epoch_id=epoch_id, facility_id=facility_id,
-                                limiting_magnitude=limiting_magnitude)
-        targets = []
+                                limiting_magnitude=limiting_magnitude, join=join)
+        query = query.filter(or_(and_(cls.visible_start <= now, cls.visible_end >= now),
+                                 cls.airmass_time.is_(None)))  # NOTE: not yet migrated
+        records, curves = [], []
         for record in query.all():
             try:
-                airmass = json.loads(record.data['airmass'])
+                curves.append(record.airmass)
+                records.append(record)
             except KeyError:
                 log.warning(f'Missing airmass for recommendation ({record.id})')
             except Exception as err:
                 log.warning(f'Failed to decode airmass data for recommendation ({record.id}): {err}')
-            else:
-                # Note: converting to datetime first retains TZ-info within dataframe
-                df = DataFrame({'time': [datetime.fromisoformat(time) for time in airmass.keys()],
-                                'value': airmass.values()})
-                prev_df = df.loc[df.time < now]
-                next_df = df.loc[df.time > now]
-                if prev_df.empty or next_df.empty:
-                    log.warning(f'No targets near current time ({now})')
-                    continue  # No surrounding timestamps
-                else:
-                    df = DataFrame([prev_df, next_df])
-                    df = df.set_index('time')
-                    df = df.reindex(pd.DatetimeIndex([df.iloc[0].time, now, df.iloc[-1].time]))
-                    df = df.interpolate()
-                    value = abs(df.loc[now].value)
-                    if value <= 1.4:  # NOTE: airmass cutoff of 1.4
-                        targets.append({'id': record.id, 'airmass': value, 'record': record})
-
-        if not targets:
+
+        # NOTE: all curves are interpolated together, those not spanning `now` give NaN
+        current = np.abs(airmass.interpolate(*airmass.pack_curves(curves), now.timestamp()))
+        visible, = np.nonzero(current <= airmass.AIRMASS_CUTOFF)
+        if not visible.size:
             log.warning(f'No immediate targets (user={user_id}, facility={facility_id}, epoch={epoch_id})')
             return []
 
-        limit = limit or len(targets)
-        targets = pd.DataFrame(targets).sort_values(by='airmass', ascending=True)
-        return targets.head(limit).record.to_list()
+        order = visible[np.argsort(current[visible], kind='stable')]
+        return [records[i] for i in order[:limit or None]]
 
     @classmethod
     def _base_query(cls, user_id: int, epoch_id: int = None, facility_id: int = None,
-                    limiting_magnitude: float = None) -> Query:
-        """Build base recommendation query."""
-        # NOTE: we have to join on predicted_observation_id <- observation.id if we want to make a
-        #       comparison to limiting_magnitude, but we will now allow recommendations without an
-        #       explicit prediction. The join will filter out these rows, so we will only do it if
-        #       limiting_magnitude is requested
+                    limiting_magnitude: float = None, join: Union[bool, int] = False) -> Query:
+        """Build base recommendation query (pending recommendations are read from `RecommendationQueue`)."""
         session = _Session()
-        if limiting_magnitude:
-            predicted = aliased(Observation)
-            query = session.query(cls).join(predicted, cls.predicted_observation_id == predicted.id)
-            query = query.filter(predicted.value <= limiting_magnitude)
-        else:
-            query = session.query(cls)
-        query = query.filter(cls.user_id == user_id)
-        query = query.filter(cls.epoch_id == (epoch_id or Epoch.latest(session).id))
-        query = query.filter(cls.accepted.is_(False)).filter(cls.rejected.is_(False))
+        queue = RecommendationQueue
+        query = session.query(cls).options(*cls.join_options(join)).join(queue, queue.recommendation_id == cls.id)
+        query = query.filter(queue.user_id == user_id)
+        query = query.filter(queue.epoch_id == (epoch_id or Epoch.latest_id(session)))
         if facility_id is not None:
-            query = query.filter(cls.facility_id == facility_id)
+            query = query.filter(queue.facility_id == facility_id)
+        if limiting_magnitude:
+            # NOTE: recommendations without an explicit prediction have no magnitude and are excluded
+            query = query.filter(queue.magnitude <= limiting_magnitude)
         return query
 
     @classmethod
@@ -1393,9 +1872,14 @@ class Recommendation(ModelInterface):
         Select previous recommendations that the user has either affirmatively
         accepted OR rejected.
         """
+        return cls.query_history(user_id, epoch_id).all()
+
+    @classmethod
+    def query_history(cls, user_id: int, epoch_id: int) -> Query:
+        """Build query for recommendation history (see `history`)."""
         return (cls.query().order_by(cls.id)
                 .filter(cls.user_id == user_id).filter(cls.epoch_id == epoch_id)
-                .filter(or_(cls.accepted.is_(True), cls.rejected.is_(True)))).all()
+                .filter(or_(cls.accepted.is_(True), cls.rejected.is_(True))))
 
 
 # indices for recommendation table
@@ -1404,6 +1888,143 @@ recommendation_user_facility_index = Index('recommendation_user_facility_index',
                                            Recommendation.user_id, Recommendation.facility_id)
 recommendation_epoch_user_index = Index('recommendation_epoch_user_index',
                                         Recommendation.epoch_id, Recommendation.user_id)
+recommendation_visible_index = Index('recommendation_visible_index',
+                                     Recommendation.epoch_id, Recommendation.visible_start, Recommendation.visible_end)
+
+
+@event.listens_for(Recommendation, 'before_insert')
+@event.listens_for(Recommendation, 'before_update')
+def _recommendation_move_airmass(mapper, connection: Connection,  # noqa: unused mapper, connection
+                                 target: Recommendation) -> None:
+    """Store airmass curve given in `data` as typed columns."""
+    target._move_airmass()
+
+
+class RecommendationQueue(ModelInterface):
+    """
+    Pending (neither accepted nor rejected) recommendations by epoch, user, and facility,
+    in priority order. Maintained automatically on flush.
+    """
+
+    recommendation_id = Column('recommendation_id', BigInteger().with_variant(Integer(), 'sqlite'),
+                               ForeignKey(Recommendation.id, ondelete='cascade'), primary_key=True, nullable=False)
+    epoch_id = Column('epoch_id', Integer(), nullable=False)
+    user_id = Column('user_id', Integer(), nullable=False)
+    facility_id = Column('facility_id', Integer(), nullable=False)
+    priority = Column('priority', Integer(), nullable=False)
+    magnitude = Column('magnitude', Float(), nullable=True)  # NOTE: value of predicted observation
+
+    columns = {
+        'recommendation_id': int,
+        'epoch_id': int,
+        'user_id': int,
+        'facility_id': int,
+        'priority': int,
+        'magnitude': float,
+    }
+
+    @classmethod
+    def select_pending(cls):
+        """Select queue entries for all pending recommendations."""
+        return (
+            select(Recommendation.id, Recommendation.epoch_id, Recommendation.user_id,
+                   Recommendation.facility_id, Recommendation.priority, Observation.value)
+            .outerjoin(Observation, Observation.id == Recommendation.predicted_observation_id)
+            .where(Recommendation.accepted.is_(False), Recommendation.rejected.is_(False))
+        )
+
+    @classmethod
+    def sync(cls, connection: Connection, recommendation: Recommendation = None,
+             recommendation_id: int = None) -> None:
+        """Replace queue entry for `recommendation` (removed if no longer pending)."""
+        table = cls.__table__
+        recommendation_id = recommendation_id or recommendation.id
+        connection.execute(table.delete().where(table.c.recommendation_id == recommendation_id))
+        if recommendation is not None and not recommendation.accepted and not recommendation.rejected:
+            connection.execute(table.insert().from_select(
+                list(cls.columns), cls.select_pending().where(Recommendation.id == recommendation_id)))
+
+    @classmethod
+    def sync_magnitude(cls, connection: Connection, observation: Observation) -> None:
+        """Update magnitude of queue entries predicted by `observation`."""
+        table = cls.__table__
+        predicted = select(Recommendation.id).where(Recommendation.predicted_observation_id == observation.id)
+        connection.execute(table.update().where(table.c.recommendation_id.in_(predicted))
+                           .values(magnitude=observation.value))
+
+    @classmethod
+    def rebuild(cls, session: _Session = None) -> int:
+        """Rebuild entire queue from recommendations, returns number of pending recommendations."""
+        session = session or _Session()
+        try:
+            connection = session.connection()
+            connection.execute(cls.__table__.delete())
+            count = connection.execute(cls.__table__.insert().from_select(list(cls.columns),
+                                                                         cls.select_pending())).rowcount
+            session.commit()
+            log.info(f'Rebuilt recommendation queue ({count} pending)')
+            return count
+        except (IntegrityError, DatabaseError):
+            session.rollback()
+            raise
+
+    @classmethod
+    def from_id(cls, id: int, session: _Session = None) -> RecommendationQueue:
+        raise NotImplementedError()
+
+    @classmethod
+    def add(cls, data: dict, session: _Session = None) -> Optional[int]:
+        raise NotImplementedError()
+
+    @classmethod
+    def delete(cls, id: int, session: _Session = None) -> None:
+        raise NotImplementedError()
+
+    @classmethod
+    def update(cls, id: int, session: _Session = None, **data) -> None:
+        raise NotImplementedError()
+
+
+# indices for reading queue in order
+recommendation_queue_user_index = Index('recommendation_queue_user_index',
+                                        RecommendationQueue.epoch_id, RecommendationQueue.user_id,
+                                        RecommendationQueue.priority)
+recommendation_queue_facility_index = Index('recommendation_queue_facility_index',
+                                            RecommendationQueue.epoch_id, RecommendationQueue.user_id,
+                                            RecommendationQueue.facility_id, RecommendationQueue.priority)
+
+
+# Changes to these attributes alter the queue entry for a recommendation
+QUEUE_ATTRIBUTES: List[str] = ['epoch_id', 'user_id', 'facility_id', 'priority',
+                               'predicted_observation_id', 'accepted', 'rejected']
+
+
+@event.listens_for(Recommendation, 'after_insert')
+def _recommendation_after_insert(mapper, connection: Connection, target: Recommendation) -> None:  # noqa: unused mapper
+    """Push new recommendation onto queue."""
+    RecommendationQueue.sync(connection, target)
+
+
+@event.listens_for(Recommendation, 'after_update')
+def _recommendation_after_update(mapper, connection: Connection, target: Recommendation) -> None:  # noqa: unused mapper
+    """Pop recommendation from queue when accepted or rejected (or update its entry)."""
+    state = inspect(target)
+    if any(getattr(state.attrs, name).history.has_changes() for name in QUEUE_ATTRIBUTES):
+        RecommendationQueue.sync(connection, target)
+
+
+@event.listens_for(Recommendation, 'before_delete')
+def _recommendation_before_delete(mapper, connection: Connection,  # noqa: unused mapper
+                                  target: Recommendation) -> None:
+    """Remove queue entry for deleted recommendation."""
+    RecommendationQueue.sync(connection, recommendation_id=target.id)
+
+
+@event.listens_for(Observation, 'after_update')
+def _observation_after_update(mapper, connection: Connection, target: Observation) -> None:  # noqa: unused mapper
+    """Update queue magnitude for recommendations predicted by this observation."""
+    if inspect(target).attrs.value.history.has_changes():
+        RecommendationQueue.sync_magnitude(connection, target)
 
 
 # ----------------------------------------------------------------------------------------------
@@ -1588,6 +2209,7 @@ tables: Dict[str, Type[ModelInterface]] = {
     'session': Session,
     'object_type': ObjectType,
     'object': Object,
+    'object_alias': ObjectAlias,
     'observation_type': ObservationType,
     'source_type': SourceType,
     'source': Source,
@@ -1598,6 +2220,7 @@ tables: Dict[str, Type[ModelInterface]] = {
     'file': File,
     'recommendation_tag': RecommendationTag,
     'recommendation': Recommendation,
+    'recommendation_queue': RecommendationQueue,
     'model_type': ModelType,
     'model': Model,
     'level': Level,
@@ -1611,9 +2234,14 @@ tables: Dict[str, Type[ModelInterface]] = {
 
 # global registry of indices
 indices: Dict[str, Index] = {
+    'object_pixel_index': object_pixel_index,
+    'object_alias_provider_name_index': object_alias_provider_name_index,
     'recommendation_object_index': recommendation_object_index,
     'recommendation_epoch_user_index': recommendation_epoch_user_index,
     'recommendation_user_facility_index': recommendation_user_facility_index,
+    'recommendation_visible_index': recommendation_visible_index,
+    'recommendation_queue_user_index': recommendation_queue_user_index,
+    'recommendation_queue_facility_index': recommendation_queue_facility_index,
     'observation_time_index': observation_time_index,
     'observation_object_index': observation_object_index,
     'observation_recorded_index': observation_recorded_index,
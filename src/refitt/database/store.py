@@ -0,0 +1,200 @@
+# SPDX-FileCopyrightText: 2019-2022 REFITT Team
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+External storage for file data.
+
+Content is addressed by its SHA-256 digest. Storage keys are of the form
+`<provider>:<digest>` so that data written under one provider remains readable
+after the configured provider changes (e.g., while migrating).
+"""
+
+
+# type annotations
+from __future__ import annotations
+from typing import Dict, Type, Tuple, Iterable, Iterator, Union, Optional, IO
+
+# standard libs
+import os
+import re
+import hashlib
+import functools
+from abc import ABC, abstractmethod
+from tempfile import NamedTemporaryFile
+
+# internal libs
+from refitt.core.config import config, Namespace, ConfigurationError
+
+# public interface
+__all__ = ['FileStore', 'LocalFileStore', 'providers', 'get_store', 'default_provider',
+           'write', 'read', 'size', 'exists', 'CHUNKSIZE', ]
+
+# Size of individual reads and writes (bytes)
+CHUNKSIZE: int = 1024**2  # i.e., 1 MB
+
+# type defs
+Content = Union[bytes, memoryview, IO[bytes], Iterable[bytes]]
+
+
+def iter_chunks(data: Content, chunksize: int = CHUNKSIZE) -> Iterator[bytes]:
+    """Yield `data` in chunks whether given as bytes, a readable stream, or an iterable of chunks."""
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        view = memoryview(data)
+        try:
+            for offset in range(0, len(view), chunksize):
+                yield view[offset:offset + chunksize]
+        finally:
+            view.release()
+    elif hasattr(data, 'read'):
+        for chunk in iter(functools.partial(data.read, chunksize), b''):
+            yield chunk
+    else:
+        yield from data
+
+
+class FileStore(ABC):
+    """Interface for a content-addressed file storage backend."""
+
+    @abstractmethod
+    def put(self, data: Content) -> str:
+        """Store `data` and return its digest."""
+
+    @abstractmethod
+    def read(self, digest: str, start: int = 0, stop: int = None,
+             chunksize: int = CHUNKSIZE) -> Iterator[bytes]:
+        """Iterate over stored data from byte `start` up to `stop`."""
+
+    @abstractmethod
+    def size(self, digest: str) -> int:
+        """Size of stored data in bytes."""
+
+    @abstractmethod
+    def exists(self, digest: str) -> bool:
+        """Check if content with `digest` is stored."""
+
+    @classmethod
+    @abstractmethod
+    def from_config(cls, cfg: Namespace) -> FileStore:
+        """Initialize from provider configuration section."""
+
+
+class LocalFileStore(FileStore):
+    """Files stored under a local (or mounted) filesystem path."""
+
+    path: str
+
+    def __init__(self, path: str) -> None:
+        """Initialize with root directory `path` (created if necessary)."""
+        self.path = os.path.abspath(path)
+        os.makedirs(self.path, exist_ok=True)
+
+    @classmethod
+    def from_config(cls, cfg: Namespace) -> LocalFileStore:
+        """Initialize from `store.local` configuration section."""
+        try:
+            return cls(cfg.path)
+        except AttributeError as error:
+            raise ConfigurationError('Missing \'store.local.path\'') from error
+
+    def filepath(self, digest: str) -> str:
+        """Full path to file for `digest` (nested to bound directory sizes)."""
+        if not re.fullmatch(r'[0-9a-f]{64}', digest):
+            raise ValueError(f'Invalid digest: {digest}')
+        return os.path.join(self.path, digest[:2], digest[2:4], digest)
+
+    def put(self, data: Content) -> str:
+        """Write `data` to temporary file and move into place by digest."""
+        checksum = hashlib.sha256()
+        with NamedTemporaryFile(dir=self.path, prefix='.upload-', delete=False) as stream:
+            try:
+                for chunk in iter_chunks(data):
+                    checksum.update(chunk)
+                    stream.write(chunk)
+            except Exception:
+                os.remove(stream.name)
+                raise
+        digest = checksum.hexdigest()
+        filepath = self.filepath(digest)
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        os.replace(stream.name, filepath)  # NOTE: identical content may already exist
+        return digest
+
+    def read(self, digest: str, start: int = 0, stop: int = None,
+             chunksize: int = CHUNKSIZE) -> Iterator[bytes]:
+        """Iterate over file contents from byte `start` up to `stop`."""
+        with open(self.filepath(digest), mode='rb') as stream:
+            stream.seek(start)
+            remaining = (stop - start) if stop is not None else None
+            while remaining is None or remaining > 0:
+                chunk = stream.read(chunksize if remaining is None else min(chunksize, remaining))
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    def size(self, digest: str) -> int:
+        """Size of file in bytes."""
+        return os.path.getsize(self.filepath(digest))
+
+    def exists(self, digest: str) -> bool:
+        """Check if file exists."""
+        return os.path.exists(self.filepath(digest))
+
+
+# Available storage providers by name (as used in configuration and storage keys)
+# NOTE: 'database' (the default) means file data is kept in the `file` table
+providers: Dict[str, Type[FileStore]] = {
+    'local': LocalFileStore,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def get_store(provider: str) -> FileStore:
+    """Load store for `provider` from configuration."""
+    try:
+        return providers[provider].from_config(Namespace(config.store.get(provider, {})))
+    except KeyError as error:
+        raise ConfigurationError(f'Unsupported file store provider \'{provider}\'') from error
+
+
+def default_provider() -> Optional[str]:
+    """Configured provider for new file data (None if stored in the database)."""
+    provider = config.store.provider
+    if provider == 'database':
+        return None
+    if provider not in providers:
+        raise ConfigurationError(f'Unsupported file store provider \'{provider}\'')
+    return provider
+
+
+def split_key(key: str) -> Tuple[str, str]:
+    """Separate storage `key` into provider and digest."""
+    provider, _, digest = key.partition(':')
+    return provider, digest
+
+
+def write(data: Content, provider: str = None) -> str:
+    """Store `data` with `provider` (default from configuration) and return storage key."""
+    provider = provider or default_provider()
+    if provider is None:
+        raise ConfigurationError('No external file store configured (store.provider = \'database\')')
+    return f'{provider}:{get_store(provider).put(data)}'
+
+
+def read(key: str, start: int = 0, stop: int = None, chunksize: int = CHUNKSIZE) -> Iterator[bytes]:
+    """Iterate over stored data for `key` from byte `start` up to `stop`."""
+    provider, digest = split_key(key)
+    return get_store(provider).read(digest, start, stop, chunksize)
+
+
+def size(key: str) -> int:
+    """Size of stored data for `key` in bytes."""
+    provider, digest = split_key(key)
+    return get_store(provider).size(digest)
+
+
+def exists(key: str) -> bool:
+    """Check if data for `key` is stored."""
+    provider, digest = split_key(key)
+    return get_store(provider).exists(digest)
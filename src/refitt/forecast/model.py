@@ -6,30 +6,41 @@
 
 # type annotations
 from __future__ import annotations
-from typing import Set, Union, Type, IO, Optional
+from typing import Set, Union, Type, IO, Optional, List, Dict, Tuple
 
 # standard libs
 import json
+import time
 import functools
 from datetime import datetime
 from abc import ABC, abstractmethod
 
 # external libs
+import numpy as np
 from astropy.time import Time
 
 # internal libs
-from refitt.core.schema import DictSchema, SchemaDefinitionError
+from refitt.core import arrays
+from refitt.core.schema import DictSchema, ListSchema, SchemaError, SchemaDefinitionError
 from refitt.core.typing import JsonDict, JsonObject
+from refitt.core.logging import Logger
+from refitt.database.interface import Session
 from refitt.database.model import Model as ModelRecord, ModelType, Epoch, Source, Object, ObservationType, Observation
 
 # public interface
-__all__ = ['ModelData', 'ModelSchema', ]
+__all__ = ['ModelData', 'ModelSchema', 'PUBLISH_CHUNKSIZE', ]
+
+# module logger
+log = Logger.with_name(__name__)
+
+
+# Number of objects whose models are written per transaction with `ModelData.publish_all`
+PUBLISH_CHUNKSIZE: int = 1000
 
 
-@functools.lru_cache(maxsize=None)
 def get_epoch_id() -> int:
-    """Fetch and cache the latest epoch id."""
-    return Epoch.latest().id
+    """Fetch the latest epoch id (cached for a short time, see `Epoch.latest_id`)."""
+    return Epoch.latest_id()
 
 
 @functools.lru_cache(maxsize=None)
@@ -73,10 +84,28 @@ class ModelSchema(DictSchema):
                 raise self.DefinitionError(f'Required key \'{key}\' not found')
 
 
+def _list_depth(schema: Optional[DictSchema]) -> int:
+    """Number of nested list levels in `schema` (e.g., 2 for list[list[float]])."""
+    depth = 0
+    while isinstance(schema, ListSchema):
+        depth, schema = depth + 1, schema.member_type
+    return depth
+
+
 class ModelData(ABC):
-    """Interface for model schema and data management."""
+    """
+    Interface for model schema and data management.
+
+    Numeric arrays (see `array_keys`) may be given either as JSON lists or in the compact
+    encoded form of `refitt.core.arrays`. Encoded arrays are validated by their header
+    and only decoded (into numpy arrays) when accessed.
+    """
 
     __data: JsonDict
+    __decoded: Dict[str, np.ndarray] = None
+
+    # Members which may be stored as encoded arrays
+    array_keys: Tuple[str, ...] = ModelRecord.array_keys
 
     class Error(Exception):
         """Errors common to model data interface."""
@@ -107,11 +136,50 @@ class ModelData(ABC):
     @data.setter
     def data(self: ModelData, other: JsonDict) -> None:
         """Assign underlying JSON data."""
-        self.__data = self.schema.ensure(other)
+        encoded = [key for key in self.array_keys if isinstance(other, dict) and arrays.is_encoded(other.get(key))]
+        if not encoded:
+            self.__data = self.schema.ensure(other)
+        else:
+            for key in encoded:
+                self.__check_encoded(key, other[key])
+            self.schema.ensure({**other, **{key: [] for key in encoded}})  # NOTE: arrays checked by header
+            self.__data = other
+        self.__decoded = None
+
+    def __check_encoded(self: ModelData, key: str, value: JsonDict) -> None:
+        """Validate header of encoded array `value` for member `key` against schema."""
+        member_type = self.schema.member_type.get(key)  # noqa: member_type is dict
+        ndim = _list_depth(member_type)
+        try:
+            if not ndim:
+                raise arrays.ArrayError(f'Expected type {member_type}, found encoded array')
+            arrays.check(value, ndim=ndim)
+        except arrays.ArrayError as error:
+            raise SchemaError(f'{error}, for member \'{key}\'') from error
+
+    def array(self: ModelData, key: str) -> np.ndarray:
+        """Member `key` as numpy array (encoded arrays are decoded once on first access)."""
+        if self.__decoded is None:
+            self.__decoded = {}
+        if key not in self.__decoded:
+            value = self.data[key]
+            self.__decoded[key] = arrays.decode(value) if arrays.is_encoded(value) else np.asarray(value, dtype=float)
+        return self.__decoded[key]
 
     def __getattr__(self: ModelData, key: str) -> JsonObject:
-        """Access internal data with dot-notation."""
-        return self.data[key]
+        """Access internal data with dot-notation (encoded arrays are decoded)."""
+        value = self.data[key]
+        if arrays.is_encoded(value):
+            return self.array(key)
+        return value
+
+    def __getstate__(self: ModelData) -> JsonDict:
+        """Pickle underlying JSON data only."""
+        return self.data
+
+    def __setstate__(self: ModelData, state: JsonDict) -> None:
+        """Restore from pickled data (already validated)."""
+        self.__data = state
 
     def __str__(self: ModelData) -> str:
         """View model data in string (JSON) form."""
@@ -150,24 +218,29 @@ class ModelData(ABC):
         with open(filepath, mode='r', **options) as stream:
             return cls.from_io(stream)
 
-    def to_dict(self: ModelData) -> JsonDict:
-        """Dump model data to dictionary."""
-        return self.data.copy()
+    def to_dict(self: ModelData, array_format: str = None, dtype: str = 'float64') -> JsonDict:
+        """
+        Dump model data to dictionary.
+        Arrays are kept as given unless `array_format` is 'list' (decoded to JSON lists)
+        or 'binary' (encoded as `dtype`).
+        """
+        return arrays.convert_all(self.data, self.array_keys, array_format, dtype=dtype)
 
     def to_local(self: ModelData, filepath: str, indent: int = 4, **options) -> None:
         """Write model data to local `filepath`."""
         with open(filepath, mode='w') as output:
             json.dump(self.to_dict(), output, indent=indent, **options)
 
-    def publish(self: ModelData, observation_id: int = None, epoch_id: int = None) -> ModelRecord:
-        """Construct and publish records to database."""
+    def publish(self: ModelData, observation_id: int = None, epoch_id: int = None,
+                array_format: str = None) -> ModelRecord:
+        """Construct and publish records to database (see `to_dict` for `array_format`)."""
         if not observation_id:
             observation_id = self.publish_observation(epoch_id).id
         return ModelRecord.add({
             'epoch_id': epoch_id or get_epoch_id(),
             'type_id': get_model_type_id(self.name),
             'observation_id': observation_id,
-            'data': self.to_dict()
+            'data': self.to_dict(array_format=array_format)
         })
 
     def publish_observation(self: ModelData, epoch_id: int = None) -> Observation:
@@ -182,6 +255,73 @@ class ModelData(ABC):
             'time': self.observation_time,
         })
 
+    @staticmethod
+    def group_by_object(models: List[ModelData]) -> Dict[int, List[ModelData]]:
+        """Resolve object for all `models` in bulk and group them by object ID."""
+        objects = Object.from_aliases('ztf', list({model.ztf_id for model in models}))
+        missing = sorted({model.ztf_id for model in models} - set(objects))
+        if missing:
+            raise Object.NotFound(f'No object with alias ztf={missing[0]}'
+                                  + (f' (and {len(missing) - 1} others)' if len(missing) > 1 else ''))
+        groups = {}
+        for model in models:
+            model.object_id = objects[model.ztf_id].id  # NOTE: sets cached_property
+            groups.setdefault(model.object_id, []).append(model)
+        return groups
+
+    @staticmethod
+    def publish_all(groups: Dict[int, List[ModelData]], primary_type: str, epoch_id: int = None,
+                    chunksize: int = PUBLISH_CHUNKSIZE, array_format: str = None) -> List[int]:
+        """
+        Publish models for many objects in bulk (see `group_by_object`).
+
+        Within each group, the model of `primary_type` defines the predicted observation that
+        all models for that object reference. Observation and model records are inserted
+        together for `chunksize` objects at a time, committing once per chunk.
+        Model data is stored with the given `array_format` (see `to_dict`).
+        Returns IDs of published model records.
+        """
+        primaries = {}
+        for object_id, models in groups.items():
+            found = [model for model in models if model.name == primary_type]
+            if len(found) != 1:
+                raise ModelData.Error(f'Expected one {primary_type} model for {models[0].ztf_id} '
+                                      f'(found {len(found)})')
+            primaries[object_id], = found
+        session = Session()
+        epoch_id = epoch_id or get_epoch_id()
+        source_id = get_source_id('refitt')
+        model_ids = []
+        object_ids = list(groups)
+        start_time = time.monotonic()
+        for start in range(0, len(object_ids), chunksize):
+            chunk = object_ids[start:start + chunksize]
+            try:
+                observations = [Observation(epoch_id=epoch_id, object_id=object_id, source_id=source_id,
+                                            type_id=get_observation_type_id(primaries[object_id].filter),
+                                            value=primaries[object_id].observation_value,
+                                            error=primaries[object_id].observation_error,
+                                            time=primaries[object_id].observation_time)
+                                for object_id in chunk]
+                session.add_all(observations)
+                session.flush()
+                chunk_records = [ModelRecord(epoch_id=epoch_id, type_id=get_model_type_id(model.name),
+                                             observation_id=observation.id,
+                                             data=model.to_dict(array_format=array_format))
+                                 for object_id, observation in zip(chunk, observations)
+                                 for model in groups[object_id]]
+                session.add_all(chunk_records)
+                session.flush()
+                model_ids.extend(record.id for record in chunk_records)
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise
+            elapsed = time.monotonic() - start_time
+            log.info(f'Published {len(model_ids)} models for {start + len(chunk)} objects '
+                     f'({len(model_ids) / elapsed:.1f} models/s)')
+        return model_ids
+
     @functools.cached_property
     def object_id(self: ModelData) -> int:
         """Object ID for REFITT from ZTF ID."""
@@ -17,6 +17,7 @@ from flask import Flask, Response, request
 from refitt.core.logging import Logger
 from refitt.database.interface import Session
 from refitt.web.api.response import STATUS
+from refitt.web.api.tools import APIRequest
 
 # public interface
 __all__ = ['application', ]
@@ -27,6 +28,7 @@ log = Logger.with_name(__name__)
 
 # flask application
 application = Flask(__name__)
+application.request_class = APIRequest
 
 
 @application.errorhandler(STATUS['Not Found'])
@@ -6,7 +6,7 @@
 
 # type annotations
 from __future__ import annotations
-from typing import Callable
+from typing import Callable, Optional
 
 # standard libs
 import functools
@@ -14,10 +14,15 @@ from datetime import datetime
 
 # external libs
 from flask import request
+from sqlalchemy import event
+from sqlalchemy.orm import make_transient_to_detached
 from cryptography.hazmat.primitives.constant_time import bytes_eq
 
 # internal libs
+from refitt.core.config import config, ConfigurationError
+from refitt.core.cache import TTLCache
 from refitt.core.logging import Logger
+from refitt.database.interface import Session
 from refitt.database.model import Client
 from refitt.web.token import Secret, JWT, AuthError, TokenNotFound, TokenExpired
 
@@ -49,6 +54,59 @@ class PermissionDenied(AuthError):
     """Action not permitted for current user/level."""
 
 
+try:
+    CACHE_TTL: float = float(config.api.cache.ttl)
+    CACHE_MAXSIZE: int = int(config.api.cache.maxsize)
+except (AttributeError, TypeError, ValueError) as _error:
+    raise ConfigurationError(f'api.cache: ({_error})') from _error
+
+
+# NOTE: Each worker process holds its own cache. Changes made within the process
+# invalidate entries immediately, changes made elsewhere take effect within `CACHE_TTL`.
+token_cache = TTLCache(maxsize=CACHE_MAXSIZE, ttl=CACHE_TTL)  # token -> (client_id, exp)
+client_cache = TTLCache(maxsize=CACHE_MAXSIZE, ttl=CACHE_TTL)  # client_id -> client.to_dict()
+client_key_cache = TTLCache(maxsize=CACHE_MAXSIZE, ttl=CACHE_TTL)  # key -> client_id
+
+
+def get_cached_client(client_id: int) -> Optional[Client]:
+    """Restore client from cache into the current session (no query issued)."""
+    data = client_cache.get(client_id)
+    if data is None:
+        return None
+    client = Client(**data)
+    make_transient_to_detached(client)
+    return Session.merge(client, load=False)
+
+
+def cache_client(client: Client) -> Client:
+    """Store `client` in cache and return it."""
+    client_cache.put(client.id, client.to_dict())
+    client_key_cache.put(client.key, client.id)
+    return client
+
+
+def load_client(client_id: int) -> Client:
+    """Query for client by `client_id` unless cached."""
+    return get_cached_client(client_id) or cache_client(Client.from_id(client_id))
+
+
+def load_client_by_key(key: str) -> Client:
+    """Query for client by `key` unless cached."""
+    client_id = client_key_cache.get(key)
+    if client_id is not None:
+        client = get_cached_client(client_id)
+        if client is not None and client.key == key:
+            return client
+    return cache_client(Client.from_key(key))
+
+
+@event.listens_for(Client, 'after_update')
+@event.listens_for(Client, 'after_delete')
+def invalidate_client(mapper, connection, target: Client) -> None:  # noqa: unused mapper, connection
+    """Remove cached credentials when a client is changed (e.g., new key or level)."""
+    client_cache.pop(target.id)
+
+
 def authenticate(route: Callable[[Client], dict]) -> Callable[[Client], dict]:
     """Check key:secret authorization in request."""
 
@@ -58,7 +116,7 @@ def authenticate(route: Callable[[Client], dict]) -> Callable[[Client], dict]:
         if not request.authorization:
             raise AuthenticationNotFound('Missing key:secret in header')
         try:
-            client = Client.from_key(request.authorization.username)
+            client = load_client_by_key(request.authorization.username)
         except Client.NotFound:
             raise AuthenticationInvalid('Client key invalid')
         try:
@@ -84,10 +142,15 @@ def authenticated(route: Callable[..., dict]) -> Callable[..., dict]:
         prefix = 'Bearer '
         if header is None or not header.startswith(prefix):
             raise TokenNotFound('Expected "Authorization: Bearer <token>" in header')
-        token = JWT.decrypt(header[len(prefix):].strip().encode())
-        if token.exp is not None and datetime.now() > token.exp:
+        token = header[len(prefix):].strip()
+        client_id, exp = token_cache.get(token, (None, None))
+        if client_id is None:
+            jwt = JWT.decrypt(token.encode())
+            client_id, exp = jwt.sub, jwt.exp
+            token_cache.put(token, (client_id, exp))
+        if exp is not None and datetime.now() > exp:
             raise TokenExpired('Token expired')
-        client = Client.from_id(token.sub)
+        client = load_client(client_id)
         if not client.valid:
             raise PermissionDenied('Access has been revoked')
         return route(client, *args, **kwargs)
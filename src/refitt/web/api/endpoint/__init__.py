@@ -11,7 +11,7 @@ from refitt.web.api.response import endpoint, NotFound
 from refitt.web.api.auth import authenticated, authorization
 from refitt.web.api.endpoint import (
     client, token, facility, user, epoch,
-    object, source, observation, recommendation, model
+    object, source, observation, recommendation, model, status
 )
 
 # public interface
@@ -29,6 +29,7 @@ INFO = {
     'recommendation': recommendation.info,
     'epoch': epoch.info,
     'model': model.info,
+    'status': status.info,
 }
 
 
@@ -12,7 +12,8 @@ from sqlalchemy.orm import joinedload
 from refitt.database.model import Client, Recommendation, Model, Observation
 from refitt.web.api.app import application
 from refitt.web.api.auth import authenticated, authorization
-from refitt.web.api.tools import collect_parameters, disallow_parameters
+from refitt.web.api.tools import (collect_parameters, disallow_parameters, collect_page, paginate, PAGE_PARAMETERS,
+                                  collect_array_format, ARRAY_PARAMETERS)
 from refitt.web.api.response import endpoint, PermissionDenied, ParameterInvalid, PayloadTooLarge
 
 # public interface
@@ -61,16 +62,19 @@ def get(id: int, client: Client) -> Model:
 def get_models(admin_client: Client) -> dict:  # noqa: unused client
     """Query for models."""
     params = collect_parameters(request,
-                                optional=['epoch_id', 'object_id', 'type_id', 'limit', 'join', 'include_data'],
+                                optional=['epoch_id', 'object_id', 'type_id', 'limit', 'join', 'include_data',
+                                          *PAGE_PARAMETERS, *ARRAY_PARAMETERS],
                                 defaults={'join': False, 'include_data': False})
     for opt in 'epoch_id', 'type_id', 'object_id', 'limit':
         if opt in params and not isinstance(params[opt], int):
             raise ParameterInvalid(f'Expected integer for {opt} (given {request.args[opt]})')
         if opt in params and isinstance(params[opt], bool):
             raise ParameterInvalid(f'Expected integer for {opt} (given {request.args[opt]})')
-    if 'limit' not in params and 'epoch_id' not in params and 'object_id' not in params:
+    page = collect_page(params)
+    array_format = collect_array_format(params)
+    if not page and 'limit' not in params and 'epoch_id' not in params and 'object_id' not in params:
         raise PayloadTooLarge(f'Cannot query models without \'epoch_id\' or \'object_id\' and without \'limit\'')
-    if 'limit' not in params and params['include_data'] is True:
+    if not page and 'limit' not in params and params['include_data'] is True:
         raise PayloadTooLarge(f'Cannot include full model data without \'limit\'')
     join = params.pop('join')
     include_data = params.pop('include_data')
@@ -78,7 +82,7 @@ def get_models(admin_client: Client) -> dict:  # noqa: unused client
     epoch_id = params.pop('epoch_id', None)
     object_id = params.pop('object_id', None)
     limit = params.pop('limit', None)
-    query = Model.query()
+    query = Model.query(join=join)
     if object_id:
         query = query.join(Observation).options(joinedload('observation'))
         query = query.filter(Observation.object_id == object_id)
@@ -88,11 +92,18 @@ def get_models(admin_client: Client) -> dict:  # noqa: unused client
         query = query.filter(Model.epoch_id == epoch_id)
     if limit:
         query = query.limit(limit)
-    models = [model.to_json(join=join) for model in query.all()]
-    if not include_data:
-        for model in models:
+    if page and not object_id:
+        query = query.join(Observation)
+    records, next_page = paginate(query, Observation.time, Model.id, *page) if page else (query.all(), None)
+    models = [model.to_json(join=join) for model in records]
+    for model, record in zip(models, records):
+        if include_data:
+            model['data'] = record.data_as(array_format)
+        else:
             model.pop('data')
-    return {'model': models}
+    if not page:
+        return {'model': models}
+    return {'model': models, 'next': next_page}
 
 
 info['Endpoints']['/model']['GET'] = {
@@ -119,6 +130,14 @@ info['Endpoints']['/model']['GET'] = {
                 'Description': 'Limit on number of returned models (default: none)',
                 'Type': 'Integer'
             },
+            'page_size': {
+                'Description': 'Page through models ordered by observation time (default: 1000 with \'after\')',
+                'Type': 'Integer'
+            },
+            'after': {
+                'Description': 'Token for next page (given as \'next\' in previous response)',
+                'Type': 'String'
+            },
             'join': {
                 'Description': 'Include related data',
                 'Type': 'Boolean'
@@ -127,6 +146,10 @@ info['Endpoints']['/model']['GET'] = {
                 'Description': 'Include all data (not just metadata)',
                 'Type': 'Boolean'
             },
+            'arrays': {
+                'Description': 'Format of model arrays, \'list\' or \'binary\' (default: \'list\')',
+                'Type': 'String'
+            },
         },
     },
     'Responses': {
@@ -151,8 +174,10 @@ info['Endpoints']['/model']['GET'] = {
 @authorization(level=None)
 def get_model_by_id(client: Client, id: int) -> dict:
     """Query for model by unique `id`."""
-    params = collect_parameters(request, optional=['join', ], defaults={'join': False})
-    return {'model': get(id, client).to_json(**params)}
+    params = collect_parameters(request, optional=['join', *ARRAY_PARAMETERS], defaults={'join': False})
+    array_format = collect_array_format(params)
+    model = get(id, client)
+    return {'model': {**model.to_json(**params), 'data': model.data_as(array_format)}}
 
 
 info['Endpoints']['/model/<id>']['GET'] = {
@@ -173,6 +198,10 @@ info['Endpoints']['/model/<id>']['GET'] = {
                 'Description': 'Include related data',
                 'Type': 'Boolean'
             },
+            'arrays': {
+                'Description': 'Format of model arrays, \'list\' or \'binary\' (default: \'list\')',
+                'Type': 'String'
+            },
         },
     },
     'Responses': {
@@ -10,7 +10,7 @@ from flask import request
 # internal libs
 from refitt.database.model import Client, Object, ObjectType
 from refitt.web.api.app import application
-from refitt.web.api.response import endpoint
+from refitt.web.api.response import endpoint, ParameterInvalid
 from refitt.web.api.auth import authenticated, authorization
 from refitt.web.api.tools import collect_parameters, disallow_parameters
 
@@ -21,6 +21,7 @@ __all__ = []
 info: dict = {
     'Description': 'Request objects',
     'Endpoints': {
+        '/object': {},
         '/object/<id>': {},
         '/object/<id>/type': {},
         '/object/type/<id>': {},
@@ -28,6 +29,72 @@ info: dict = {
 }
 
 
+# Largest cone search radius allowed (arcseconds)
+MAX_SEARCH_RADIUS: float = 3600
+
+
+@application.route('/object', methods=['GET'])
+@endpoint('application/json')
+@authenticated
+@authorization(level=None)
+def search_objects(client: Client) -> dict:  # noqa: unused client
+    """Query for objects within some radius of a position."""
+    params = collect_parameters(request, required=['ra', 'dec', 'radius'], optional=['join'],
+                                defaults={'join': False})
+    for field in ('ra', 'dec', 'radius'):
+        if not isinstance(params[field], (int, float)) or isinstance(params[field], bool):
+            raise ParameterInvalid(f'Expected numeric value for parameter \'{field}\'')
+    if not -90 <= params['dec'] <= 90:
+        raise ParameterInvalid('Expected -90 <= dec <= 90')
+    if not 0 <= params['radius'] <= MAX_SEARCH_RADIUS:
+        raise ParameterInvalid(f'Expected 0 <= radius <= {MAX_SEARCH_RADIUS}')
+    return {'object': [record.to_json(join=params['join'])
+                       for record in Object.cone_search(params['ra'], params['dec'], params['radius'])]}
+
+
+info['Endpoints']['/object']['GET'] = {
+    'Description': 'Search for objects by position (cone search)',
+    'Permissions': 'Public',
+    'Requires': {
+        'Auth': 'Authorization Bearer Token',
+        'Parameters': {
+            'ra': {
+                'Description': 'Right ascension (degrees)',
+                'Type': 'Float',
+            },
+            'dec': {
+                'Description': 'Declination (degrees)',
+                'Type': 'Float',
+            },
+            'radius': {
+                'Description': f'Search radius (arcseconds, up to {MAX_SEARCH_RADIUS})',
+                'Type': 'Float',
+            },
+        },
+    },
+    'Optional': {
+        'Parameters': {
+            'join': {
+                'Description': 'Include related data',
+                'Type': 'Boolean'
+            }
+        },
+    },
+    'Responses': {
+        200: {
+            'Description': 'Success',
+            'Payload': {
+                'Description': 'List of object data (nearest first)',
+                'Type': 'application/json'
+            },
+        },
+        400: {'Description': 'Missing or invalid parameters'},
+        401: {'Description': 'Access revoked or token expired'},
+        403: {'Description': 'Token not found or invalid'},
+    }
+}
+
+
 @application.route('/object/<int:id>', methods=['GET'])
 @endpoint('application/json')
 @authenticated
@@ -5,23 +5,21 @@
 
 
 # type annotations
-from typing import Tuple, IO
-
-# standard libs
-from io import BytesIO
-from functools import partial
+from typing import Tuple
 
 # external libs
 from flask import request
+from sqlalchemy import or_
+from sqlalchemy.orm import Query
 
 # internal libs
-from refitt.database.interface import Session
 from refitt.database.model import (Client, Source, Observation, ObservationType, Alert, Model,
                                    File, FileType, User, Facility)
 from refitt.web.api.app import application
-from refitt.web.api.response import endpoint, PermissionDenied, PayloadTooLarge
+from refitt.web.api.response import endpoint, PermissionDenied, PayloadTooLarge, FileStream
 from refitt.web.api.auth import authenticated, authorization
-from refitt.web.api.tools import collect_parameters, disallow_parameters
+from refitt.web.api.tools import (collect_parameters, disallow_parameters, collect_page, paginate, PAGE_PARAMETERS,
+                                  collect_array_format, ARRAY_PARAMETERS)
 
 # public interface
 __all__ = []
@@ -62,6 +60,14 @@ def is_viewable(obs: Observation, client: Client) -> bool:
     return client.level <= 1 or obs.source.user_id == client.user_id or obs.source.type_id != 4
 
 
+def filter_viewable(query: Query, client: Client) -> Query:
+    """Filter out user sourced observations if not admin (see `is_viewable`)."""
+    if client.level <= 1:
+        return query
+    return (query.join(Source, Observation.source_id == Source.id)
+            .filter(or_(Source.user_id == client.user_id, Source.type_id != 4)))
+
+
 @application.route('/observation', methods=['GET'])
 @endpoint('application/json')
 @authenticated
@@ -69,22 +75,26 @@ def is_viewable(obs: Observation, client: Client) -> bool:
 def get_many(client: Client) -> dict:
     """Query for observations with filters."""
     filters = ['source_id', 'object_id', 'limit']
-    params = collect_parameters(request, optional=filters+['join', ], defaults={'join': False})
+    params = collect_parameters(request, optional=filters+PAGE_PARAMETERS+['join', ], defaults={'join': False})
     join = params.pop('join')
-    if not params:
+    page = collect_page(params)
+    if not params and not page:
         raise PayloadTooLarge(f'Must specify at least one of {filters}')
-    query = Session.query(Observation).order_by(Observation.id)
+    query = filter_viewable(Observation.query(join=join).order_by(Observation.id), client)
     if 'source_id' in params:
         source_id = params['source_id']
         query = query.filter(Observation.source_id == source_id)
-        if Source.from_id(source_id).type.name == 'broker' and 'limit' not in params and 'object_id' not in params:
+        if (Source.from_id(source_id).type.name == 'broker' and not page and
+                'limit' not in params and 'object_id' not in params):
             raise PayloadTooLarge(f'Cannot query all observations for broker (source_id={source_id})')
     if 'object_id' in params:
         query = query.filter(Observation.object_id == params['object_id'])
     if 'limit' in params:
         query = query.limit(params['limit'])
-    return {'observation': [obs.to_json(join=join)
-                            for obs in filter(partial(is_viewable, client=client), query.all())]}
+    if not page:
+        return {'observation': [obs.to_json(join=join) for obs in query.all()]}
+    observations, next_page = paginate(query, Observation.time, Observation.id, *page)
+    return {'observation': [obs.to_json(join=join) for obs in observations], 'next': next_page}
 
 
 info['Endpoints']['/observation']['GET'] = {
@@ -113,6 +123,14 @@ info['Endpoints']['/observation']['GET'] = {
                 'Description': 'Limit on number of returned observations (default: none)',
                 'Type': 'Integer'
             },
+            'page_size': {
+                'Description': 'Page through observations ordered by time (default: 1000 with \'after\')',
+                'Type': 'Integer'
+            },
+            'after': {
+                'Description': 'Token for next page (given as \'next\' in previous response)',
+                'Type': 'String'
+            },
             'join': {
                 'Description': 'Include related data',
                 'Type': 'Boolean'
@@ -127,6 +145,7 @@ info['Endpoints']['/observation']['GET'] = {
                 'Type': 'application/json'
             },
         },
+        400: {'Description': 'Parameter invalid'},
         401: {'Description': 'Access revoked, token expired'},
         403: {'Description': 'Token not found or invalid'},
         413: {'Description': 'Too few filters'}
@@ -514,8 +533,9 @@ info['Endpoints']['/observation/<id>/alert']['GET'] = {
 @authorization(level=None)
 def get_observation_model(client: Client, id: int) -> dict:  # noqa: unused client
     """Query for model by `id`."""
-    disallow_parameters(request)
-    return {'model': Model.from_id(id).to_json()}
+    array_format = collect_array_format(collect_parameters(request, optional=ARRAY_PARAMETERS))
+    model = Model.from_id(id)
+    return {'model': {**model.to_json(), 'data': model.data_as(array_format)}}
 
 
 info['Endpoints']['/observation/model/<id>']['GET'] = {
@@ -530,6 +550,14 @@ info['Endpoints']['/observation/model/<id>']['GET'] = {
             }
         },
     },
+    'Optional': {
+        'Parameters': {
+            'arrays': {
+                'Description': 'Format of model arrays, \'list\' or \'binary\' (default: \'list\')',
+                'Type': 'String'
+            },
+        },
+    },
     'Responses': {
         200: {
             'Description': 'Success',
@@ -538,6 +566,7 @@ info['Endpoints']['/observation/model/<id>']['GET'] = {
                 'Type': 'application/json'
             },
         },
+        400: {'Description': 'Parameter invalid'},
         401: {'Description': 'Access revoked, token expired, or unauthorized'},
         403: {'Description': 'Token not found or invalid'},
         404: {'Description': 'Model does not exist'},
@@ -551,8 +580,9 @@ info['Endpoints']['/observation/model/<id>']['GET'] = {
 @authorization(level=None)
 def get_observation_models(client: Client, id: int) -> dict:
     """Query for models related to observation by `id`."""
-    disallow_parameters(request)
-    return {'model': [record.to_json() for record in _get_observation(id, client).models]}
+    array_format = collect_array_format(collect_parameters(request, optional=ARRAY_PARAMETERS))
+    return {'model': [{**record.to_json(), 'data': record.data_as(array_format)}
+                      for record in _get_observation(id, client).models]}
 
 
 info['Endpoints']['/observation/<id>/model']['GET'] = {
@@ -567,6 +597,14 @@ info['Endpoints']['/observation/<id>/model']['GET'] = {
             }
         },
     },
+    'Optional': {
+        'Parameters': {
+            'arrays': {
+                'Description': 'Format of model arrays, \'list\' or \'binary\' (default: \'list\')',
+                'Type': 'String'
+            },
+        },
+    },
     'Responses': {
         200: {
             'Description': 'Success',
@@ -575,6 +613,7 @@ info['Endpoints']['/observation/<id>/model']['GET'] = {
                 'Type': 'application/json'
             },
         },
+        400: {'Description': 'Parameter invalid'},
         401: {'Description': 'Access revoked, token expired, or unauthorized'},
         403: {'Description': 'Token not found or invalid'},
         404: {'Description': 'Observation does not exist'},
@@ -586,15 +625,13 @@ info['Endpoints']['/observation/<id>/model']['GET'] = {
 @endpoint('application/octet-stream')
 @authenticated
 @authorization(level=None)
-def get_observation_file(client: Client, id: int) -> Tuple[IO, dict]:
+def get_observation_file(client: Client, id: int) -> Tuple[FileStream, dict]:
     """Query for file related to observation by `id`."""
     disallow_parameters(request)
     file = File.from_observation(id)
     if file.observation.source.user_id != client.user_id and client.level > 1:
         raise PermissionDenied('File is not public')
-    return BytesIO(file.data), {
-        'as_attachment': True, 'download_name': file.name, 'conditional': False,
-    }
+    return FileStream(file.size, file.stream), {'as_attachment': True, 'download_name': file.name}
 
 
 info['Endpoints']['/observation/<id>/file']['GET'] = {
@@ -617,9 +654,11 @@ info['Endpoints']['/observation/<id>/file']['GET'] = {
                 'Type': 'application/octet-stream'
             },
         },
+        206: {'Description': 'Partial file attachment (byte range given by \'Range\' header)'},
         401: {'Description': 'Access revoked, token expired'},
         403: {'Description': 'Token not found or invalid'},
         404: {'Description': 'Observation or file does not exist'},
+        416: {'Description': 'Requested byte range not satisfiable'},
     }
 }
 
@@ -772,15 +811,13 @@ info['Endpoints']['/observation/alert/<id>']['GET'] = {
 @endpoint('application/octet-stream')
 @authenticated
 @authorization(level=None)
-def get_file(client: Client, id: int) -> Tuple[IO, dict]:
+def get_file(client: Client, id: int) -> Tuple[FileStream, dict]:
     """Query for observation file by `id`."""
     disallow_parameters(request)
     file = File.from_id(id)
     if file.observation.source.user_id != client.user_id and client.level > 1:
         raise PermissionDenied('File is not public')
-    return BytesIO(file.data), {
-        'as_attachment': True, 'download_name': file.name, 'conditional': False,
-    }
+    return FileStream(file.size, file.stream), {'as_attachment': True, 'download_name': file.name}
 
 
 info['Endpoints']['/observation/file/<id>']['GET'] = {
@@ -803,9 +840,11 @@ info['Endpoints']['/observation/file/<id>']['GET'] = {
                 'Type': 'application/octet-stream'
             },
         },
+        206: {'Description': 'Partial file attachment (byte range given by \'Range\' header)'},
         401: {'Description': 'Access revoked, token expired'},
         403: {'Description': 'Token not found or invalid'},
         404: {'Description': 'File does not exist'},
+        416: {'Description': 'Requested byte range not satisfiable'},
     }
 }
 
@@ -5,27 +5,31 @@
 
 
 # type annotations
-from typing import Dict, Tuple, Callable, IO
+from typing import Dict, Tuple, Callable
 
 # standard libs
-from io import BytesIO
 from datetime import datetime
 
 # external libs
 from flask import request
 
 # internal libs
+from refitt.core.logging import Logger
 from refitt.database.model import (Client, Recommendation, File, FileType, Observation,
                                    Source, ModelInterface, Epoch, Model)
 from refitt.web.api.app import application
 from refitt.web.api.auth import authenticated, authorization
-from refitt.web.api.tools import collect_parameters, disallow_parameters, require_file, require_data
+from refitt.web.api.tools import (collect_parameters, disallow_parameters, spool_file, require_data,
+                                  collect_page, paginate, PAGE_PARAMETERS, collect_array_format, ARRAY_PARAMETERS)
 from refitt.web.api.response import (endpoint, PermissionDenied, ParameterNotFound, ParameterInvalid,
-                                     PayloadMalformed, NotFound)
+                                     PayloadMalformed, NotFound, FileStream)
 
 # public interface
 __all__ = ['info', 'recommendation_slices', 'FILE_SIZE_LIMIT', ]
 
+# module logger
+log = Logger.with_name(__name__)
+
 
 info: dict = {
     'Description': 'Request recommendations',
@@ -124,7 +128,7 @@ def get_next(client: Client) -> dict:
         if opt in params and not isinstance(params[opt], int):
             raise ParameterInvalid(f'Expected integer for {opt} (given {params[opt]})')
     return {'recommendation': [recommendation.to_json(join=join)
-                               for recommendation in Recommendation.next(user_id=client.user_id, **params)]}
+                               for recommendation in Recommendation.next(user_id=client.user_id, join=join, **params)]}
 
 
 info['Endpoints']['/recommendation']['GET'] = {
@@ -338,13 +342,19 @@ for path in recommendation_slices:
 @authorization(level=None)
 def get_recommendation_history(client: Client) -> dict:
     """Query for recommendation history by group ID."""
-    params = collect_parameters(request, required=['epoch_id'])
+    params = collect_parameters(request, required=['epoch_id'], optional=PAGE_PARAMETERS)
     if not isinstance(params['epoch_id'], int):
         raise ParameterInvalid(f'Expected integer for parameter: epoch_id')
-    return {'recommendation': [
-        recommendation.to_json()
-        for recommendation in Recommendation.history(user_id=client.user_id, epoch_id=params['epoch_id'])
-    ]}
+    page = collect_page(params)
+    if not page:
+        return {'recommendation': [
+            recommendation.to_json()
+            for recommendation in Recommendation.history(user_id=client.user_id, epoch_id=params['epoch_id'])
+        ]}
+    query = Recommendation.query_history(user_id=client.user_id, epoch_id=params['epoch_id'])
+    recommendations, next_page = paginate(query, Recommendation.time, Recommendation.id, *page)
+    return {'recommendation': [recommendation.to_json() for recommendation in recommendations],
+            'next': next_page}
 
 
 info['Endpoints']['/recommendation/history']['GET'] = {
@@ -359,6 +369,18 @@ info['Endpoints']['/recommendation/history']['GET'] = {
             }
         }
     },
+    'Optional': {
+        'Parameters': {
+            'page_size': {
+                'Description': 'Page through recommendations ordered by time (default: 1000 with \'after\')',
+                'Type': 'Integer'
+            },
+            'after': {
+                'Description': 'Token for next page (given as \'next\' in previous response)',
+                'Type': 'String'
+            },
+        },
+    },
     'Responses': {
         200: {
             'Description': 'Success',
@@ -384,7 +406,7 @@ FILE_SIZE_LIMIT: int = 800 * 1024**2
 @endpoint('application/octet-stream')
 @authenticated
 @authorization(level=None)
-def get_recommendation_observed_file(client: Client, id: int) -> Tuple[IO, dict]:
+def get_recommendation_observed_file(client: Client, id: int) -> Tuple[FileStream, dict]:
     """Query for observation file by recommendation `id`."""
     recommendation = Recommendation.from_id(id)
     if recommendation.user_id != client.user_id and client.level > 1:
@@ -393,9 +415,7 @@ def get_recommendation_observed_file(client: Client, id: int) -> Tuple[IO, dict]
         raise NotFound('Missing observation record, cannot get file')
     disallow_parameters(request)
     file = File.from_observation(recommendation.observation_id)
-    return BytesIO(file.data), {
-        'as_attachment': True, 'download_name': file.name, 'conditional': False,
-    }
+    return FileStream(file.size, file.stream), {'as_attachment': True, 'download_name': file.name}
 
 
 info['Endpoints']['/recommendation/<id>/observed/file']['GET'] = {
@@ -418,9 +438,11 @@ info['Endpoints']['/recommendation/<id>/observed/file']['GET'] = {
                 'Type': 'application/octet-stream'
             },
         },
+        206: {'Description': 'Partial file attachment (byte range given by \'Range\' header)'},
         401: {'Description': 'Access level insufficient, revoked, or token expired'},
         403: {'Description': 'Token not found or invalid'},
         404: {'Description': 'Recommendation, observation, or file does not exist'},
+        416: {'Description': 'Requested byte range not satisfiable'},
     }
 }
 
@@ -437,15 +459,18 @@ def add_recommendation_observed_file(client: Client, id: int) -> dict:
     if recommendation.observation_id is None:
         raise NotFound('Missing observation record, cannot upload file')
     disallow_parameters(request)
-    file_name, file_type, file_data = require_file(request, allowed_extensions=FileType.all_names(),
-                                                   size_limit=FILE_SIZE_LIMIT)
+    file_name, file_type, upload = spool_file(request, allowed_extensions=FileType.all_names(),
+                                              size_limit=FILE_SIZE_LIMIT)
     type_id = FileType.from_name(file_type).id
-    try:
-        file = File.from_observation(recommendation.observation_id)
-        File.update(file.id, type_id=type_id, name=file_name, data=file_data)
-    except File.NotFound:
-        file = File.add({'observation_id': recommendation.observation_id, 'epoch_id': Epoch.latest().id,
-                         'type_id': type_id, 'name': file_name, 'data': file_data})
+    with upload.view() as file_data:
+        try:
+            file = File.from_observation(recommendation.observation_id)
+            File.update(file.id, type_id=type_id, name=file_name, data=file_data)
+        except File.NotFound:
+            file = File.add({'observation_id': recommendation.observation_id, 'epoch_id': Epoch.latest_id(),
+                             'type_id': type_id, 'name': file_name, 'data': file_data})
+    log.info(f'Received file for recommendation ({id}): {file_name} '
+             f'({upload.size} bytes, sha256={upload.checksum})')
     return {'file': {'id': file.id}}
 
 
@@ -545,7 +570,7 @@ def add_recommendation_observed(client: Client, id: int) -> dict:
     except ValueError as error:
         raise PayloadMalformed(str(error)) from error
     if recommendation.observation_id is None:
-        observation = Observation.add({**known_fields, 'epoch_id': Epoch.latest().id, 'time': time, **data})
+        observation = Observation.add({**known_fields, 'epoch_id': Epoch.latest_id(), 'time': time, **data})
         Recommendation.update(recommendation.id, observation_id=observation.id)
         return {'observation': observation.to_json()}
     else:
@@ -648,11 +673,12 @@ info['Endpoints']['/recommendation/<id>/model']['GET'] = {
 @authorization(level=None)
 def get_recommendation_model_by_type(client: Client, id: int, type_id: int) -> dict:
     """Query for model data by recommendation ID and model type ID."""
-    disallow_parameters(request)
+    array_format = collect_array_format(collect_parameters(request, optional=ARRAY_PARAMETERS))
     models = [model for model in get(id, client).model_info if model.type_id == type_id]
     if not models:
         raise NotFound(f'No model with type_id={type_id} for recommendation with id={id}')
-    return {'model': Model.from_id(models[0].id).to_json()}
+    model = Model.from_id(models[0].id)
+    return {'model': {**model.to_json(), 'data': model.data_as(array_format)}}
 
 
 info['Endpoints']['/recommendation/<id>/model/<type_id>']['GET'] = {
@@ -671,6 +697,14 @@ info['Endpoints']['/recommendation/<id>/model/<type_id>']['GET'] = {
             }
         },
     },
+    'Optional': {
+        'Parameters': {
+            'arrays': {
+                'Description': 'Format of model arrays, \'list\' or \'binary\' (default: \'list\')',
+                'Type': 'String'
+            },
+        },
+    },
     'Responses': {
         200: {
             'Description': 'Success',
@@ -0,0 +1,72 @@
+# SPDX-FileCopyrightText: 2019-2022 REFITT Team
+# SPDX-License-Identifier: Apache-2.0
+
+"""Service status endpoints."""
+
+
+# standard libs
+import time
+
+# external libs
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+# internal libs
+from refitt.core.logging import Logger
+from refitt.database.model import Client
+from refitt.database.interface import engine, pool_status
+from refitt.web.api.app import application
+from refitt.web.api.response import endpoint
+from refitt.web.api.auth import authenticated, authorization
+
+# public interface
+__all__ = ['info', ]
+
+# module logger
+log = Logger.with_name(__name__)
+
+
+info: dict = {
+    'Description': 'Requests for service status',
+    'Endpoints': {
+        '/status/database': {},
+    }
+}
+
+
+@application.route('/status/database', methods=['GET'])
+@endpoint('application/json')
+@authenticated
+@authorization(level=0)
+def get_database_status(admin: Client) -> dict:  # noqa: admin client not used
+    """Check database connection and report connection pool statistics of this worker."""
+    start = time.monotonic()
+    try:
+        with engine.connect() as connection:
+            connection.execute(text('SELECT 1'))
+        connected = True
+    except SQLAlchemyError as error:
+        log.error(f'Database health check failed: {error}')
+        connected = False
+    return {'database': {'connected': connected, 'latency': time.monotonic() - start, 'pool': pool_status()}}
+
+
+info['Endpoints']['/status/database']['GET'] = {
+    'Description': 'Check database connection and report connection pool statistics (for the responding worker)',
+    'Permissions': 'Admin (level 0)',
+    'Requires': {
+        'Auth': 'Authorization Bearer Token',
+    },
+    'Responses': {
+        200: {
+            'Description': 'Success',
+            'Payload': {
+                'Description': 'Connection status, latency (seconds), and pool statistics '
+                               '(size, checked_in, checked_out, overflow, timeout, and wait count/total/max)',
+                'Type': 'application/json'
+            },
+        },
+        401: {'Description': 'Access level insufficient, revoked, or token expired'},
+        403: {'Description': 'Token not found or invalid'},
+    }
+}
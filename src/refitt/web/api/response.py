@@ -6,7 +6,7 @@
 
 # type annotations
 from __future__ import annotations
-from typing import Tuple, Dict, Type, Callable, Union, IO
+from typing import Tuple, Dict, Type, Callable, Union, IO, Iterator
 
 # standard libs
 import json
@@ -14,6 +14,13 @@ from functools import wraps
 
 # external libs
 from flask import Response, request, send_file
+from werkzeug.datastructures import Headers
+
+# optional faster JSON encoder
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # internal libs
 from refitt.core.logging import Logger
@@ -24,7 +31,7 @@ from refitt.web.api.auth import AuthenticationNotFound, AuthenticationInvalid, P
 # public interface
 __all__ = ['STATUS', 'STATUS_CODE', 'WebException', 'NotFound', 'PayloadTooLarge', 'PayloadInvalid',
            'PermissionDenied', 'PayloadMalformed', 'PayloadNotFound', 'ConstraintViolation',
-           'ParameterNotFound', 'ParameterInvalid', 'RESPONSE_MAP', 'endpoint', ]
+           'ParameterNotFound', 'ParameterInvalid', 'RESPONSE_MAP', 'endpoint', 'FileStream', 'dumps', ]
 
 # module logger
 log = Logger.with_name(__name__)
@@ -36,12 +43,14 @@ STATUS = {
     'OK':                            200,
     'Created':                       201,
     'No Content':                    204,
+    'Partial Content':               206,
     'Bad Request':                   400,
     'Unauthorized':                  401,
     'Forbidden':                     403,
     'Not Found':                     404,
     'Method Not Allowed':            405,
     'Payload Too Large':             413,
+    'Range Not Satisfiable':         416,
     'I\'m a teapot':                 418,  # TODO: awesome Easter egg potential?
     'Too Many Requests':             429,  # TODO: rate limiting?
     'Unavailable For Legal Reasons': 451,  # um... what?
@@ -111,6 +120,52 @@ RESPONSE_MAP: Dict[Type[Exception], int] = {
 }
 
 
+def dumps(data: dict) -> Union[str, bytes]:
+    """Serialize response `data` as JSON (with `orjson` if installed)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+        except TypeError:
+            pass  # NOTE: types only the standard library handles (e.g., numeric subclasses)
+    return json.dumps(data)
+
+
+class FileStream:
+    """
+    File content of known `size` read incrementally by byte range.
+    Returned by octet-stream routes in place of a file object to serve large files
+    as chunks (with support for HTTP Range requests) instead of loading them whole.
+    """
+
+    size: int
+    read: Callable[[int, int], Iterator[bytes]]
+
+    def __init__(self, size: int, read: Callable[[int, int], Iterator[bytes]]) -> None:
+        """Initialize with total `size` and `read(start, stop)` chunk iterator."""
+        self.size = size
+        self.read = read
+
+
+def send_stream(stream: FileStream, download_name: str, as_attachment: bool = True) -> Response:
+    """Build streaming response for `stream`, honoring a single byte range if requested."""
+    headers = Headers()
+    headers.set('Content-Disposition', 'attachment' if as_attachment else 'inline', filename=download_name)
+    headers.set('Accept-Ranges', 'bytes')
+    start, stop, status = 0, stream.size, STATUS['OK']
+    if request.range is not None and request.range.units == 'bytes' and len(request.range.ranges) == 1:
+        byte_range = request.range.range_for_length(stream.size)
+        if byte_range is None:
+            headers.set('Content-Range', f'bytes */{stream.size}')
+            return Response(status=STATUS['Range Not Satisfiable'], headers=headers)
+        start, stop = byte_range
+        status = STATUS['Partial Content']
+        headers.set('Content-Range', f'bytes {start}-{stop - 1}/{stream.size}')
+    response = Response(stream.read(start, stop), status=status, headers=headers,
+                        mimetype='application/octet-stream', direct_passthrough=True)
+    response.content_length = stop - start
+    return response
+
+
 def endpoint(content_type: str) -> Callable[..., Callable[..., Response]]:
     """Correctly format the response based on content-type."""
 
@@ -135,7 +190,7 @@ def endpoint(content_type: str) -> Callable[..., Callable[..., Response]]:
                     status = STATUS['Internal Server Error']
             finally:
                 log.info(f'{request.method} {request.path} {status}')
-                return Response(json.dumps(response), status=status,
+                return Response(dumps(response), status=status,
                                 mimetype='application/json')
 
         @wraps(route)
@@ -143,6 +198,10 @@ def endpoint(content_type: str) -> Callable[..., Callable[..., Response]]:
             status = STATUS['OK']
             try:
                 stream, options = route(*args, **kwargs)
+                if isinstance(stream, FileStream):
+                    response = send_stream(stream, **options)
+                    status = response.status_code
+                    return response
                 return send_file(stream, mimetype='application/octet-stream', **options)
             except Exception as error:
                 response = dict()
@@ -155,7 +214,7 @@ def endpoint(content_type: str) -> Callable[..., Callable[..., Response]]:
                     status = STATUS['Internal Server Error']
                     response['Status'] = 'Critical'
                 response['Message'] = str(error)
-                return Response(json.dumps(response), status=status,
+                return Response(dumps(response), status=status,
                                 mimetype='application/json')
             finally:
                 log.info(f'{request.method} {request.path} {status}')
@@ -5,22 +5,35 @@
 
 
 # type annotations
-from typing import Any, Callable, List, Dict, Union, Tuple
+from typing import Any, Callable, List, Dict, Union, Tuple, Optional, Iterator
 
 # standard libs
 import os
 import json
+import mmap
+import shutil
+import hashlib
+from tempfile import SpooledTemporaryFile
+from contextlib import contextmanager
+from base64 import urlsafe_b64encode, urlsafe_b64decode
+from datetime import datetime
 
 # external libs
 from flask import Request
+from sqlalchemy import Column, or_, and_
+from sqlalchemy.orm import Query
 
 # internal libs
 from refitt.core import typing
+from refitt.core.arrays import ARRAY_FORMATS
 from refitt.web.api.response import (PayloadNotFound, PayloadMalformed, PayloadInvalid, PayloadTooLarge,
                                      ParameterNotFound, ParameterInvalid)
 
 # public interface
-__all__ = ['require_data', 'require_file', 'collect_parameters', 'disallow_parameters', ]
+__all__ = ['require_data', 'require_file', 'spool_file', 'UploadStream', 'APIRequest',
+           'collect_parameters', 'disallow_parameters',
+           'PAGE_PARAMETERS', 'DEFAULT_PAGE_SIZE', 'collect_page', 'paginate',
+           'ARRAY_PARAMETERS', 'collect_array_format', ]
 
 
 # type defs
@@ -76,14 +89,86 @@ def require_data(request: Request, data_format: str = 'json', required_fields: L
     return data
 
 
-def require_file(request: Request, allowed_extensions: List[str] = None,
-                 size_limit: int = None) -> Tuple[str, str, bytes]:
-    """Inspect `request` for files and return file type and contents."""
+# Uploaded files larger than this are spooled to disk (bytes)
+UPLOAD_SPOOL_SIZE: int = 1024**2  # i.e., 1 MB
+
+
+class UploadStream:
+    """
+    Spool for an uploaded file, written to as the request body is parsed.
+    The size limit is enforced and the SHA-256 checksum computed as data arrives,
+    so an oversized upload is rejected as soon as it crosses `size_limit`.
+    """
+
+    size: int
+    size_limit: Optional[int]
+
+    _file: SpooledTemporaryFile
+    _hash: Any
+
+    def __init__(self, size_limit: int = None) -> None:
+        """Initialize empty spool."""
+        self.size = 0
+        self.size_limit = size_limit
+        self._file = SpooledTemporaryFile(max_size=UPLOAD_SPOOL_SIZE)
+        self._hash = hashlib.sha256()
+
+    def write(self, data: bytes) -> int:
+        """Append `data` to spool."""
+        self.size += len(data)
+        if self.size_limit is not None and self.size > self.size_limit:
+            raise PayloadTooLarge(f'File exceeds maximum size of {self.size_limit} bytes')
+        self._hash.update(data)
+        return self._file.write(data)
+
+    @property
+    def checksum(self) -> str:
+        """Hexadecimal SHA-256 digest of data written so far."""
+        return self._hash.hexdigest()
+
+    @contextmanager
+    def view(self) -> Iterator[Union[bytes, memoryview]]:
+        """
+        Access full contents for writing to the database.
+        Contents spooled to disk are memory-mapped rather than read into memory.
+        """
+        self._file.seek(0)
+        if self.size <= UPLOAD_SPOOL_SIZE:
+            yield self._file.read()
+            return
+        self._file.rollover()
+        with mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                yield view
+            finally:
+                view.release()
+
+    def __getattr__(self, attr: str) -> Any:
+        """Other file methods (read, seek, etc.) are those of the spool."""
+        return getattr(self._file, attr)
+
+
+class APIRequest(Request):
+    """Request with uploaded files received into an `UploadStream`."""
+
+    upload_limit: Optional[int] = None
+
+    def _get_file_stream(self, total_content_length: Optional[int], content_type: Optional[str],
+                         filename: str = None, content_length: int = None) -> UploadStream:
+        """Called by form parser for each file in request."""
+        return UploadStream(size_limit=self.upload_limit)
+
+
+def spool_file(request: Request, allowed_extensions: List[str] = None,
+               size_limit: int = None) -> Tuple[str, str, UploadStream]:
+    """Inspect `request` for files and return file type and spooled contents."""
+    request.upload_limit = size_limit  # NOTE: must precede access to `request.files`
     if len(request.files) < 1:
         raise PayloadMalformed('No file attached to request')
     if len(request.files) > 1:
         raise PayloadMalformed('More than one file attached to request')
-    (name, stream), = request.files.items()
+    (name, storage), = request.files.items()
     if not name:
         raise PayloadMalformed('Missing name for file attachment')
     if '.' not in name:
@@ -98,10 +183,19 @@ def require_file(request: Request, allowed_extensions: List[str] = None,
                 break
         else:
             raise PayloadMalformed(f'File type \'{file_type}\' not supported')
-    data = stream.read()
-    if size_limit is not None and len(data) > size_limit:
-        raise PayloadTooLarge(f'File exceeds maximum size of {size_limit} bytes')
-    return file_basename, file_type, data
+    stream = storage.stream
+    if not isinstance(stream, UploadStream):
+        stream = UploadStream(size_limit=size_limit)
+        shutil.copyfileobj(storage.stream, stream, UPLOAD_SPOOL_SIZE)
+    stream.seek(0)
+    return file_basename, file_type, stream
+
+
+def require_file(request: Request, allowed_extensions: List[str] = None,
+                 size_limit: int = None) -> Tuple[str, str, bytes]:
+    """Inspect `request` for files and return file type and contents."""
+    file_basename, file_type, stream = spool_file(request, allowed_extensions, size_limit)
+    return file_basename, file_type, stream.read()
 
 
 def coerce_types(args: Dict[str, str]) -> Dict[str, typing.ValueType]:
@@ -135,3 +229,77 @@ def collect_parameters(request: Request, required: List[str] = None, optional: L
 def disallow_parameters(request: Request) -> None:
     """Consume `request.args` and raise if any present."""
     collect_parameters(request)
+
+
+# optional parameters for paged queries
+PAGE_PARAMETERS: List[str] = ['page_size', 'after', ]
+DEFAULT_PAGE_SIZE: int = 1000
+
+# type defs
+Cursor = Tuple[datetime, int]
+Page = Tuple[int, Optional[Cursor]]
+
+
+def encode_cursor(time: datetime, id: int) -> str:
+    """Opaque token for position (`time`, `id`) in a paged query."""
+    return urlsafe_b64encode(json.dumps([time.isoformat(), id]).encode()).decode()
+
+
+def decode_cursor(token: str) -> Cursor:
+    """Position (time, id) from opaque `token`."""
+    try:
+        time, id = json.loads(urlsafe_b64decode(str(token).encode()).decode())
+        if not isinstance(id, int) or isinstance(id, bool):
+            raise ValueError(f'Expected integer id: {id}')
+        return datetime.fromisoformat(time), id
+    except Exception as error:
+        raise ParameterInvalid(f'Invalid value for parameter \'after\' ({token})') from error
+
+
+def collect_page(params: Dict[str, Any]) -> Optional[Page]:
+    """
+    Pop paging parameters from `params` (see `collect_parameters`).
+    Returns None if neither `page_size` nor `after` were provided.
+    """
+    if 'page_size' not in params and 'after' not in params:
+        return None
+    size = params.pop('page_size', DEFAULT_PAGE_SIZE)
+    if not isinstance(size, int) or isinstance(size, bool) or size < 1:
+        raise ParameterInvalid(f'Expected positive integer for page_size (given {size})')
+    if 'limit' in params:
+        raise ParameterInvalid('Cannot specify both \'limit\' and \'page_size\' or \'after\'')
+    after = params.pop('after', None)
+    return size, (None if after is None else decode_cursor(after))
+
+
+# optional parameter for routes returning model data
+ARRAY_PARAMETERS: List[str] = ['arrays', ]
+
+
+def collect_array_format(params: Dict[str, Any]) -> str:
+    """
+    Pop `arrays` parameter from `params` (see `collect_parameters`).
+    Model arrays are returned as JSON lists ('list', default) or encoded ('binary').
+    """
+    array_format = params.pop('arrays', 'list')
+    if array_format not in ARRAY_FORMATS:
+        raise ParameterInvalid(f'Expected one of {ARRAY_FORMATS} for arrays (given {array_format})')
+    return array_format
+
+
+def paginate(query: Query, time: Column, id: Column, size: int,
+             after: Cursor = None) -> Tuple[List[Any], Optional[str]]:
+    """
+    Keyset pagination of `query` on (`time`, `id`).
+    Returns at most `size` records following the `after` position, and the
+    token for the next page (None if this is the last page).
+    """
+    if after is not None:
+        after_time, after_id = after
+        query = query.filter(or_(time > after_time, and_(time == after_time, id > after_id)))
+    rows = query.add_columns(time, id).order_by(None).order_by(time, id).limit(size + 1).all()
+    records = [row[0] for row in rows[:size]]
+    if len(rows) <= size:
+        return records, None
+    _, last_time, last_id = rows[size - 1]
+    return records, encode_cursor(last_time, last_id)
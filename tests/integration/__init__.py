@@ -2,3 +2,31 @@
 # SPDX-License-Identifier: Apache-2.0
 
 """Integration tests."""
+
+
+# type annotations
+from typing import List, Iterator
+
+# standard libs
+from contextlib import contextmanager
+
+# external libs
+from sqlalchemy import event
+
+# internal libs
+from refitt.database.interface import engine
+
+
+@contextmanager
+def count_statements() -> Iterator[List[str]]:
+    """Collect SQL statements executed by the engine within context."""
+    statements = []
+
+    def record(conn, cursor, statement, *args) -> None:  # noqa: unused arguments
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
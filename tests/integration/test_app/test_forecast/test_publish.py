@@ -9,13 +9,18 @@ from __future__ import annotations
 # from typing import Type, Callable
 
 # standard libs
+import os
+import json
+import logging
+from io import StringIO
 from tempfile import TemporaryDirectory
 
 # external libs
-from pytest import mark, raises, CaptureFixture
+from pytest import mark, raises, CaptureFixture, LogCaptureFixture, MonkeyPatch
 
 # internal libs
 from refitt.apps.refitt.forecast.publish import ForecastPublishApp
+from refitt.database.model import Model, Observation, Object
 # from refitt.core.typing import JsonDict
 # from refitt.database.model import Observation as ObservationModel, Model
 # from refitt.forecast import ConvAutoEncoder, CoreCollapseInference
@@ -23,8 +28,8 @@ from refitt.apps.refitt.forecast.publish import ForecastPublishApp
 
 # testing libs
 # from tests.unit.test_forecast import ModelTestBase
-# from tests.unit.test_forecast import TestConvAutoEncoder as _TestConvAutoEncoder
-# from tests.unit.test_forecast import TestCoreCollapseInference as _TestCoreCollapseInference
+from tests.unit.test_forecast import TestConvAutoEncoder as _TestConvAutoEncoder
+from tests.unit.test_forecast import TestCoreCollapseInference as _TestCoreCollapseInference
 
 
 @mark.integration
@@ -45,3 +50,90 @@ class TestForecastPublishApp:
         out, err = capsys.readouterr()
         assert out.strip() == ForecastPublishApp.interface.help_text.strip()
         assert err == ''
+
+    @staticmethod
+    def write_models(dirpath: str, models: list) -> list:
+        """Write model data to JSON files in `dirpath`, return file paths."""
+        paths = []
+        for i, data in enumerate(models):
+            paths.append(os.path.join(dirpath, f'model_{i}.json'))
+            with open(paths[-1], mode='w') as stream:
+                json.dump(data, stream)
+        return paths
+
+    @mark.parametrize('jobs', [1, 2])
+    def test_bulk(self: TestForecastPublishApp, capsys: CaptureFixture, jobs: int) -> None:
+        """Publish models for many objects with --bulk."""
+        ztf_ids = ['ZTF20actrfli', 'ZTF20actrfjx']  # noqa: spelling
+        models = [{**generate(), 'ztf_id': ztf_id} for ztf_id in ztf_ids for generate in
+                  (_TestConvAutoEncoder.generate, _TestCoreCollapseInference.generate,
+                   _TestCoreCollapseInference.generate)]
+        objects = {ztf_id: Object.from_alias(ztf=ztf_id) for ztf_id in ztf_ids}
+        original = {ztf_id: (obj.pred_type, obj.history) for ztf_id, obj in objects.items()}
+        with TemporaryDirectory() as dirpath:
+            paths = self.write_models(dirpath, models)
+            ForecastPublishApp.main([*paths, '--bulk', '--print', '--jobs', str(jobs), '--chunk-size', '1'])
+        out, err = capsys.readouterr()
+        model_ids = list(map(int, out.split()))
+        assert len(model_ids) == len(models) and err == ''
+        records = [Model.from_id(model_id) for model_id in model_ids]
+        try:
+            assert sorted(record.data['mjd'] for record in records) == sorted(data['mjd'] for data in models)
+            for ztf_id in ztf_ids:
+                group = [record for record in records if record.data['ztf_id'] == ztf_id]
+                assert len(group) == 3
+                assert len({record.observation_id for record in group}) == 1
+                primary, = [record for record in group if record.type.name == 'conv_auto_encoder']
+                observation = primary.observation
+                assert observation.object_id == objects[ztf_id].id
+                assert observation.value == primary.data['next_mag_mean']
+                assert observation.source.name == 'refitt'
+                assert Object.from_id(objects[ztf_id].id).pred_type['conv_auto_encoder']['name'] == 'SN Ia'
+        finally:
+            observation_ids = {record.observation_id for record in records}
+            for model_id in model_ids:
+                Model.delete(model_id)
+            for observation_id in observation_ids:
+                Observation.delete(observation_id)
+            for ztf_id, (pred_type, history) in original.items():
+                Object.update(objects[ztf_id].id, pred_type=pred_type, history=history)
+
+    def test_bulk_missing_primary(self: TestForecastPublishApp, caplog: LogCaptureFixture) -> None:
+        """Each object needs exactly one model of the primary type with --bulk."""
+        models = [_TestCoreCollapseInference.generate(), ]
+        count = Model.count()
+        with TemporaryDirectory() as dirpath:
+            paths = self.write_models(dirpath, models)
+            with caplog.at_level(logging.DEBUG, logger='refitt'):
+                assert ForecastPublishApp.main([*paths, '--bulk']) != 0
+        assert caplog.record_tuples[-1] == (
+            'refitt', logging.CRITICAL, 'Error: Expected one conv_auto_encoder model for ZTF20actrfli (found 0)'
+        )
+        assert Model.count() == count
+
+    def test_jobs_invalid(self: TestForecastPublishApp, caplog: LogCaptureFixture) -> None:
+        """Number of --jobs must be positive."""
+        with TemporaryDirectory() as dirpath:
+            paths = self.write_models(dirpath, [_TestConvAutoEncoder.generate(), ])
+            with caplog.at_level(logging.DEBUG, logger='refitt'):
+                assert ForecastPublishApp.main([*paths, '--bulk', '--jobs', '0']) != 0
+        assert caplog.record_tuples[-1][2].endswith('Expected positive integer for --jobs (given 0)')
+
+    def test_load_all_stdin(self: TestForecastPublishApp, monkeypatch: MonkeyPatch) -> None:
+        """Standard input is read by the parent process, only files are loaded by --jobs processes."""
+        models = [{**_TestConvAutoEncoder.generate(), 'mjd': 59000.0 + i} for i in range(3)]
+        stdin = StringIO(json.dumps(models[1]))
+        stdin.name = '<stdin>'
+        monkeypatch.setattr('sys.stdin', stdin)
+        with TemporaryDirectory() as dirpath:
+            paths = self.write_models(dirpath, [models[0], models[2]])
+            loaded = ForecastPublishApp(jobs=2).load_all([paths[0], '-', paths[1]])
+        assert [model.data['mjd'] for model in loaded] == [data['mjd'] for data in models]
+
+    def test_bulk_with_primary(self: TestForecastPublishApp, caplog: LogCaptureFixture) -> None:
+        """Cannot provide --primary with --bulk."""
+        with TemporaryDirectory() as dirpath:
+            paths = self.write_models(dirpath, [_TestConvAutoEncoder.generate(), ])
+            with caplog.at_level(logging.DEBUG, logger='refitt'):
+                assert ForecastPublishApp.main([*paths, '--bulk', '--primary', paths[0]]) != 0
+        assert caplog.record_tuples[-1][2].endswith('Cannot provide --primary or --observation-id with --bulk')
@@ -10,7 +10,7 @@ from antares_client.search import get_by_id
 
 # internal libs
 from refitt.data.broker.antares import AntaresAlert
-from refitt.database.model import Observation, Alert
+from refitt.database.model import Object, Observation, Alert
 from tests.unit.test_data.test_broker.test_alert import MockAlert
 
 
@@ -70,6 +70,60 @@ class TestMockAlert:
         Alert.delete(a.id)
         Observation.delete(a.observation_id)
 
+    def test_batch_to_database(self) -> None:
+        """Write many alerts in one transaction and compare with per-alert path."""
+
+        # Prepare mock alerts for a few distinct objects
+        objects = [MockAlert.from_random() for _ in range(3)]
+        alerts = []
+        for i in range(12):
+            alert = MockAlert.from_random()
+            alert.data = {**alert.data,
+                          'source_name': objects[i % 3].source_name,
+                          'object_aliases': objects[i % 3].object_aliases,
+                          'object_type_name': objects[i % 3].object_type_name, }
+            alerts.append(alert)
+
+        obj_count = Object.count()
+        obs_count = Observation.count()
+        alert_count = Alert.count()
+
+        records = MockAlert.batch_to_database(alerts)
+        assert len(records) == len(alerts)
+        assert Object.count() == obj_count + 3
+        assert Observation.count() == obs_count + len(alerts)
+        assert Alert.count() == alert_count + len(alerts)
+
+        for alert, record in zip(alerts, records):
+            assert alert._record is record
+            assert record.data == alert.data
+            assert record.observation.object.aliases == alert.object_aliases
+            assert record.observation.source.name == alert.source_name
+            assert record.observation.type.name == alert.observation_type_name
+            assert record.observation.value == alert.observation_value
+            assert record.observation.error == alert.observation_error
+            assert record.observation.epoch_id == record.epoch_id
+
+        # The per-alert path resolves the same objects created by the batch
+        for alert, record in zip(alerts[:3], records[:3]):
+            other = MockAlert(alert.data).to_database()
+            assert other.observation.object_id == record.observation.object_id
+            records.append(other)
+
+        assert Object.count() == obj_count + 3
+
+        # Clean up all added records
+        object_ids = {record.observation.object_id for record in records}
+        for a in records:
+            Alert.delete(a.id)
+            Observation.delete(a.observation_id)
+        for object_id in object_ids:
+            Object.delete(object_id)
+
+    def test_batch_to_database_empty(self) -> None:
+        """An empty batch writes nothing."""
+        assert MockAlert.batch_to_database([]) == []
+
 
 @mark.integration
 class TestAntaresService:
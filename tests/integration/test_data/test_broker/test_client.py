@@ -4,11 +4,21 @@
 """Data broker client integration tests."""
 
 
+# type annotations
+from typing import Iterator
+
+# standard libs
+import os
+from pathlib import Path
+from itertools import islice
+
 # external libs
-from pytest import mark
+from pytest import mark, raises
 
 # internal libs
+from refitt.data.broker import BrokerService, broker_map
 from refitt.database.model import ObjectType, Object, ObservationType, Observation, Alert
+from tests.unit.test_data.test_broker.test_alert import MockAlert
 from tests.unit.test_data.test_broker.test_client import MockClient
 
 
@@ -43,3 +53,69 @@ class TestMockClient:
         assert Observation.count() == num_observations
         assert Object.count() == num_objects
         assert Alert.count() == num_alerts
+
+
+class FiniteMockClient(MockClient):
+    """MockClient that stops after a fixed number of alerts."""
+
+    count: int = 20
+
+    def __iter__(self) -> Iterator[MockAlert]:
+        yield from islice(super().__iter__(), self.count)
+
+    @staticmethod
+    def filter_broken(alert: MockAlert) -> bool:
+        raise RuntimeError(f'Failed to filter alert ({alert.id})')
+
+
+@mark.integration
+class TestBrokerService:
+    """Integrations for broker service with pipelined processing."""
+
+    def setup_method(self) -> None:
+        broker_map['mock'] = FiniteMockClient
+
+    def teardown_method(self) -> None:
+        broker_map.pop('mock')
+
+    def test_pipeline_to_disk_and_database(self, tmp_path: Path) -> None:
+        """Stream alerts through worker and writer threads."""
+        num_alerts = Alert.count()
+        service = BrokerService('mock', 'topic', ('key', 'secret'), output_dir=str(tmp_path),
+                                workers=3, queue_size=4)
+        service.run()
+        assert Alert.count() == num_alerts + FiniteMockClient.count
+        assert len(os.listdir(tmp_path)) == FiniteMockClient.count
+        local = [MockAlert.from_local(os.path.join(tmp_path, filename)).data for filename in os.listdir(tmp_path)]
+        records = Alert.query().order_by(Alert.id.desc()).limit(FiniteMockClient.count).all()
+        for record in records:
+            assert record.data in local
+            object_id = record.observation.object_id
+            Alert.delete(record.id)
+            Observation.delete(record.observation_id)
+            Object.delete(object_id)
+        assert Alert.count() == num_alerts
+
+    def test_pipeline_local_only(self, tmp_path: Path) -> None:
+        """Pipeline with only local files does not write to database."""
+        num_alerts = Alert.count()
+        service = BrokerService('mock', 'topic', ('key', 'secret'), output_dir=str(tmp_path),
+                                local_only=True, workers=2, queue_size=1)
+        service.run()
+        assert Alert.count() == num_alerts
+        assert len(os.listdir(tmp_path)) == FiniteMockClient.count
+
+    def test_pipeline_failure(self, tmp_path: Path) -> None:
+        """Exceptions in pipeline stages stop the service and are re-raised."""
+        service = BrokerService('mock', 'topic', ('key', 'secret'), filter_name='broken',
+                                output_dir=str(tmp_path), workers=2, queue_size=2)
+        with raises(RuntimeError):
+            service.run()
+        assert os.listdir(tmp_path) == []
+
+    def test_invalid_parameters(self) -> None:
+        """Number of workers and queue size are checked."""
+        with raises(ValueError):
+            BrokerService('mock', 'topic', ('key', 'secret'), workers=-1)
+        with raises(ValueError):
+            BrokerService('mock', 'topic', ('key', 'secret'), queue_size=0)
@@ -10,11 +10,13 @@ from typing import Union
 
 # standard libs
 import os
+import time
 import functools
 from io import BytesIO
 
 # external libs
-from pytest import mark
+from pytest import mark, raises
+from sqlalchemy.exc import OperationalError
 from pandas import DataFrame
 
 # internal libs
@@ -59,12 +61,12 @@ class TestTNSCatalog:
 class MockTNSQueryManager(TNSQueryManager):
     """A TNSQueryManager with a mocked interface for queries."""
 
-    def __init__(self) -> None:
-        super().__init__(MockTNSInterface())
+    def __init__(self, **options) -> None:
+        super().__init__(MockTNSInterface(), **options)
 
     @classmethod
-    def from_config(cls, config: Union[dict, TNSConfig] = None) -> MockTNSQueryManager:
-        return cls()
+    def from_config(cls, config: Union[dict, TNSConfig] = None, **options) -> MockTNSQueryManager:
+        return cls(**options)
 
 
 @mark.integration
@@ -74,7 +76,10 @@ class TestTNSQueryManager:
     def test_update_object(self) -> None:
         """Calling update object updates the database."""
         Object.add({'aliases': {'ztf': FAKE_TNS_ZTF_ID}, 'type_id': 1, 'ra': 42, 'dec': 82})
-        MockTNSQueryManager().update_object(FAKE_TNS_ZTF_ID)
+        manager = MockTNSQueryManager()
+        manager.update_object(FAKE_TNS_ZTF_ID)
+        assert manager.pending == 1
+        manager.flush()
         new = Object.from_alias(ztf=FAKE_TNS_ZTF_ID)
         assert new.aliases['iau'] == FAKE_TNS_IAU_NAME
         assert new.redshift == FAKE_TNS_REDSHIFT
@@ -87,12 +92,12 @@ class TestTNSQueryManager:
 class MockTNSCatalogManager(TNSCatalogManager):
     """A TNSCatalogManager with a mocked interface for queries."""
 
-    def __init__(self) -> None:
-        super().__init__(MockTNSInterface())
+    def __init__(self, **options) -> None:
+        super().__init__(MockTNSInterface(), **options)
 
     @classmethod
-    def from_config(cls, config: Union[dict, TNSConfig] = None) -> MockTNSCatalogManager:
-        return cls()
+    def from_config(cls, config: Union[dict, TNSConfig] = None, **options) -> MockTNSCatalogManager:
+        return cls(**options)
 
     @functools.cached_property
     def catalog(self) -> MockTNSCatalog:
@@ -113,6 +118,7 @@ class TestTNSCatalogManager:
         record = manager.catalog.get(FAKE_TNS_ZTF_ID)
         Object.add({'aliases': {'ztf': FAKE_TNS_ZTF_ID}, 'type_id': 1, 'ra': record.ra, 'dec': record.declination})
         manager.update_object(FAKE_TNS_ZTF_ID)
+        manager.flush()
         new = Object.from_alias(ztf=FAKE_TNS_ZTF_ID)
         assert new.aliases['iau'] == record.name
         assert new.redshift == record.redshift
@@ -120,3 +126,93 @@ class TestTNSCatalogManager:
         assert new.data['tns'] == record.to_json()
         assert len(new.history) == 1  # NOTE: the redshift has changed (see MockTNSCatalogManager.catalog).
         Object.delete(new.id)
+
+    def test_update_batched(self) -> None:
+        """Updates are written once enough are pending."""
+        manager = MockTNSCatalogManager(flush_size=2)
+        ids = [Object.add({'aliases': {'ztf': f'ZTF21batch{i}'}, 'type_id': 1, 'ra': 1.0, 'dec': 2.0}).id
+               for i in range(2)]
+        try:
+            manager.catalog.data.internal_names = [f'ZTF21batch{i}' for i in range(len(manager.catalog.data))]
+            manager.update_object('ZTF21batch0')
+            assert manager.pending == 1
+            assert 'iau' not in Object.from_id(ids[0]).aliases
+            manager.update_object('ZTF21batch1')
+            assert manager.pending == 0
+            for i, object_id in enumerate(ids):
+                assert Object.from_id(object_id).aliases == {'ztf': f'ZTF21batch{i}',
+                                                             'iau': manager.catalog.data.name[i]}
+        finally:
+            for object_id in ids:
+                Object.delete(object_id)
+
+    def test_update_interval(self) -> None:
+        """Pending updates are written once the oldest is too old."""
+        manager = MockTNSCatalogManager(flush_interval=0.1)
+        object_id = Object.add({'aliases': {'ztf': 'ZTF21batch0'}, 'type_id': 1, 'ra': 1.0, 'dec': 2.0}).id
+        try:
+            manager.catalog.data.internal_names = [f'ZTF21batch{i}' for i in range(len(manager.catalog.data))]
+            manager.update_object('ZTF21batch0')
+            manager.check_flush()
+            assert manager.pending == 1
+            time.sleep(0.1)
+            manager.check_flush()
+            assert manager.pending == 0
+            assert Object.from_id(object_id).aliases['iau'] == manager.catalog.data.name[0]
+        finally:
+            Object.delete(object_id)
+
+    def test_update_same_object_pending(self) -> None:
+        """Pending update is written before the same object is updated again."""
+        manager = MockTNSCatalogManager()
+        object_id = Object.add({'aliases': {'ztf': 'ZTF21batch0'}, 'type_id': 1, 'ra': 1.0, 'dec': 2.0}).id
+        try:
+            manager.catalog.data.internal_names = [f'ZTF21batch{i}' for i in range(len(manager.catalog.data))]
+            manager.catalog.data.loc[0, 'redshift'] = 0.1
+            manager.update_object('ZTF21batch0')
+            manager.catalog.data.loc[0, 'redshift'] = 0.2
+            manager.update_object('ZTF21batch0')
+            manager.flush()
+            obj = Object.from_id(object_id)
+            assert obj.redshift == 0.2
+            assert [entry['redshift'] for entry in obj.history.values()] == [None, 0.1]
+        finally:
+            Object.delete(object_id)
+
+    def test_update_failed_object(self) -> None:
+        """A failing update is dropped without losing the rest of the batch."""
+        manager = MockTNSCatalogManager()
+        ids = [Object.add({'aliases': {'ztf': f'ZTF21batch{i}'}, 'type_id': 1, 'ra': 1.0, 'dec': 2.0}).id
+               for i in range(2)]
+        try:
+            manager.queue_update(ids[0], {'foo': 42})
+            manager.queue_update(ids[1], {'redshift': 0.5})
+            manager.flush()
+            assert manager.pending == 0
+            assert Object.from_id(ids[0]).redshift is None
+            assert Object.from_id(ids[1]).redshift == 0.5
+        finally:
+            for object_id in ids:
+                Object.delete(object_id)
+
+    def test_update_database_unavailable(self, monkeypatch) -> None:
+        """Pending updates are kept if the database cannot be reached."""
+        manager = MockTNSCatalogManager()
+        object_id = Object.add({'aliases': {'ztf': 'ZTF21batch0'}, 'type_id': 1, 'ra': 1.0, 'dec': 2.0}).id
+        try:
+            manager.queue_update(object_id, {'redshift': 0.5})
+            with monkeypatch.context() as patch:
+                patch.setattr(Object, 'update_all', mock_update_unavailable)
+                with raises(OperationalError):
+                    manager.flush()
+            assert manager.pending == 1
+            manager.flush()
+            assert manager.pending == 0
+            assert Object.from_id(object_id).redshift == 0.5
+        finally:
+            Object.delete(object_id)
+
+
+def mock_update_unavailable(updates: dict) -> None:
+    """Stand-in for `Object.update_all` with the database unreachable."""
+    raise OperationalError('UPDATE object', updates, Exception('connection refused'))
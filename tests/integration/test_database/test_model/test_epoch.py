@@ -9,7 +9,8 @@ import pytest
 from sqlalchemy.exc import IntegrityError
 
 # internal libs
-from refitt.database import config
+from refitt.core.cache import TTLCache
+from refitt.database import config, model
 from refitt.database.model import Epoch, NotFound
 from tests.integration.test_database.test_model.conftest import TestData
 from tests.integration.test_database.test_model import json_roundtrip
@@ -80,6 +81,30 @@ class TestEpoch:
             'created': '2020-10-27 20:01:00' + ('' if config.provider == 'sqlite' else '-04:00')
         }
 
+    def test_latest_id_cached(self, monkeypatch) -> None:
+        """Test latest epoch ID is reused until invalidated."""
+        monkeypatch.setattr(model, 'epoch_cache', TTLCache(maxsize=1, ttl=60))
+        assert Epoch.latest_id() == 4
+        session = Epoch.query().session
+        epoch_id = session.execute(Epoch.__table__.insert().values(id=5)).inserted_primary_key[0]  # NOTE: no events
+        session.commit()
+        try:
+            assert Epoch.latest_id() == 4
+            model.epoch_cache.clear()
+            assert Epoch.latest_id() == epoch_id == 5
+        finally:
+            session.execute(Epoch.__table__.delete().where(Epoch.__table__.c.id == epoch_id))
+            session.commit()
+
+    def test_latest_id_invalidated(self, monkeypatch) -> None:
+        """Test latest epoch ID follows epochs created and deleted within the process."""
+        monkeypatch.setattr(model, 'epoch_cache', TTLCache(maxsize=1, ttl=60))
+        assert Epoch.latest_id() == 4
+        epoch = Epoch.new()
+        assert Epoch.latest_id() == epoch.id == Epoch.latest().id
+        Epoch.delete(epoch.id)
+        assert Epoch.latest_id() == 4
+
     def test_select_with_limit(self) -> None:
         """Test the selection of epoch with a limit."""
         tzinfo = '' if config.provider == 'sqlite' else '-04:00'
@@ -9,6 +9,9 @@ import pytest
 from sqlalchemy.exc import IntegrityError
 
 # internal libs
+from refitt.database import store
+from refitt.database.interface import Session
+from refitt.database.store import LocalFileStore
 from refitt.database.model import Epoch, File, FileType, Observation, NotFound
 from tests.integration.test_database.test_model.conftest import TestData
 from tests.integration.test_database.test_model import json_roundtrip
@@ -103,3 +106,59 @@ class TestFile:
         """Test observation foreign key relationship on file."""
         for i, record in enumerate(testdata['file']):
             assert File.from_id(i + 1).observation.id == record['observation_id']
+
+    def test_size(self) -> None:
+        """Test size of file data without loading it."""
+        for file in File.query().all():
+            assert file.size == len(file.data)
+
+    @pytest.mark.parametrize('chunksize', [1, 7, 1024**2])
+    def test_stream(self, chunksize: int) -> None:
+        """Test reading file data in chunks."""
+        file = File.from_id(1)
+        chunks = list(file.stream(chunksize=chunksize))
+        assert all(len(chunk) <= chunksize for chunk in chunks)
+        assert b''.join(chunks) == file.data
+        assert b''.join(file.stream(3, 17, chunksize=chunksize)) == file.data[3:17]
+        assert b''.join(file.stream(file.size, chunksize=chunksize)) == b''
+
+    def test_stream_dedicated_session(self) -> None:
+        """Test streaming after the scoped session is closed does not reopen it."""
+        file = File.from_id(1)
+        data, size = file.data, file.size
+        chunks = file.stream(chunksize=7)
+        Session.remove()  # NOTE: as when the request finishes before the response is streamed
+        assert b''.join(chunks) == data and size == len(data)
+        assert not Session.registry.has()
+
+    def test_data_storage(self) -> None:
+        """Test file data storage is only changed (and rewritten) on PostgreSQL."""
+        postgresql = Session.get_bind().dialect.name == 'postgresql'
+        original = {file.id: file.data for file in File.query().all()}
+        with Session.get_bind().begin() as connection:
+            assert File.set_data_storage(connection) is postgresql
+        assert File.rewrite_data() == (len(original) if postgresql else 0)
+        Session.expire_all()
+        assert {file.id: file.data for file in File.query().all()} == original
+
+    def test_move_to_store(self, monkeypatch, tmp_path) -> None:
+        """Test moving file data to external store and reading it back."""
+        if store.default_provider() is not None:
+            pytest.skip('File data already held in external store')
+        local = LocalFileStore(str(tmp_path))
+        monkeypatch.setattr(store, 'default_provider', lambda: 'local')
+        monkeypatch.setattr(store, 'get_store', lambda provider: local)
+        original = {file.id: file.data for file in File.query().all()}
+        try:
+            assert File.move_to_store() == len(original)
+            assert File.move_to_store() == 0
+            for file in File.query().all():
+                assert file.storage_key.startswith('local:')
+                assert file._data == b''
+                assert file.size == len(original[file.id])
+                assert file.data == original[file.id]
+                assert b''.join(file.stream(3, 17, chunksize=5)) == original[file.id][3:17]
+        finally:
+            for file in File.query().all():
+                file._data, file.storage_key = original[file.id], None
+            File.query().session.commit()
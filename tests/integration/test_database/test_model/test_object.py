@@ -8,7 +8,7 @@ import pytest
 from sqlalchemy.exc import IntegrityError
 
 # internal libs
-from refitt.database.model import Object, NotFound, AlreadyExists
+from refitt.database.model import Object, ObjectAlias, NotFound, AlreadyExists
 from tests.integration.test_database.test_model.conftest import TestData
 from tests.integration.test_database.test_model import json_roundtrip
 
@@ -90,6 +90,94 @@ class TestObject:
         with pytest.raises(NotFound):
             Object.from_alias(foo='bar')
 
+    def test_from_aliases(self, testdata: TestData) -> None:
+        """Test loading many objects by alias in one query."""
+        names = [record['aliases']['ztf'] for record in testdata['object']]
+        found = Object.from_aliases('ztf', names + ['ZTF_does_not_exist', ])
+        assert set(found) == set(names)
+        for name, record in zip(names, testdata['object']):
+            assert found[name].aliases == record['aliases']
+        assert Object.from_aliases('ztf', []) == {}
+
+    def test_alias_index_maintained(self) -> None:
+        """Test alias index follows changes to `Object.aliases`."""
+        obj = Object.add({'type_id': 1, 'aliases': {'foo': 'bar_1'}, 'ra': 1.0, 'dec': 2.0})
+        try:
+            assert Object.from_alias(foo='bar_1').id == obj.id
+            Object.add_alias(obj.id, baz=42)
+            assert Object.from_alias(baz=42).id == obj.id
+            Object.update(obj.id, aliases={'foo': 'bar_2'})
+            assert Object.from_alias(foo='bar_2').id == obj.id
+            for alias in [{'foo': 'bar_1'}, {'baz': 42}]:
+                with pytest.raises(Object.NotFound):
+                    Object.from_alias(**alias)
+        finally:
+            Object.delete(obj.id)
+        assert ObjectAlias.query().filter(ObjectAlias.object_id == obj.id).count() == 0
+
+    def test_alias_types_distinct(self) -> None:
+        """Test aliases of different types with the same text do not collide."""
+        ids = [Object.add({'type_id': 1, 'aliases': {'foo': name}, 'ra': 1.0, 'dec': 2.0}).id for name in (42, '42')]
+        try:
+            assert Object.from_alias(foo=42).id == ids[0]
+            assert Object.from_alias(foo='42').id == ids[1]
+            found = Object.from_aliases('foo', [42, '42', 43])
+            assert {name: record.id for name, record in found.items()} == {42: ids[0], '42': ids[1]}
+        finally:
+            for object_id in ids:
+                Object.delete(object_id)
+
+    def test_alias_index_rebuild(self, testdata: TestData) -> None:
+        """Test alias index can be rebuilt from existing objects."""
+        count = ObjectAlias.count()
+        assert ObjectAlias.rebuild() == Object.count()
+        assert ObjectAlias.count() == count
+        for record in testdata['object']:
+            assert Object.from_alias(ztf=record['aliases']['ztf']).aliases == record['aliases']
+
+    def test_cone_search(self, testdata: TestData) -> None:
+        """Test positional search finds objects nearest first."""
+        for i, record in enumerate(testdata['object']):
+            results = Object.cone_search(record['ra'], record['dec'] + 1 / 3600, radius=2)
+            assert [obj.id for obj in results] == [i + 1, ]
+            assert Object.cone_search(record['ra'], record['dec'] + 3 / 3600, radius=2) == []
+
+    def test_cone_search_order(self) -> None:
+        """Test cone search across ra=0 returns nearest first."""
+        ids = [Object.add({'type_id': 1, 'aliases': {'foo': f'cone_{i}'}, 'ra': ra, 'dec': -30.0}).id
+               for i, ra in enumerate([359.999, 0.0005, 0.01])]
+        try:
+            assert [obj.id for obj in Object.cone_search(0.0, -30.0, radius=10)] == [ids[1], ids[0]]
+            assert [obj.id for obj in Object.cone_search(0.0, -30.0, radius=60)] == [ids[1], ids[0], ids[2]]
+            Object.update(ids[2], ra=0.0)
+            assert [obj.id for obj in Object.cone_search(0.0, -30.0, radius=1)] == [ids[2]]
+        finally:
+            for object_id in ids:
+                Object.delete(object_id)
+
+    def test_update_all(self) -> None:
+        """Test bulk update of many objects, maintaining alias index and pixel."""
+        ids = [Object.add({'type_id': 1, 'aliases': {'foo': f'bulk_{i}'}, 'ra': 10.0, 'dec': 20.0}).id
+               for i in range(3)]
+        try:
+            assert Object.update_all({ids[0]: {'redshift': 0.5, 'data': {'x': 1}},
+                                      ids[1]: {'aliases': {'foo': 'bulk_1', 'bar': 'bulk_x'}},
+                                      ids[2]: {'ra': 0.0, 'dec': -30.0}}) == 3
+            assert Object.from_id(ids[0]).redshift == 0.5
+            assert Object.from_id(ids[0]).data == {'x': 1}
+            assert Object.from_alias(bar='bulk_x').id == ids[1]
+            assert [obj.id for obj in Object.cone_search(0.0, -30.0, radius=1)] == [ids[2]]
+            assert Object.update_all({}) == 0
+        finally:
+            for object_id in ids:
+                Object.delete(object_id)
+
+    @pytest.mark.parametrize('data', [{'foo': 1}, {'id': 1}, {'ra': 1.0}])
+    def test_update_all_invalid(self, data: dict) -> None:
+        """Test bulk update only of columns (and ra/dec together)."""
+        with pytest.raises(AttributeError):
+            Object.update_all({1: data})
+
     def test_alias_exists(self) -> None:
         with pytest.raises(AlreadyExists):
             Object.add_alias(2, ztf=Object.from_id(1).aliases['ztf'])
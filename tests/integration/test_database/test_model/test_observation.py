@@ -15,6 +15,7 @@ from sqlalchemy.exc import IntegrityError
 from refitt.database import config
 from refitt.database.model import Epoch, Observation, NotFound, Object, Source
 from tests.integration.test_database.test_model.conftest import TestData
+from tests.integration import count_statements
 from tests.integration.test_database.test_model import json_roundtrip
 
 
@@ -105,6 +106,23 @@ class TestObservation:
             },
         }
 
+    def test_embedded_depth(self) -> None:
+        """Integer `join` includes related records only to that depth."""
+        data = Observation.from_id(1).to_json(join=1)
+        assert data['object'] == Object.from_id(1).to_json(join=False)
+        assert 'type' not in data['object']
+        assert Observation.from_id(1).to_json(join=2)['object'] == Object.from_id(1).to_json(join=True)
+
+    def test_join_options(self) -> None:
+        """Eager loading with `query(join=True)` gives the same result in a fixed number of queries."""
+        expected = [obs.to_json(join=True) for obs in Observation.query().order_by(Observation.id)]
+        Observation.query().session.expire_all()
+        with count_statements() as statements:
+            observations = Observation.query(join=True).order_by(Observation.id).all()
+            assert [obs.to_json(join=True) for obs in observations] == expected
+        assert len(expected) > 10
+        assert len(statements) == 1
+
     def test_from_id(self, testdata: TestData) -> None:
         """Test loading observation from `id`."""
         # NOTE: `id` not set until after insert
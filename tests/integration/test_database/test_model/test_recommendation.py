@@ -4,15 +4,23 @@
 """Database recommendation model integration tests."""
 
 
+# type annotations
+from typing import List
+
+# standard libs
+import json
+from datetime import datetime, timedelta
+
 # external libs
-from pytest import mark, raises
+from pytest import raises
 from sqlalchemy.exc import IntegrityError
 
 # internal libs
 from refitt.database import config
-from refitt.database.model import (Epoch, Recommendation, RecommendationTag,
+from refitt.database.model import (Epoch, Recommendation, RecommendationTag, RecommendationQueue,
                                    User, Facility, Object, Observation, NotFound)
 from tests.integration.test_database.test_model.conftest import TestData
+from tests.integration import count_statements
 from tests.integration.test_database.test_model import json_roundtrip
 
 
@@ -162,13 +170,93 @@ class TestRecommendation:
         response = Recommendation.next(user_id=user_id, epoch_id=3)
         assert len(response) == 0
 
-    @mark.skip(reason='No test data allowing for realtime mode')
+    def test_next_join(self) -> None:
+        """Test query for latest recommendations with related records loaded up front."""
+        user_id = User.from_alias('tomb_raider').id
+        records = Recommendation.for_user(user_id, epoch_id=3)
+        try:
+            for record in records:
+                Recommendation.update(record.id, accepted=False)
+            expected = [record.to_json(join=True) for record in Recommendation.next(user_id=user_id, epoch_id=3)]
+            Recommendation.query().session.expire_all()
+            response = Recommendation.next(user_id=user_id, epoch_id=3, join=True)
+            with count_statements() as statements:
+                assert [record.to_json(join=True) for record in response] == expected
+            assert len(expected) == len(records) and not statements
+        finally:
+            for record in records:
+                Recommendation.update(record.id, accepted=True)
+
     def test_next_realtime(self) -> None:
         """Test query for latest recommendation in 'realtime' mode."""
-        # user_id = User.from_alias('glentner').id
-        # epoch_id = Epoch.latest().id
-        # response = Recommendation.next(user_id=user_id, epoch_id=epoch_id, mode='realtime')
-        # TODO: Fix testing dataset to allow realtime mode testing
+        user_id = User.from_alias('tomb_raider').id
+        records = Recommendation.for_user(user_id, epoch_id=3)
+        now = datetime.now().astimezone()
+        curves = [
+            {now - timedelta(hours=1): 1.5, now + timedelta(hours=1): 1.3},  # airmass 1.4
+            {now - timedelta(hours=1): 2.0, now + timedelta(hours=1): 1.8},  # not visible
+            {now - timedelta(hours=2): 1.1, now + timedelta(hours=2): 1.1},  # airmass 1.1
+        ]
+        original = {record.id: record.data for record in records}
+        try:
+            for record, curve in zip(records, curves):
+                airmass = json.dumps({time.isoformat(): value for time, value in curve.items()})
+                Recommendation.update(record.id, accepted=False, data={**record.data, 'airmass': airmass})
+            Recommendation.update(records[3].id, accepted=False)  # NOTE: missing airmass is skipped
+            response = Recommendation.next(user_id=user_id, epoch_id=3, mode='realtime')
+            assert [record.id for record in response] == [records[2].id, records[0].id]
+            response = Recommendation.next(user_id=user_id, epoch_id=3, mode='realtime', limit=1)
+            assert [record.id for record in response] == [records[2].id, ]
+        finally:
+            self.restore(original)
+
+    @staticmethod
+    def restore(original: dict) -> None:
+        """Reset accepted state, data, and airmass columns of recommendations."""
+        for record_id, data in original.items():
+            record = Recommendation.from_id(record_id)
+            record.accepted, record.data = True, data
+            record.airmass_time = record.airmass_value = record.visible_start = record.visible_end = None
+        Recommendation.query().session.commit()
+
+    def test_airmass_columns(self) -> None:
+        """Test airmass curve given in data is stored in typed columns with visibility window."""
+        record = Recommendation.for_user(User.from_alias('tomb_raider').id, epoch_id=3)[0]
+        start = datetime(2022, 1, 1).astimezone()
+        curve = {(start + timedelta(hours=i)).isoformat(): value for i, value in enumerate([2.0, 1.5, 1.2, 1.6, 2.5])}
+        original = {record.id: record.data}
+        try:
+            Recommendation.update(record.id, data={**record.data, 'airmass': json.dumps(curve)})
+            Recommendation.query().session.expire_all()
+            record = Recommendation.from_id(record.id)
+            assert 'airmass' not in record.data
+            assert record.airmass_time.tolist() == [(start + timedelta(hours=i)).timestamp() for i in range(5)]
+            assert record.airmass_value.tolist() == [2.0, 1.5, 1.2, 1.6, 2.5]
+            assert record.visible_start.astimezone() == start + timedelta(hours=1)
+            assert record.visible_end.astimezone() == start + timedelta(hours=3)
+        finally:
+            self.restore(original)
+
+    def test_backfill_airmass(self) -> None:
+        """Test migration of airmass curves stored in JSON data."""
+        record = Recommendation.for_user(User.from_alias('tomb_raider').id, epoch_id=3)[0]
+        curve = {datetime(2022, 1, 1).astimezone().isoformat(): 1.2,
+                 datetime(2022, 1, 2).astimezone().isoformat(): 1.3}
+        original = {record.id: record.data}
+        session = Recommendation.query().session
+        try:
+            # NOTE: bulk update bypasses flush events (as with rows written before the migration)
+            session.query(Recommendation).filter(Recommendation.id == record.id).update(
+                {'data': {**record.data, 'airmass': json.dumps(curve)}}, synchronize_session=False)
+            session.commit()
+            assert Recommendation.from_id(record.id).airmass_time is None
+            assert Recommendation.backfill_airmass(batch_size=2) == 1
+            record = Recommendation.from_id(record.id)
+            assert 'airmass' not in record.data
+            assert record.airmass_value.tolist() == [1.2, 1.3]
+            assert Recommendation.backfill_airmass() == 0
+        finally:
+            self.restore(original)
 
     def test_history(self) -> None:
         """Test query for previously interacted with recommendations."""
@@ -191,3 +279,60 @@ class TestRecommendation:
         records = Recommendation.history(user_id=user_id, epoch_id=3)
         assert len(records) == 4
         assert all(r.accepted for r in records)
+
+    @staticmethod
+    def queued(user_id: int, epoch_id: int) -> List[int]:
+        """Recommendation IDs in queue for user."""
+        return [entry.recommendation_id for entry in
+                RecommendationQueue.query()
+                .filter(RecommendationQueue.user_id == user_id, RecommendationQueue.epoch_id == epoch_id)
+                .order_by(RecommendationQueue.priority)]
+
+    def test_queue_maintained(self) -> None:
+        """Test queue follows accepted and rejected state of recommendations."""
+        user_id = User.from_alias('tomb_raider').id
+        records = Recommendation.for_user(user_id, epoch_id=3)
+        priorities = [record.priority for record in records]
+        assert self.queued(user_id, 3) == []  # NOTE: all accepted already
+        try:
+            Recommendation.update(records[2].id, accepted=False)
+            Recommendation.update(records[0].id, accepted=False)
+            assert self.queued(user_id, 3) == [records[0].id, records[2].id]
+            Recommendation.update(records[0].id, rejected=True)
+            assert self.queued(user_id, 3) == [records[2].id, ]
+            Recommendation.update(records[2].id, priority=0)
+            entry, = RecommendationQueue.query().filter(RecommendationQueue.recommendation_id == records[2].id)
+            assert entry.priority == 0 and entry.facility_id == records[2].facility_id
+            assert entry.magnitude == records[2].predicted.value
+        finally:
+            for record, priority in zip(records, priorities):
+                Recommendation.update(record.id, accepted=True, rejected=False, priority=priority)
+        assert self.queued(user_id, 3) == []
+
+    def test_queue_magnitude_follows_prediction(self) -> None:
+        """Test queue magnitude is updated along with the predicted observation."""
+        user_id = User.from_alias('tomb_raider').id
+        record = Recommendation.for_user(user_id, epoch_id=3)[0]
+        value = record.predicted.value
+        try:
+            Recommendation.update(record.id, accepted=False)
+            Observation.update(record.predicted_observation_id, value=value + 10)
+            entry, = RecommendationQueue.query().filter(RecommendationQueue.recommendation_id == record.id)
+            assert entry.magnitude == value + 10
+            assert record.id not in [rec.id for rec in Recommendation.next(user_id, epoch_id=3,
+                                                                           limiting_magnitude=value + 5)]
+            Observation.update(record.predicted_observation_id, value=value)
+            assert record.id in [rec.id for rec in Recommendation.next(user_id, epoch_id=3,
+                                                                       limiting_magnitude=value + 5)]
+        finally:
+            Observation.update(record.predicted_observation_id, value=value)
+            Recommendation.update(record.id, accepted=True)
+        assert self.queued(user_id, 3) == []
+
+    def test_queue_rebuild(self) -> None:
+        """Test queue can be rebuilt from existing recommendations."""
+        count = RecommendationQueue.count()
+        pending = Recommendation.query().filter(Recommendation.accepted.is_(False),
+                                                Recommendation.rejected.is_(False)).count()
+        assert RecommendationQueue.rebuild() == pending == count
+        assert RecommendationQueue.count() == count
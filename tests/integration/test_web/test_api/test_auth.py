@@ -0,0 +1,54 @@
+# SPDX-FileCopyrightText: 2019-2022 REFITT Team
+# SPDX-License-Identifier: Apache-2.0
+
+"""Integration tests for API authentication caching."""
+
+
+# external libs
+from pytest import mark, fixture, raises
+
+# internal libs
+from refitt.core.cache import TTLCache
+from refitt.database.model import Client, User
+from refitt.web.api import auth
+from tests.integration.test_web.test_api import restore_client
+
+
+@fixture
+def enable_cache(monkeypatch) -> None:
+    """Replace module caches with enabled instances (tests run with caching disabled)."""
+    for name in 'token_cache', 'client_cache', 'client_key_cache':
+        monkeypatch.setattr(auth, name, TTLCache(maxsize=100, ttl=60))
+
+
+@mark.integration
+@mark.usefixtures('enable_cache')
+class TestClientCache:
+    """Tests for cached client lookups in API authentication."""
+
+    def test_load_client(self) -> None:
+        client = Client.from_user(User.from_alias('tomb_raider').id)
+        assert auth.load_client(client.id).to_dict() == client.to_dict()
+        assert auth.client_cache.get(client.id) == client.to_dict()
+        assert auth.load_client_by_key(client.key).to_dict() == client.to_dict()
+
+    def test_invalidated_on_level_change(self) -> None:
+        client = Client.from_user(User.from_alias('tomb_raider').id)
+        level = client.level
+        auth.load_client(client.id)
+        try:
+            Client.update(client.id, level=level + 1)
+            assert auth.client_cache.get(client.id) is None
+            assert auth.load_client(client.id).level == level + 1
+        finally:
+            Client.update(client.id, level=level)
+
+    def test_invalidated_on_new_key(self) -> None:
+        client = Client.from_user(User.from_alias('tomb_raider').id)
+        old_key = client.key
+        with restore_client(client.id):
+            auth.load_client_by_key(old_key)
+            new_key, _ = Client.new_key(client.user_id)
+            with raises(Client.NotFound):
+                auth.load_client_by_key(old_key)
+            assert auth.load_client_by_key(new_key.value).id == client.id
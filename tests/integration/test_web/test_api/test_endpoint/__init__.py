@@ -94,17 +94,17 @@ class EndpointBase(ABC):
         return self.content_map[response_type](response)
 
     def make_request(self, method: str, route: str, client_id: int, data: bytes = None,
-                     json: dict = None, response_type: str = 'json',
-                     files: Dict[str, IO] = None, **params) -> Tuple[int, Union[dict, bytes]]:
+                     json: dict = None, response_type: str = 'json', files: Dict[str, IO] = None,
+                     headers: Dict[str, str] = None, **params) -> Tuple[int, Union[dict, bytes]]:
         token = self.create_token(client_id)
         response = self.methods[method](format_request(route), params=params, data=data, json=json, files=files,
-                                        headers={'Authorization': f'Bearer {token}'})
+                                        headers={**(headers or {}), 'Authorization': f'Bearer {token}'})
         return response.status_code, self.get_content(response_type, response)
 
     def get(self, route: str, client_id: int, data: bytes = None, json: dict = None,
-            response_type: str = 'json', **params) -> Tuple[int, dict]:
+            response_type: str = 'json', headers: Dict[str, str] = None, **params) -> Tuple[int, dict]:
         return self.make_request('get', route, client_id, data=data, json=json,
-                                 response_type=response_type, **params)
+                                 response_type=response_type, headers=headers, **params)
 
     def put(self, route: str, client_id: int, data: bytes = None, json: dict = None,
             response_type: str = 'json', **params) -> Tuple[int, dict]:
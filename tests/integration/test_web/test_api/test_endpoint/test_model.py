@@ -8,6 +8,7 @@
 from pytest import mark
 
 # internal libs
+from refitt.core import arrays
 from refitt.database.model import Recommendation, Model, User
 from refitt.web.api.response import STATUS, RESPONSE_MAP, NotFound, ParameterInvalid, PermissionDenied, PayloadTooLarge
 from tests.integration.test_web.test_api.test_endpoint import Endpoint
@@ -135,6 +136,45 @@ class TestGetModel(Endpoint):
                 'Response': {'model': [model.to_json() for model in Model.query().filter_by(type_id=1).all()]}},
         )
 
+    def test_by_type_include_data_binary(self) -> None:
+        status, payload = self.get(self.route, client_id=self.get_client(self.admin).id,
+                                   type_id='1', include_data='true', limit='100', arrays='binary')
+        assert status == STATUS['OK']
+        models = Model.query().filter_by(type_id=1).all()
+        assert [model['data'] for model in payload['Response']['model']] == [
+            arrays.encode_all(model.data, Model.array_keys) for model in models]
+        assert [arrays.decode_all(model['data']) for model in payload['Response']['model']] == [
+            model.data for model in models]
+
+    def test_invalid_array_format(self) -> None:
+        assert self.get(self.route, client_id=self.get_client(self.admin).id,
+                        type_id='1', limit='100', arrays='numpy') == (
+            RESPONSE_MAP[ParameterInvalid], {
+                'Status': 'Error',
+                'Message': 'Expected one of [\'list\', \'binary\'] for arrays (given numpy)'
+            }
+        )
+
+    def test_by_type_paged(self) -> None:
+        client_id = self.get_client(self.admin).id
+        models = sorted(Model.query().filter_by(type_id=1).all(),
+                        key=lambda model: (model.observation.time, model.id))
+        pages, after = [], None
+        while True:
+            params = {'type_id': 1, 'page_size': 10, **({} if after is None else {'after': after})}
+            status, payload = self.get(self.route, client_id=client_id, **params)
+            assert status == STATUS['OK']
+            assert len(payload['Response']['model']) <= 10
+            pages.extend(payload['Response']['model'])
+            after = payload['Response']['next']
+            if after is None:
+                break
+        expected = [model.to_json() for model in models]
+        for model in expected:
+            model.pop('data')
+        assert len(pages) == 24
+        assert pages == expected
+
 
 @mark.integration
 class TestGetModelByID(Endpoint):
@@ -192,3 +232,13 @@ class TestGetModelByID(Endpoint):
                 'Status': 'Success',
                 'Response': {'model': model.to_json(), }}
         )
+
+    def test_success_binary(self) -> None:
+        user_id = User.from_alias(self.user).id
+        recommendation = Recommendation.query().filter_by(user_id=user_id).first()
+        model = Model.query().filter_by(observation_id=recommendation.predicted_observation_id).first()
+        assert self.get(f'/model/{model.id}', client_id=self.get_client(self.user).id, arrays='binary') == (
+            STATUS['OK'], {
+                'Status': 'Success',
+                'Response': {'model': {**model.to_json(), 'data': arrays.encode_all(model.data, Model.array_keys)}}}
+        )
@@ -6,10 +6,66 @@
 
 # internal libs
 from refitt.database.model import Object, ObjectType
-from refitt.web.api.response import STATUS, RESPONSE_MAP, NotFound, ParameterInvalid
+from refitt.web.api.response import STATUS, RESPONSE_MAP, NotFound, ParameterInvalid, ParameterNotFound
 from tests.integration.test_web.test_api.test_endpoint import Endpoint
 
 
+class TestSearchObject(Endpoint):
+    """Tests for GET /object endpoint."""
+
+    route: str = '/object'
+    method: str = 'get'
+    admin: str = 'superman'
+    user: str = 'tomb_raider'
+
+    def test_invalid_parameter(self) -> None:
+        client = self.get_client(self.user)
+        assert self.get(self.route, client_id=client.id, ra=1, dec=1, radius=1, foo='42') == (
+            RESPONSE_MAP[ParameterInvalid], {
+                'Status': 'Error',
+                'Message': 'Unexpected parameter: foo'
+            }
+        )
+
+    def test_missing_parameter(self) -> None:
+        client = self.get_client(self.user)
+        assert self.get(self.route, client_id=client.id, ra=1, dec=1) == (
+            RESPONSE_MAP[ParameterNotFound], {
+                'Status': 'Error',
+                'Message': 'Missing expected parameter: radius'
+            }
+        )
+
+    def test_radius_too_large(self) -> None:
+        client = self.get_client(self.user)
+        assert self.get(self.route, client_id=client.id, ra=1, dec=1, radius=1e6) == (
+            RESPONSE_MAP[ParameterInvalid], {
+                'Status': 'Error',
+                'Message': 'Expected 0 <= radius <= 3600'
+            }
+        )
+
+    def test_search(self) -> None:
+        client = self.get_client(self.user)
+        object = Object.from_id(1)
+        assert self.get(self.route, client_id=client.id, ra=object.ra, dec=object.dec + 1 / 3600, radius=2) == (
+            STATUS['OK'], {
+                'Status': 'Success',
+                'Response': {'object': [object.to_json(join=False), ]},
+            }
+        )
+
+    def test_search_empty(self) -> None:
+        client = self.get_client(self.user)
+        object = Object.from_id(1)
+        assert self.get(self.route, client_id=client.id, ra=object.ra, dec=object.dec + 3 / 3600, radius=2) == (
+            STATUS['OK'], {
+                'Status': 'Success',
+                'Response': {'object': []},
+            }
+        )
+
+
 class TestGetObject(Endpoint):
     """Tests for GET /object/<id> endpoint."""
 
@@ -5,8 +5,12 @@
 
 
 # internal libs
+from refitt.core import arrays
+from refitt.database.interface import Session
 from refitt.database.model import Source, Observation, ObservationType, Alert, Model, File, FileType
+from refitt.web.api.endpoint.observation import is_viewable, filter_viewable
 from refitt.web.api.response import STATUS, RESPONSE_MAP, NotFound, ParameterInvalid, PermissionDenied, PayloadTooLarge
+from tests.integration import count_statements
 from tests.integration.test_web.test_api.test_endpoint import Endpoint
 
 
@@ -99,6 +103,78 @@ class TestGetObservations(Endpoint):
                                              if obs.source_id == source.id]}},
         )
 
+    def test_query_object_paged(self) -> None:
+        client_id = self.get_client(self.admin).id
+        observations = sorted(Observation.with_object(1), key=lambda obs: (obs.time, obs.id))
+        assert len(observations) > 2
+        pages, after = [], None
+        while True:
+            params = {'object_id': 1, 'page_size': 2, **({} if after is None else {'after': after})}
+            status, payload = self.get(self.route, client_id=client_id, **params)
+            assert status == STATUS['OK']
+            assert len(payload['Response']['observation']) <= 2
+            pages.extend(payload['Response']['observation'])
+            after = payload['Response']['next']
+            if after is None:
+                break
+        assert pages == [obs.to_json() for obs in observations]
+
+    def test_query_broker_paged(self) -> None:
+        source = Source.from_name('antares')
+        observations = sorted(Observation.with_source(source.id), key=lambda obs: (obs.time, obs.id))
+        status, payload = self.get(self.route, client_id=self.get_client(self.admin).id,
+                                   source_id=source.id, page_size=3)
+        assert status == STATUS['OK']
+        assert payload['Response']['observation'] == [obs.to_json() for obs in observations[:3]]
+        assert payload['Response']['next'] is not None
+
+    def test_page_size_invalid(self) -> None:
+        assert self.get(self.route, client_id=self.get_client(self.admin).id, object_id=1, page_size=0) == (
+            RESPONSE_MAP[ParameterInvalid], {
+                'Status': 'Error',
+                'Message': 'Expected positive integer for page_size (given 0)'
+            }
+        )
+
+    def test_page_with_limit(self) -> None:
+        assert self.get(self.route, client_id=self.get_client(self.admin).id,
+                        object_id=1, limit=1, page_size=1) == (
+            RESPONSE_MAP[ParameterInvalid], {
+                'Status': 'Error',
+                'Message': 'Cannot specify both \'limit\' and \'page_size\' or \'after\''
+            }
+        )
+
+    def test_page_after_invalid(self) -> None:
+        assert self.get(self.route, client_id=self.get_client(self.admin).id, object_id=1, after='abc') == (
+            RESPONSE_MAP[ParameterInvalid], {
+                'Status': 'Error',
+                'Message': 'Invalid value for parameter \'after\' (abc)'
+            }
+        )
+
+
+class TestFilterViewable:
+    """Tests for observation visibility filter."""
+
+    @staticmethod
+    def check(user_alias: str) -> None:
+        client = Endpoint.get_client(user_alias)
+        expected = [obs.id for obs in Session.query(Observation).order_by(Observation.id).all()
+                    if is_viewable(obs, client)]
+        Session.expunge_all()  # NOTE: force loads to go to the database
+        with count_statements() as statements:
+            query = filter_viewable(Session.query(Observation).order_by(Observation.id), client)
+            observations = [obs.to_json() for obs in query.all()]
+        assert len(statements) == 1
+        assert [obs['id'] for obs in observations] == expected
+
+    def test_admin(self) -> None:
+        self.check('superman')
+
+    def test_user(self) -> None:
+        self.check('tomb_raider')
+
 
 class TestGetObservation(Endpoint):
     """Tests for GET /observation/<id> endpoint."""
@@ -628,6 +704,26 @@ class TestGetObservationModel(Endpoint):
             }
         )
 
+    def test_get_by_id_binary(self) -> None:
+        source = Source.from_name('refitt')
+        observation = Observation.with_source(source.id)[0]
+        assert self.get(f'/observation/{observation.id}/model', client_id=self.get_client(self.admin).id,
+                        arrays='binary') == (
+            STATUS['OK'], {
+                'Status': 'Success',
+                'Response': {'model': [{**record.to_json(), 'data': arrays.encode_all(record.data, Model.array_keys)}
+                                       for record in observation.models]},
+            }
+        )
+
+    def test_invalid_array_format(self) -> None:
+        assert self.get(self.route, client_id=self.get_client(self.admin).id, arrays='numpy') == (
+            RESPONSE_MAP[ParameterInvalid], {
+                'Status': 'Error',
+                'Message': 'Expected one of [\'list\', \'binary\'] for arrays (given numpy)'
+            }
+        )
+
 
 class TestGetObservationFile(Endpoint):
     """Tests for GET /observation/<id>/file endpoint."""
@@ -682,6 +778,20 @@ class TestGetObservationFile(Endpoint):
             STATUS['OK'], File.from_observation(observation.id).data
         )
 
+    def test_get_range(self) -> None:
+        client = self.get_client(self.user)
+        data = File.from_observation(21).data
+        assert self.get(f'/observation/21/file', client_id=client.id, response_type='bytes',
+                        headers={'Range': 'bytes=2-9'}) == (STATUS['Partial Content'], data[2:10])
+        assert self.get(f'/observation/21/file', client_id=client.id, response_type='bytes',
+                        headers={'Range': 'bytes=10-'}) == (STATUS['Partial Content'], data[10:])
+
+    def test_range_not_satisfiable(self) -> None:
+        client = self.get_client(self.user)
+        size = len(File.from_observation(21).data)
+        assert self.get(f'/observation/21/file', client_id=client.id, response_type='bytes',
+                        headers={'Range': f'bytes={size}-'}) == (STATUS['Range Not Satisfiable'], b'')
+
 
 class TestGetObservationFileType(Endpoint):
     """Tests for GET /observation/<id>/file endpoint."""
@@ -874,6 +984,29 @@ class TestGetModel(Endpoint):
             }
         )
 
+    def test_get_by_id_binary(self) -> None:
+        model = Model.from_id(1)
+        assert self.get(f'/observation/model/1', client_id=self.get_client(self.admin).id, arrays='binary') == (
+            STATUS['OK'], {
+                'Status': 'Success',
+                'Response': {'model': {**model.to_json(), 'data': arrays.encode_all(model.data, Model.array_keys)}},
+            }
+        )
+
+    def test_get_by_id_stored_binary(self) -> None:
+        model = Model.from_id(1)
+        data = model.data
+        Model.update(model.id, data=arrays.encode_all(data, Model.array_keys))
+        try:
+            assert self.get(f'/observation/model/1', client_id=self.get_client(self.admin).id) == (
+                STATUS['OK'], {
+                    'Status': 'Success',
+                    'Response': {'model': {**Model.from_id(1).to_json(), 'data': data}},
+                }
+            )
+        finally:
+            Model.update(model.id, data=data)
+
 
 class TestGetFileType(Endpoint):
     """Tests for GET /observation/file/type/<id> endpoint."""
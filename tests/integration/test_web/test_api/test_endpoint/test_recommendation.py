@@ -5,6 +5,8 @@
 
 
 # standard libs
+import os
+import json
 from io import BytesIO
 from datetime import datetime
 from abc import ABC, abstractmethod
@@ -19,6 +21,7 @@ from refitt.database.model import Recommendation, Epoch, User, Facility, Observa
 from refitt.web.api.response import (STATUS, RESPONSE_MAP, NotFound, ParameterInvalid, ParameterNotFound,
                                      PermissionDenied, PayloadMalformed)
 from refitt.web.api.endpoint.recommendation import recommendation_slices
+from refitt.web.api.tools import UPLOAD_SPOOL_SIZE
 from tests.integration.test_web.test_api.test_endpoint import Endpoint
 
 
@@ -228,6 +231,45 @@ class TestGetRecommendation(Endpoint):
             }
         )
 
+    @contextmanager
+    def airmass_restored(self) -> None:
+        """Reset data and airmass columns of recommendation afterward."""
+        record = Recommendation.from_id(3)
+        original = record.data
+        try:
+            yield record
+        finally:
+            record = Recommendation.from_id(3)
+            record.data = original
+            record.airmass_time = record.airmass_value = record.visible_start = record.visible_end = None
+            Recommendation.query().session.commit()
+
+    def get_airmass(self) -> dict:
+        """Airmass curve in response data."""
+        status, payload = self.get(self.route, client_id=self.get_client(self.user).id)
+        assert status == STATUS['OK']
+        return json.loads(payload['Response']['recommendation']['data']['airmass'])
+
+    def test_get_airmass(self) -> None:
+        """Airmass curve stored in typed columns is still returned in data."""
+        curve = {datetime(2022, 1, 1, hour).astimezone().isoformat(): 1.0 + hour / 10 for hour in range(3)}
+        with self.airmass_restored() as record:
+            Recommendation.update(3, data={**record.data, 'airmass': json.dumps(curve)})
+            assert Recommendation.from_id(3).airmass_time is not None
+            assert self.get_airmass() == curve
+
+    def test_get_airmass_after_backfill(self) -> None:
+        """Airmass curve moved by backfill is still returned in data."""
+        curve = {datetime(2022, 1, 1, hour).astimezone().isoformat(): 1.0 + hour / 10 for hour in range(3)}
+        with self.airmass_restored() as record:
+            session = Recommendation.query().session
+            session.query(Recommendation).filter(Recommendation.id == 3).update(
+                {'data': {**record.data, 'airmass': json.dumps(curve)}}, synchronize_session=False)
+            session.commit()
+            assert Recommendation.from_id(3).airmass_time is None
+            assert Recommendation.backfill_airmass() == 1
+            assert self.get_airmass() == curve
+
 
 @mark.integration
 class TestPutRecommendationAttribute(Endpoint):
@@ -506,6 +548,22 @@ class TestGetRecommendationHistory(Endpoint):
             }
         )
 
+    def test_get_group_3_paged(self) -> None:
+        history = Recommendation.history(user_id=3, epoch_id=3)
+        history = sorted(history, key=lambda recommendation: (recommendation.time, recommendation.id))
+        client_id = self.get_client(self.user).id
+        status, payload = self.get(self.route, client_id=client_id, epoch_id=3, page_size=3)
+        assert status == STATUS['OK']
+        assert payload['Response']['recommendation'] == [recommendation.to_json() for recommendation in history[:3]]
+        assert self.get(self.route, client_id=client_id, epoch_id=3, page_size=3,
+                        after=payload['Response']['next']) == (
+            STATUS['OK'], {
+                'Status': 'Success',
+                'Response': {'recommendation': [recommendation.to_json() for recommendation in history[3:]],
+                             'next': None},
+            }
+        )
+
 
 @contextmanager
 def temp_remove_observation_and_file(file_id: int) -> None:
@@ -730,6 +788,22 @@ class TestPostRecommendationObservedFile(Endpoint):
             STATUS['OK'], {file.name: file.data}
         )
 
+    def test_successful_update_large_file(self) -> None:
+        rec = Recommendation.from_id(self.recommendation_id)
+        file = File.from_observation(rec.observation_id)
+        client = self.get_client(self.user)
+        route = f'/recommendation/{self.recommendation_id}/observed/file'
+        data = os.urandom(3 * UPLOAD_SPOOL_SIZE + 1)  # NOTE: spooled to disk on the server
+        try:
+            assert self.post(route, client_id=client.id, files={'obs.fits': BytesIO(data), }) == (
+                STATUS['OK'], {'Status': 'Success', 'Response': {'file': {'id': file.id}}}
+            )
+            assert self.get(route, client_id=client.id, response_type='file') == (
+                STATUS['OK'], {'obs.fits': data}
+            )
+        finally:
+            assert self.post(route, client_id=client.id, files={file.name: BytesIO(file.data), })[0] == STATUS['OK']
+
 
 @mark.integration
 class TestGetRecommendationObservedFileType(Endpoint):
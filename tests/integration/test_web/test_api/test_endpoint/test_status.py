@@ -0,0 +1,35 @@
+# SPDX-FileCopyrightText: 2019-2022 REFITT Team
+# SPDX-License-Identifier: Apache-2.0
+
+"""Integration tests for status endpoints."""
+
+
+# internal libs
+from refitt.web.api.response import STATUS, RESPONSE_MAP, PermissionDenied
+from tests.integration.test_web.test_api.test_endpoint import Endpoint
+
+
+class TestDatabaseStatus(Endpoint):
+    """Tests for GET /status/database endpoint."""
+
+    route: str = '/status/database'
+    method: str = 'get'
+    admin: str = 'superman'
+    user: str = 'tomb_raider'
+
+    def test_get(self) -> None:
+        status, payload = self.get(self.route, client_id=self.get_client(self.admin).id)
+        assert status == STATUS['OK']
+        assert payload['Status'] == 'Success'
+        database = payload['Response']['database']
+        assert database['connected'] is True
+        assert database['latency'] >= 0
+        assert 'class' in database['pool']
+
+    def test_permission_denied(self) -> None:
+        assert self.get(self.route, client_id=self.get_client(self.user).id) == (
+            RESPONSE_MAP[PermissionDenied], {
+                'Status': 'Error',
+                'Message': 'Authorization level insufficient'
+            }
+        )
@@ -0,0 +1,57 @@
+# SPDX-FileCopyrightText: 2019-2022 REFITT Team
+# SPDX-License-Identifier: Apache-2.0
+
+"""Performance tests for alert ingest."""
+
+
+# type annotations
+from typing import List
+
+# standard libs
+import time
+
+# external libs
+from pytest import mark
+
+# internal libs
+from refitt.core.logging import Logger
+from refitt.database.model import Object, Observation, Alert
+from tests.unit.test_data.test_broker.test_alert import MockAlert
+
+# module logger
+log = Logger.with_name(__name__)
+
+
+def _cleanup(records: List[Alert]) -> None:
+    """Remove all records created by alerts."""
+    object_ids = {record.observation.object_id for record in records}
+    for record in records:
+        Alert.delete(record.id)
+        Observation.delete(record.observation_id)
+    for object_id in object_ids:
+        Object.delete(object_id)
+
+
+@mark.performance
+class TestAlertIngest:
+    """Compare per-alert and batched alert ingest."""
+
+    count: int = 100
+
+    def test_batch_faster_than_serial(self) -> None:
+        """Batched ingest achieves a higher alert rate than writing alerts one at a time."""
+
+        alerts = [MockAlert.from_random() for _ in range(self.count)]
+        start = time.perf_counter()
+        records = [alert.to_database() for alert in alerts]
+        serial_rate = self.count / (time.perf_counter() - start)
+        _cleanup(records)
+
+        alerts = [MockAlert.from_random() for _ in range(self.count)]
+        start = time.perf_counter()
+        records = MockAlert.batch_to_database(alerts)
+        batch_rate = self.count / (time.perf_counter() - start)
+        _cleanup(records)
+
+        log.info(f'Alert ingest: serial={serial_rate:.1f}/s, batch={batch_rate:.1f}/s')
+        assert batch_rate > serial_rate
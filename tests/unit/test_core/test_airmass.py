@@ -0,0 +1,82 @@
+# SPDX-FileCopyrightText: 2019-2022 REFITT Team
+# SPDX-License-Identifier: Apache-2.0
+
+"""Unit tests for vectorized airmass curves."""
+
+
+# standard libs
+import json
+from datetime import datetime, timezone
+
+# external libs
+import pytest
+import numpy as np
+
+# internal libs
+from refitt.core.airmass import parse_curve, format_curve, pack_curves, interpolate, visible_window
+
+
+@pytest.mark.unit
+def test_parse_curve() -> None:
+    curve = {'2022-01-01T00:00:00+00:00': 1.5, '2022-01-01T00:10:00+00:00': 1.2}
+    start = datetime(2022, 1, 1, tzinfo=timezone.utc).timestamp()
+    for data in (curve, json.dumps(curve)):
+        times, values = parse_curve(data)
+        assert times.tolist() == [start, start + 600]
+        assert values.tolist() == [1.5, 1.2]
+
+
+@pytest.mark.unit
+def test_format_curve() -> None:
+    times, values = np.array([1640995200., 1640995800.]), np.array([1.5, 1.2])
+    data = json.loads(format_curve(times, values))
+    assert list(data.values()) == [1.5, 1.2]
+    assert [datetime.fromisoformat(time).timestamp() for time in data] == times.tolist()
+    assert [array.tolist() for array in parse_curve(format_curve(times, values))] == [times.tolist(), [1.5, 1.2]]
+
+
+@pytest.mark.unit
+def test_pack_curves() -> None:
+    times, values = pack_curves([(np.array([2., 1.]), np.array([20., 10.])),
+                                 (np.array([5.]), np.array([50.]))])
+    assert times.tolist() == [[1., 2.], [5., np.inf]]
+    assert values[0].tolist() == [10., 20.]
+    assert values[1, 0] == 50. and np.isnan(values[1, 1])
+
+
+@pytest.mark.unit
+def test_pack_curves_empty() -> None:
+    times, values = pack_curves([])
+    assert times.shape == values.shape == (0, 0)
+    assert interpolate(times, values, 0).shape == (0, )
+
+
+@pytest.mark.unit
+def test_interpolate() -> None:
+    times, values = pack_curves([
+        (np.array([0., 10., 20.]), np.array([2., 1., 3.])),  # spans point
+        (np.array([0., 15.]), np.array([1., 4.])),            # spans point (uneven length)
+        (np.array([0., 5.]), np.array([1., 2.])),             # ends before point
+        (np.array([20., 30.]), np.array([1., 2.])),           # starts after point
+        (np.array([12.]), np.array([1.])),                    # single sample
+    ])
+    result = interpolate(times, values, 12.)
+    assert result[:2] == pytest.approx([1.4, 3.4])
+    assert np.isnan(result[2:]).all()
+
+
+@pytest.mark.unit
+def test_interpolate_on_sample() -> None:
+    times, values = pack_curves([(np.array([0., 10., 20.]), np.array([2., 1., 3.]))])
+    assert interpolate(times, values, 10.).tolist() == [1.]
+    assert np.isnan(interpolate(times, values, 20.)).all()
+
+
+@pytest.mark.unit
+def test_visible_window() -> None:
+    times = np.array([40., 0., 10., 20., 30., 50.])
+    values = np.array([1.3, 2.0, 1.6, 1.2, 1.8, 2.2])
+    assert visible_window(times, values) == (10., 50.)
+    assert visible_window(times, values, cutoff=1.25) == (10., 30.)
+    assert visible_window(times[:1], values[:1]) == (40., 40.)
+    assert visible_window(times, values, cutoff=1.0) is None
@@ -0,0 +1,68 @@
+# SPDX-FileCopyrightText: 2019-2022 REFITT Team
+# SPDX-License-Identifier: Apache-2.0
+
+"""Unit tests for encoded arrays."""
+
+
+# external libs
+import pytest
+import numpy as np
+
+# internal libs
+from refitt.core.arrays import ArrayError, is_encoded, encode, decode, check, encode_all, decode_all, convert_all
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize('dtype', ['float32', 'float64'])
+def test_round_trip(dtype: str) -> None:
+    values = [[1.5, 2.0, 3.25], [4.0, 5.5, 6.0]]
+    value = encode(values, dtype=dtype)
+    assert is_encoded(value)
+    assert value['dtype'] == dtype and value['shape'] == [2, 3]
+    assert decode(value).tolist() == values
+
+
+@pytest.mark.unit
+def test_unsupported_dtype() -> None:
+    with pytest.raises(ArrayError):
+        encode([1.0, 2.0], dtype='int8')
+
+
+@pytest.mark.unit
+def test_check_ndim() -> None:
+    value = encode([1.0, 2.0, 3.0])
+    check(value, ndim=1)
+    with pytest.raises(ArrayError) as exc_info:
+        check(value, ndim=2)
+    assert str(exc_info.value) == 'Expected 2-dimensional array, found shape=[3]'
+
+
+@pytest.mark.unit
+def test_decode_wrong_size() -> None:
+    value = {**encode([1.0, 2.0, 3.0]), 'shape': [4]}
+    with pytest.raises(ArrayError) as exc_info:
+        decode(value)
+    assert str(exc_info.value) == 'Expected 32 bytes for shape=[4], found 24'
+
+
+@pytest.mark.unit
+def test_encode_decode_all() -> None:
+    data = {'mjd': 1.5, 'mjd_arr': [1.0, 2.0], 'mag_arr': [[3.0, 4.0]]}
+    encoded = encode_all(data, ['mjd_arr', 'mag_arr', 'err_arr'])
+    assert encoded['mjd'] == 1.5 and 'err_arr' not in encoded
+    assert is_encoded(encoded['mjd_arr']) and is_encoded(encoded['mag_arr'])
+    assert encode_all(encoded, ['mjd_arr']) == encoded
+    assert decode_all(encoded) == data
+    assert np.array_equal(decode(encoded['mag_arr']), np.array([[3.0, 4.0]]))
+
+
+@pytest.mark.unit
+def test_convert_all() -> None:
+    data = {'mjd': 1.5, 'mjd_arr': [1.0, 2.0]}
+    encoded = encode_all(data, ['mjd_arr'])
+    assert convert_all(encoded, ['mjd_arr']) == encoded
+    assert convert_all(encoded, ['mjd_arr'], 'list') == data
+    assert convert_all(data, ['mjd_arr'], 'binary') == encoded
+    with pytest.raises(ArrayError) as exc_info:
+        convert_all(data, ['mjd_arr'], 'numpy')
+    assert str(exc_info.value) == 'Unsupported array format \'numpy\' (expected one of [\'list\', \'binary\'])'
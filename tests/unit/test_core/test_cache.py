@@ -0,0 +1,75 @@
+# SPDX-FileCopyrightText: 2019-2022 REFITT Team
+# SPDX-License-Identifier: Apache-2.0
+
+"""Unit tests for in-process caching."""
+
+
+# external libs
+import pytest
+
+# internal libs
+from refitt.core.cache import TTLCache
+
+
+class Clock:
+    """Manually advanced timer."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.unit
+class TestTTLCache:
+    """Unit tests for TTLCache."""
+
+    def test_get_put(self) -> None:
+        cache = TTLCache(maxsize=4, ttl=10)
+        assert cache.get('a') is None
+        assert cache.get('a', 42) == 42
+        cache.put('a', 1)
+        assert cache.get('a') == 1
+        assert 'a' in cache and 'b' not in cache
+
+    def test_expires(self) -> None:
+        clock = Clock()
+        cache = TTLCache(maxsize=4, ttl=10, timer=clock)
+        cache.put('a', 1)
+        clock.now = 9.9
+        assert cache.get('a') == 1
+        clock.now = 10
+        assert cache.get('a') is None
+        assert len(cache) == 0
+
+    def test_evicts_least_recently_used(self) -> None:
+        cache = TTLCache(maxsize=2, ttl=10)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        assert cache.get('a') == 1
+        cache.put('c', 3)
+        assert len(cache) == 2
+        assert cache.get('b') is None
+        assert cache.get('a') == 1 and cache.get('c') == 3
+
+    def test_pop_and_clear(self) -> None:
+        cache = TTLCache(maxsize=4, ttl=10)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        assert cache.pop('a') == 1
+        assert cache.pop('a', 42) == 42
+        cache.clear()
+        assert len(cache) == 0
+
+    @pytest.mark.parametrize('maxsize, ttl', [(0, 10), (4, 0)])
+    def test_disabled(self, maxsize: int, ttl: float) -> None:
+        cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        assert not cache.enabled
+        cache.put('a', 1)
+        assert cache.get('a') is None
+
+    @pytest.mark.parametrize('maxsize, ttl', [(-1, 10), (4, -1)])
+    def test_invalid(self, maxsize: int, ttl: float) -> None:
+        with pytest.raises(ValueError):
+            TTLCache(maxsize=maxsize, ttl=ttl)
@@ -95,6 +95,36 @@ class TestListSchema:
         response, = exc_info.value.args
         assert response == 'Expected members of equal size, found size=1 at position 3 but size=3 at position 0'
 
+    @staticmethod
+    def test_float_rejects_bool() -> None:
+        schema = ListSchema.of(float)
+        with pytest.raises(SchemaError) as exc_info:
+            schema.ensure([1.0, 2, True, 4.0])
+        response, = exc_info.value.args
+        assert response == 'Expected all members to be type float, found bool(True) at position 2'
+
+    @staticmethod
+    def test_compile() -> None:
+        schema = ListSchema.of(ListSchema.of(float, size=Size.ALL_EQUAL))
+        validate = schema.compile()
+        data = [[1, 2.5, 3], [4, 5, 6.5]]
+        assert validate(data) is data
+        with pytest.raises(SchemaError) as exc_info:
+            validate([[1, 2, 3], [4, 5, 'apple']])
+        response, = exc_info.value.args
+        assert response == ('Expected all members to be type float, found str(\'apple\') at position 2, '
+                            'for member at position 1')
+
+    @staticmethod
+    def test_recompiled_on_change() -> None:
+        schema = ListSchema.of(int, size=3)
+        assert schema.ensure([1, 2, 3]) == [1, 2, 3]
+        schema.size = 2
+        with pytest.raises(SchemaError) as exc_info:
+            schema.ensure([1, 2, 3])
+        response, = exc_info.value.args
+        assert response == 'Expected length 2, found length 3'
+
 
 class TestDictSchema:
     """Unit tests for DictSchema."""
@@ -160,3 +190,15 @@ class TestDictSchema:
             schema.ensure({'a': 1, 'b': 2})
         response, = exc_info.value.args
         assert response == 'Expected type str for member \'b\', found int(2) at position 1'
+
+    @staticmethod
+    def test_compile_nested() -> None:
+        schema = DictSchema.of({'a': float, 'b': ListSchema.of(float), 'c': DictSchema.of(int)})
+        validate = schema.compile()
+        data = {'a': 1, 'b': [1.5, 2], 'c': {'x': 1}}
+        assert validate(data) is data
+        with pytest.raises(SchemaError) as exc_info:
+            validate({'a': 1, 'b': [1.5, 2], 'c': {'x': 1, 'y': 2.5}})
+        response, = exc_info.value.args
+        assert response == ('Expected all members to be type int, found float(2.5) at position 1 '
+                            'for member \'y\', for member \'c\'')
@@ -0,0 +1,66 @@
+# SPDX-FileCopyrightText: 2019-2022 REFITT Team
+# SPDX-License-Identifier: Apache-2.0
+
+"""Unit tests for sky pixelization."""
+
+
+# standard libs
+import math
+
+# external libs
+import pytest
+from hypothesis import given, strategies as st
+
+# internal libs
+from refitt.core.sky import pixel_id, cone_ranges, separation, ZONE_COUNT, CELL_COUNT
+
+
+ra_values = st.floats(min_value=0, max_value=360, exclude_max=True)
+dec_values = st.floats(min_value=-90, max_value=90)
+
+
+def _covered(pixel: int, ranges: list) -> bool:
+    return any(start <= pixel <= stop for start, stop in ranges)
+
+
+@pytest.mark.unit
+class TestSky:
+    """Unit tests for pixel ids, cone coverage, and separation."""
+
+    def test_pixel_bounds(self) -> None:
+        assert pixel_id(0, -90) == 0
+        assert pixel_id(359.9999, 90) == ZONE_COUNT * CELL_COUNT - 1
+        assert pixel_id(360, 0) == pixel_id(0, 0)
+
+    def test_separation(self) -> None:
+        assert separation(10, 20, 10, 20) == 0
+        assert separation(0, 0, 0, 1) == pytest.approx(3600)
+        assert separation(359.5, 0, 0.5, 0) == pytest.approx(3600)
+        assert separation(0, 90, 180, 90) == pytest.approx(0, abs=1e-6)
+
+    def test_negative_radius(self) -> None:
+        with pytest.raises(ValueError):
+            cone_ranges(0, 0, -1)
+
+    def test_ranges_sorted_and_disjoint(self) -> None:
+        ranges = cone_ranges(0.001, 45, 120)
+        assert ranges == sorted(ranges)
+        for (_, stop), (start, _) in zip(ranges[:-1], ranges[1:]):
+            assert stop + 1 < start
+
+    @given(ra_values, dec_values, ra_values, dec_values, st.floats(min_value=0, max_value=7200))
+    def test_cone_covers_matches(self, ra_1: float, dec_1: float, ra_2: float, dec_2: float, radius: float) -> None:
+        """Any position within the radius falls in one of the covering ranges."""
+        if separation(ra_1, dec_1, ra_2, dec_2) <= radius:
+            assert _covered(pixel_id(ra_2, dec_2), cone_ranges(ra_1, dec_1, radius))
+
+    @given(ra_values, dec_values, st.floats(min_value=0, max_value=7200),
+           st.floats(min_value=0, max_value=360), st.floats(min_value=0, max_value=1))
+    def test_cone_covers_nearby(self, ra: float, dec: float, radius: float, angle: float, scale: float) -> None:
+        """Positions offset within the radius in any direction are covered."""
+        offset = scale * radius / 3600
+        dec_2 = max(-90.0, min(90.0, dec + offset * math.sin(math.radians(angle))))
+        cos_dec = max(math.cos(math.radians(dec)), 1e-9)
+        ra_2 = (ra + offset * math.cos(math.radians(angle)) / cos_dec) % 360
+        if separation(ra, dec, ra_2, dec_2) <= radius:
+            assert _covered(pixel_id(ra_2, dec_2), cone_ranges(ra, dec, radius))
@@ -6,26 +6,31 @@
 
 # type annotations
 from __future__ import annotations
-from typing import Union
+from typing import Union, Dict, List
 
 # standard libs
+import os
 import json
+import time
 import functools
+from threading import Thread
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from io import BytesIO
-from datetime import timedelta
+from zipfile import ZipFile
+from datetime import date, datetime, timedelta, timezone
 
 # external libs
 import pytest
 from hypothesis import given, strategies as st
 from cmdkit.config import Namespace, ConfigurationError
-from pandas import DataFrame
+from pandas import DataFrame, concat
 from requests import Response
 
 # internal libs
 from refitt.core import base64
 from refitt.core.schema import SchemaError
 from refitt.data.tns.catalog import TNSCatalog, TNSRecord
-from refitt.data.tns.interface import (TNSConfig, TNSInterface,
+from refitt.data.tns.interface import (TNSConfig, TNSInterface, TNSError, RateLimiter,
                                        TNSNameSearchResult, TNSObjectSearchResult, TNSQueryCatalogResult)
 
 
@@ -345,3 +350,347 @@ class TestTNSCatalog:
             assert message == 'Multiple records with object_names ~ ZTF20actresa'
         else:
             raise AssertionError('Expected TNSCatalog.NoRecordsFound')
+
+    def test_get_from_internal_names(self) -> None:
+        """Look up records by any one of the internal names."""
+        data = self.data.copy()
+        data.internal_names = [f'{names}, ZTF21aaaaa{i}, ATLAS21x{i}' for i, names in enumerate(data.internal_names)]
+        catalog = TNSCatalog(data)
+        for i, name in enumerate(data.name):
+            assert catalog.get(f'ZTF21aaaaa{i}').name == name
+            assert catalog.get(f'ATLAS21x{i}').name == name
+
+    def test_get_many(self) -> None:
+        """Look up many records by name, leaving out those not found."""
+        data = self.data.copy()
+        data.internal_names = [f'ZTF21aaaaa{i}' for i in range(len(data))]
+        catalog = TNSCatalog(data)
+        records = catalog.get_many(['ZTF21aaaaa1', '2021zzz', 'foobar', *data.name])
+        assert list(records) == ['ZTF21aaaaa1', *data.name]
+        assert records['ZTF21aaaaa1'] == catalog.get(data.name[1])
+        for name in data.name:
+            assert records[name] == catalog.get(name)
+        assert catalog.get_many([]) == {}
+
+    def test_index_rebuilt_on_new_data(self) -> None:
+        """Index reflects data after it is replaced."""
+        catalog = TNSCatalog(self.data)
+        assert 'ZTF21aaaaa0' not in catalog.index['internal_names']
+        data = self.data.copy()
+        data.internal_names = [f'ZTF21aaaaa{i}' for i in range(len(data))]
+        catalog.data = data
+        assert catalog.get('ZTF21aaaaa0').name == data.name[0]
+
+    def test_binary(self, tmp_path) -> None:
+        """Write and read binary format."""
+        filepath = str(tmp_path / 'catalog.feather')
+        TNSCatalog(self.data).to_binary(filepath)
+        catalog = TNSCatalog.from_binary(filepath)
+        assert catalog.data.equals(self.data)
+        assert catalog.data.dtypes.equals(self.data.dtypes)
+
+    def test_binary_invalid_after_source_changed(self, tmp_path) -> None:
+        """Binary data is rejected once the CSV it was written from changes."""
+        source, filepath = str(tmp_path / 'catalog.csv'), str(tmp_path / 'catalog.feather')
+        catalog = TNSCatalog(self.data)
+        catalog.to_local(source)
+        catalog.to_binary(filepath, source=source)
+        assert TNSCatalog.from_binary(filepath, source=source).data.equals(self.data)
+        with open(source, mode='a') as stream:
+            stream.write('\n')
+        with pytest.raises(TNSCatalog.CacheInvalid):
+            TNSCatalog.from_binary(filepath, source=source)
+
+    def test_from_web_with_cache(self, tmp_path, monkeypatch) -> None:
+        """Cached catalog is written in both formats and reloaded from binary unless the CSV changes."""
+        monkeypatch.setattr(MockTNSCatalog, 'DEFAULT_CACHE_DIR', str(tmp_path))
+        monkeypatch.setattr(MockTNSCatalog, 'DEFAULT_CACHE_PATH', str(tmp_path / 'catalog.csv'))
+        monkeypatch.setattr(MockTNSCatalog, 'DEFAULT_BINARY_CACHE_PATH', str(tmp_path / 'catalog.feather'))
+        MockTNSCatalog.from_web(cache=True)
+        assert os.path.exists(tmp_path / 'catalog.csv')
+        assert os.path.exists(tmp_path / 'catalog.feather')
+        from_local = MockTNSCatalog.from_local
+        with monkeypatch.context() as context:
+            context.setattr(MockTNSCatalog, 'from_local', None)  # must not be used
+            assert MockTNSCatalog.from_web(cache=True).data.equals(self.data)
+        data = self.data.iloc[:2]
+        data.to_csv(tmp_path / 'catalog.csv', index=False)
+        assert MockTNSCatalog.from_web(cache=True).data.equals(from_local(str(tmp_path / 'catalog.csv')).data)
+        assert MockTNSCatalog.from_binary(str(tmp_path / 'catalog.feather'),
+                                          source=str(tmp_path / 'catalog.csv')).data.equals(data)
+        MockTNSCatalog.remove_cache()
+        assert not os.listdir(tmp_path)
+
+
+def write_catalog_zip(dataframe: DataFrame, filepath: str) -> None:
+    """Write `dataframe` as a zipped CSV file in the TNS format (first line is a comment)."""
+    name = os.path.basename(filepath).removesuffix('.zip')
+    with ZipFile(filepath, mode='w') as archive:
+        archive.writestr(name, '# modified: 2021-11-8 14:48:12\n' + dataframe.to_csv(index=False))
+
+
+class DeltaTNSInterface(MockTNSInterface):
+    """Mock interface with daily catalog changes read from local files."""
+
+    fixture_dir: str = None
+
+    def query(self, endpoint: str, url_args: Dict[str, str] = None, **parameters) -> TNSResponseStub:
+        """Fake query, daily changes from files in `fixture_dir` or 404 error."""
+        if endpoint != 'catalog_delta':
+            return super().query(endpoint, **parameters)
+        filepath = os.path.join(self.fixture_dir, f'tns_public_objects_{url_args["date"]}.csv.zip')
+        if not os.path.exists(filepath):
+            raise TNSError(404, endpoint)
+        response = TNSResponseStub()
+        with open(filepath, mode='rb') as stream:
+            response._content = stream.read()
+        response.status_code = 200
+        return response
+
+
+class DeltaTNSCatalog(TNSCatalog):
+    """A TNSCatalog with daily changes from local files."""
+
+    interface = DeltaTNSInterface
+
+
+@pytest.mark.unit
+class TestTNSCatalogDelta:
+    """Unit tests for incremental TNSCatalog updates."""
+
+    @functools.cached_property
+    def data(self) -> DataFrame:
+        """Load dataframe only once."""
+        return TNSCatalog.from_zip(BytesIO(base64.decode(FAKE_TNS_CATALOG_DATA))).data
+
+    @functools.cached_property
+    def delta(self) -> DataFrame:
+        """Changed record (redshift of the second) and new record."""
+        changed = self.data.iloc[[1]].copy()
+        changed.redshift = 0.25
+        added = self.data.iloc[[0]].copy()
+        added.objid = 95877
+        added.name = '2021adxa'
+        return concat([changed, added], ignore_index=True)
+
+    @pytest.fixture
+    def fixtures(self, tmp_path, monkeypatch) -> str:
+        """Use temporary cache and fixture directories."""
+        monkeypatch.setattr(DeltaTNSInterface, 'fixture_dir', str(tmp_path))
+        monkeypatch.setattr(DeltaTNSCatalog, 'DEFAULT_CACHE_DIR', str(tmp_path))
+        monkeypatch.setattr(DeltaTNSCatalog, 'DEFAULT_CACHE_PATH', str(tmp_path / 'catalog.csv'))
+        monkeypatch.setattr(DeltaTNSCatalog, 'DEFAULT_BINARY_CACHE_PATH', str(tmp_path / 'catalog.feather'))
+        return str(tmp_path)
+
+    @staticmethod
+    def days_since(last_updated: datetime) -> List[date]:
+        """Days (UTC) for daily changes expected since `last_updated`."""
+        first = last_updated.astimezone(timezone.utc).date()
+        last = datetime.now(timezone.utc).date() - timedelta(days=1)
+        return [first + timedelta(days=i) for i in range((last - first).days + 1)]
+
+    def check_delta_applied(self, data: DataFrame) -> None:
+        """Records from `self.delta` replace or add to original data."""
+        assert list(data.objid) == [95877, 95876, 95875, 95874, 95873]
+        assert list(data.name) == ['2021adxa', '2021adwz', '2021adwy', '2021adwx', '2021adww']
+        assert data.redshift[2] == 0.25
+        unchanged = data.drop(columns='redshift').iloc[1:].reset_index(drop=True)
+        assert unchanged.equals(self.data.drop(columns='redshift'))
+        assert data.dtypes.equals(self.data.dtypes)
+
+    def test_apply_delta(self) -> None:
+        """Changed records replaced and new records added."""
+        catalog = TNSCatalog(self.data)
+        catalog.apply_delta(self.delta)
+        self.check_delta_applied(catalog.data)
+        assert catalog.get('2021adxa').objid == 95877
+
+    def test_from_zip_delta(self, tmp_path) -> None:
+        """Load daily changes from archive."""
+        filepath = str(tmp_path / 'tns_public_objects_20211108.csv.zip')
+        write_catalog_zip(self.delta, filepath)
+        assert TNSCatalog.from_zip(filepath).data.equals(self.delta)
+
+    def test_refresh_incremental(self, fixtures: str, monkeypatch) -> None:
+        """Daily changes are applied since the last update."""
+        catalog = DeltaTNSCatalog(self.data)
+        catalog.last_updated = datetime.now() - timedelta(days=2, hours=1)
+        days = self.days_since(catalog.last_updated)
+        write_catalog_zip(self.delta.iloc[[0]], os.path.join(fixtures, f'tns_public_objects_{days[0]:%Y%m%d}.csv.zip'))
+        for day in days[1:]:
+            write_catalog_zip(self.delta, os.path.join(fixtures, f'tns_public_objects_{day:%Y%m%d}.csv.zip'))
+        monkeypatch.setattr(DeltaTNSCatalog, 'from_web', None)  # must not be used
+        catalog.refresh()
+        self.check_delta_applied(catalog.data)
+        assert datetime.now() - catalog.last_updated < timedelta(minutes=1)
+        assert DeltaTNSCatalog.from_cache().data.equals(catalog.data)
+
+    def test_refresh_fallback(self, fixtures: str) -> None:
+        """Missing daily changes fall back to full download."""
+        catalog = DeltaTNSCatalog(self.data.iloc[1:])
+        catalog.last_updated = datetime.now() - timedelta(days=2, hours=1)
+        days = self.days_since(catalog.last_updated)
+        write_catalog_zip(self.delta, os.path.join(fixtures, f'tns_public_objects_{days[0]:%Y%m%d}.csv.zip'))
+        catalog.refresh()
+        assert catalog.data.equals(self.data)
+
+    def test_refresh_not_incremental(self, fixtures: str) -> None:
+        """Full download when explicitly not incremental."""
+        catalog = DeltaTNSCatalog(self.data.iloc[1:])
+        catalog.last_updated = datetime.now() - timedelta(days=2, hours=1)
+        for day in self.days_since(catalog.last_updated):
+            write_catalog_zip(self.delta, os.path.join(fixtures, f'tns_public_objects_{day:%Y%m%d}.csv.zip'))
+        catalog.refresh(incremental=False)
+        assert catalog.data.equals(self.data)
+
+    def test_refresh_not_expired(self, fixtures: str) -> None:
+        """Nothing is done if catalog is not expired."""
+        catalog = DeltaTNSCatalog(self.data.iloc[1:])
+        catalog.last_updated = last_updated = datetime.now() - timedelta(hours=1)
+        catalog.refresh()
+        assert catalog.data.equals(self.data.iloc[1:])
+        assert catalog.last_updated == last_updated
+        assert not os.listdir(fixtures)
+
+
+class MockTNSHandler(BaseHTTPRequestHandler):
+    """Respond to requests with scripted responses (status, headers, body) from the server."""
+
+    protocol_version = 'HTTP/1.1'  # keep-alive connections
+
+    def do_POST(self) -> None:  # noqa: method name
+        """Record request and reply with next scripted response (200 by default)."""
+        self.rfile.read(int(self.headers['Content-Length']))
+        self.server.requests.append((self.path, self.client_address, dict(self.headers)))
+        status, headers, body = self.server.responses.pop(0) if self.server.responses else (200, {}, b'{}')
+        self.send_response(status)
+        for field, value in {'Content-Length': str(len(body)), **headers}.items():
+            self.send_header(field, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        """Silence request logging."""
+
+
+@pytest.mark.unit
+class TestTNSInterface:
+    """Unit tests for TNSInterface against a local HTTP server."""
+
+    @pytest.fixture
+    def server(self) -> ThreadingHTTPServer:
+        """Run local HTTP server in background thread."""
+        server = ThreadingHTTPServer(('127.0.0.1', 0), MockTNSHandler)
+        server.requests, server.responses = [], []
+        thread = Thread(target=server.serve_forever, kwargs={'poll_interval': 0.01}, daemon=True)
+        thread.start()
+        yield server
+        server.shutdown()
+        server.server_close()
+
+    @staticmethod
+    def interface(server: ThreadingHTTPServer, limiter: RateLimiter = None) -> TNSInterface:
+        """Interface with local server (fast backoff and separate rate limiter)."""
+        interface = TNSInterface(TNSConfig(key='abc', bot_id=123, bot_name='REFITT'),
+                                 url_base=f'http://127.0.0.1:{server.server_port}',
+                                 limiter=limiter or RateLimiter(rate=1000, burst=1000))
+        interface.backoff_base = 0.01
+        return interface
+
+    def test_session_reused(self, server: ThreadingHTTPServer) -> None:
+        """Requests share one connection with TNS headers."""
+        interface = self.interface(server)
+        for _ in range(3):
+            assert interface.query('name', internal_name='ZTF21abc').status_code == 200
+        assert [path for path, _, _ in server.requests] == ['/api/get/search', ] * 3
+        assert len({address for _, address, _ in server.requests}) == 1
+        assert all(headers['User-Agent'] == interface.config.headers['User-Agent']
+                   for _, _, headers in server.requests)
+
+    def test_catalog_delta_url(self, server: ThreadingHTTPServer) -> None:
+        """Daily catalog changes are requested by date."""
+        self.interface(server).search_catalog_delta(date(2021, 11, 8))
+        path, _, _ = server.requests[0]
+        assert path == '/system/files/tns_public_objects/tns_public_objects_20211108.csv.zip'
+
+    @pytest.mark.parametrize('status', [429, 500, 503])
+    def test_retry(self, server: ThreadingHTTPServer, status: int) -> None:
+        """Rate-limited and server errors are retried."""
+        server.responses = [(status, {}, b''), (status, {}, b''), (200, {}, b'{"id_code": 200}')]
+        response = self.interface(server).query('object', objname='2021adwz')
+        assert response.json() == {'id_code': 200}
+        assert len(server.requests) == 3
+
+    def test_retry_after(self, server: ThreadingHTTPServer) -> None:
+        """Retry waits as long as the server requests."""
+        server.responses = [(429, {'Retry-After': '0.3'}, b'')]
+        start = time.monotonic()
+        self.interface(server).query('object', objname='2021adwz')
+        assert time.monotonic() - start >= 0.3
+        assert len(server.requests) == 2
+
+    def test_retries_exhausted(self, server: ThreadingHTTPServer) -> None:
+        """Error raised after too many retries."""
+        interface = self.interface(server)
+        interface.max_retries = 2
+        server.responses = [(503, {}, b'')] * 5
+        with pytest.raises(TNSError) as error:
+            interface.query('object', objname='2021adwz')
+        assert error.value.args == (503, 'object')
+        assert len(server.requests) == 3
+
+    def test_no_retry_on_client_error(self, server: ThreadingHTTPServer) -> None:
+        """Other errors are not retried."""
+        server.responses = [(404, {}, b''), ]
+        with pytest.raises(TNSError) as error:
+            self.interface(server).query('object', objname='2021adwz')
+        assert error.value.args == (404, 'object')
+        assert len(server.requests) == 1
+
+    def test_rate_limit_headers(self, server: ThreadingHTTPServer) -> None:
+        """No requests until reset once the server reports none remaining."""
+        server.responses = [(200, {'x-rate-limit-remaining': '0', 'x-rate-limit-reset': '0.3'}, b'{}')]
+        interface = self.interface(server)
+        interface.query('object', objname='2021adwz')
+        start = time.monotonic()
+        interface.query('object', objname='2021adwz')
+        assert time.monotonic() - start >= 0.3
+
+
+@pytest.mark.unit
+class TestRateLimiter:
+    """Unit tests for RateLimiter."""
+
+    def test_burst(self) -> None:
+        """Requests up to burst are immediate, then at the given rate."""
+        limiter = RateLimiter(rate=20, burst=3)
+        start = time.monotonic()
+        waited = [limiter.acquire() for _ in range(7)]
+        assert waited[:3] == [0, 0, 0]
+        assert all(seconds > 0 for seconds in waited[3:])
+        assert time.monotonic() - start >= 4 / 20 * 0.95
+
+    def test_shared_by_threads(self) -> None:
+        """Rate applies to all threads together."""
+        limiter = RateLimiter(rate=50, burst=1)
+        threads = [Thread(target=lambda: [limiter.acquire() for _ in range(5)]) for _ in range(4)]
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert time.monotonic() - start >= 19 / 50 * 0.95
+
+    def test_pause(self) -> None:
+        """No requests allowed while paused."""
+        limiter = RateLimiter(rate=1000, burst=10)
+        limiter.pause(0.2)
+        assert limiter.acquire() >= 0.2 * 0.95
+
+    @pytest.mark.parametrize('headers', [{}, {'x-rate-limit-remaining': '5', 'x-rate-limit-reset': '10'},
+                                         {'x-rate-limit-remaining': 'x', 'x-rate-limit-reset': '10'}])
+    def test_update_no_pause(self, headers: dict) -> None:
+        """Headers without limit reached are ignored."""
+        limiter = RateLimiter(rate=1000, burst=10)
+        limiter.update(headers)
+        assert limiter.acquire() == 0
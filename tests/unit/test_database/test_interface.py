@@ -0,0 +1,66 @@
+# SPDX-FileCopyrightText: 2019-2022 REFITT Team
+# SPDX-License-Identifier: Apache-2.0
+
+"""Unit tests for database engine and pool configuration."""
+
+
+# standard libs
+import sqlite3
+
+# external libs
+import pytest
+from sqlalchemy.exc import TimeoutError
+
+# internal libs
+from refitt.core.config import Namespace, ConfigurationError
+from refitt.database import interface
+from refitt.database.interface import TimedQueuePool, get_pool_options, pool_status
+
+
+@pytest.mark.unit
+class TestPoolOptions:
+    """Unit tests for 'database.pool' configuration."""
+
+    def test_options(self, monkeypatch) -> None:
+        monkeypatch.setattr(interface, 'pool_config', Namespace({'size': 4, 'max_overflow': 2, 'recycle': 60,
+                                                                 'timeout': 2.5, 'pre_ping': True}))
+        options = get_pool_options()
+        assert options.pop('poolclass', TimedQueuePool) is TimedQueuePool
+        assert options == {'pool_size': 4, 'max_overflow': 2, 'pool_recycle': 60,
+                           'pool_timeout': 2.5, 'pool_pre_ping': True}
+
+    def test_unsupported_option(self, monkeypatch) -> None:
+        monkeypatch.setattr(interface, 'pool_config', Namespace({'foo': 1}))
+        with pytest.raises(ConfigurationError, match=r'Unsupported option \'database.pool.foo\''):
+            get_pool_options()
+
+    @pytest.mark.parametrize('name, value', [('size', '4'), ('size', True), ('timeout', 'x'), ('pre_ping', 1)])
+    def test_wrong_type(self, monkeypatch, name: str, value) -> None:
+        monkeypatch.setattr(interface, 'pool_config', Namespace({name: value}))
+        with pytest.raises(ConfigurationError, match=rf'Unexpected type for \'database.pool.{name}\''):
+            get_pool_options()
+
+
+@pytest.mark.unit
+class TestTimedQueuePool:
+    """Unit tests for pool statistics."""
+
+    def test_status(self) -> None:
+        pool = TimedQueuePool(lambda: sqlite3.connect(':memory:', check_same_thread=False),
+                              pool_size=2, max_overflow=1, timeout=0.1)
+        status = pool_status(pool)
+        assert status == {'class': 'TimedQueuePool', 'size': 2, 'checked_in': 0, 'checked_out': 0,
+                          'overflow': -2, 'timeout': 0.1, 'wait': {'count': 0, 'total': 0.0, 'max': 0.0}}
+        connections = [pool.connect() for _ in range(3)]
+        status = pool_status(pool)
+        assert status['checked_out'] == 3
+        assert status['overflow'] == 1
+        assert status['wait']['count'] == 3
+        with pytest.raises(TimeoutError):
+            pool.connect()
+        status = pool_status(pool)
+        assert status['wait']['count'] == 4
+        assert status['wait']['max'] >= 0.1
+        for connection in connections:
+            connection.close()
+        assert pool_status(pool)['checked_in'] == 2
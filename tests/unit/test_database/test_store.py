@@ -0,0 +1,91 @@
+# SPDX-FileCopyrightText: 2019-2022 REFITT Team
+# SPDX-License-Identifier: Apache-2.0
+
+"""Unit tests for external file storage."""
+
+
+# standard libs
+import io
+import os
+import hashlib
+
+# external libs
+import pytest
+
+# internal libs
+from refitt.database.store import LocalFileStore, iter_chunks, split_key
+
+
+@pytest.mark.unit
+class TestIterChunks:
+    """Unit tests for iter_chunks."""
+
+    @pytest.mark.parametrize('chunksize', [1, 3, 100])
+    def test_bytes(self, chunksize: int) -> None:
+        chunks = [bytes(chunk) for chunk in iter_chunks(b'abcdefg', chunksize)]
+        assert all(len(chunk) <= chunksize for chunk in chunks)
+        assert b''.join(chunks) == b'abcdefg'
+
+    def test_stream(self) -> None:
+        assert list(iter_chunks(io.BytesIO(b'abcdefg'), 3)) == [b'abc', b'def', b'g']
+
+    def test_iterable(self) -> None:
+        assert list(iter_chunks(iter([b'ab', b'cd']))) == [b'ab', b'cd']
+
+
+@pytest.mark.unit
+class TestLocalFileStore:
+    """Unit tests for LocalFileStore."""
+
+    def test_put(self, tmp_path) -> None:
+        store = LocalFileStore(str(tmp_path))
+        digest = store.put(b'some data')
+        assert digest == hashlib.sha256(b'some data').hexdigest()
+        assert os.path.exists(os.path.join(tmp_path, digest[:2], digest[2:4], digest))
+        assert store.exists(digest)
+        assert store.size(digest) == 9
+        assert not [name for name in os.listdir(tmp_path) if name.startswith('.upload-')]
+
+    def test_put_identical(self, tmp_path) -> None:
+        store = LocalFileStore(str(tmp_path))
+        assert store.put(b'some data') == store.put(iter([b'some ', b'data']))
+        assert store.size(store.put(b'some data')) == 9
+
+    def test_put_failure(self, tmp_path) -> None:
+
+        def chunks():
+            yield b'partial'
+            raise RuntimeError('interrupted')
+
+        store = LocalFileStore(str(tmp_path))
+        with pytest.raises(RuntimeError):
+            store.put(chunks())
+        assert os.listdir(tmp_path) == []
+
+    @pytest.mark.parametrize('chunksize', [1, 4, 1024])
+    def test_read(self, tmp_path, chunksize: int) -> None:
+        store = LocalFileStore(str(tmp_path))
+        data = bytes(range(256)) * 4
+        digest = store.put(data)
+        chunks = list(store.read(digest, chunksize=chunksize))
+        assert all(len(chunk) <= chunksize for chunk in chunks)
+        assert b''.join(chunks) == data
+        assert b''.join(store.read(digest, 3, 17, chunksize=chunksize)) == data[3:17]
+        assert b''.join(store.read(digest, len(data), chunksize=chunksize)) == b''
+
+    def test_missing(self, tmp_path) -> None:
+        store = LocalFileStore(str(tmp_path))
+        digest = hashlib.sha256(b'other data').hexdigest()
+        assert not store.exists(digest)
+        with pytest.raises(FileNotFoundError):
+            list(store.read(digest))
+
+    @pytest.mark.parametrize('digest', ['', 'abc', '../' + 'a' * 61, 'A' * 64])
+    def test_invalid_digest(self, tmp_path, digest: str) -> None:
+        with pytest.raises(ValueError):
+            LocalFileStore(str(tmp_path)).filepath(digest)
+
+
+@pytest.mark.unit
+def test_split_key() -> None:
+    assert split_key('local:abc123') == ('local', 'abc123')
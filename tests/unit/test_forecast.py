@@ -11,6 +11,7 @@ from typing import Type
 # standard libs
 import io
 import json
+import pickle
 import random
 from abc import ABC, abstractstaticmethod
 
@@ -18,6 +19,7 @@ from abc import ABC, abstractstaticmethod
 import numpy as np
 
 # internal libs
+from refitt.core import arrays
 from refitt.core.typing import JsonDict
 from refitt.core.schema import SchemaError
 from refitt.forecast.model import ModelData
@@ -38,6 +40,11 @@ class ModelTestBase(ABC):
         forecast = self.model_type.from_dict(data)
         assert forecast.data == data
 
+    def test_pickle(self) -> None:
+        """Check round-trip through pickle (e.g., for loading in other processes)."""
+        forecast = self.model_type.from_dict(self.generate())
+        assert pickle.loads(pickle.dumps(forecast)) == forecast
+
     def test_missing_key(self) -> None:
         """Will raise SchemaError on missing key."""
         data = self.generate()
@@ -113,6 +120,29 @@ class ModelTestBase(ABC):
         for field, value in data.items():
             assert getattr(forecast, field) == value
 
+    def test_binary_arrays(self) -> None:
+        """Encoded arrays are validated by header and decoded on access."""
+        data = self.generate()
+        binary = self.model_type.from_dict(data).to_dict(array_format='binary')
+        forecast = self.model_type.from_dict(binary)
+        assert forecast.data == binary
+        for key in ModelData.array_keys:
+            assert np.array_equal(getattr(forecast, key), np.asarray(data[key]))
+        assert forecast.to_dict(array_format='list') == data
+        assert forecast.observation_value == self.model_type.from_dict(data).observation_value
+
+    def test_binary_arrays_wrong_shape(self) -> None:
+        """Will raise SchemaError on encoded array with wrong number of dimensions."""
+        data = self.generate()
+        data['mjd_arr'] = arrays.encode([data['mjd_arr'], data['mjd_arr']])
+        try:
+            _ = self.model_type.from_dict(data)
+        except SchemaError as error:
+            assert str(error) == ('Expected 1-dimensional array, found shape=[2, 100], '
+                                  'for member \'mjd_arr\'')
+        else:
+            raise AssertionError('Expected SchemaError')
+
 
 class TestConvAutoEncoder(ModelTestBase):
     """Unit tests (mostly schema checks) for ConvAutoEncoder."""
@@ -0,0 +1,41 @@
+# SPDX-FileCopyrightText: 2019-2022 REFITT Team
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for API response formatting."""
+
+
+# standard libs
+import json
+from datetime import datetime, timezone
+
+# external libs
+import pytest
+import numpy as np
+
+# internal libs
+from refitt.web.api import response
+from refitt.web.api.response import dumps
+from refitt.database.model import Observation, File
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize('encoder', ['default', 'stdlib'])
+def test_dumps(encoder: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    if encoder == 'stdlib':
+        monkeypatch.setattr(response, 'orjson', None)
+    data = {'Status': 'Success', 'Response': {'a': [1, 2.5, None, True], 'b': {'c': 'd'}, 3: 'e'}}
+    assert json.loads(dumps(data)) == json.loads(json.dumps(data))
+    assert json.loads(dumps({'value': np.float64(1.5)})) == {'value': 1.5}
+
+
+@pytest.mark.unit
+def test_to_json() -> None:
+    time = datetime(2020, 10, 24, 18, tzinfo=timezone.utc)
+    observation = Observation(id=1, epoch_id=1, type_id=2, object_id=3, source_id=4, value=18.1, error=None,
+                              time=time, recorded=time)
+    assert observation.to_json() == {'id': 1, 'epoch_id': 1, 'type_id': 2, 'object_id': 3, 'source_id': 4,
+                                     'value': 18.1, 'error': None, 'time': '2020-10-24 18:00:00+00:00',
+                                     'recorded': '2020-10-24 18:00:00+00:00'}
+    file = File(id=1, epoch_id=1, observation_id=2, type_id=3, name='a.fits')
+    file._data = b'abc'
+    assert file.to_json(pop=['name', ])['data'] == ['YWJj']
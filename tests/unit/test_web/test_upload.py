@@ -0,0 +1,75 @@
+# SPDX-FileCopyrightText: 2019-2022 REFITT Team
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for streamed file uploads in the API."""
+
+
+# standard libs
+import os
+import hashlib
+from io import BytesIO
+
+# external libs
+import pytest
+from flask import Flask, request
+
+# internal libs
+from refitt.web.api.response import PayloadTooLarge
+from refitt.web.api.tools import UploadStream, APIRequest, spool_file, require_file, UPLOAD_SPOOL_SIZE
+
+
+def write_chunks(stream: UploadStream, data: bytes, chunksize: int = 4096) -> None:
+    for i in range(0, len(data), chunksize):
+        stream.write(data[i:i+chunksize])
+
+
+@pytest.mark.unit
+class TestUploadStream:
+    """Unit tests for UploadStream."""
+
+    @pytest.mark.parametrize('size', [0, 100, UPLOAD_SPOOL_SIZE + 1])
+    def test_checksum_and_view(self, size: int) -> None:
+        data = os.urandom(size)
+        stream = UploadStream()
+        write_chunks(stream, data)
+        assert stream.size == size
+        assert stream.checksum == hashlib.sha256(data).hexdigest()
+        with stream.view() as view:
+            assert bytes(view) == data
+        stream.seek(0)
+        assert stream.read() == data
+
+    def test_size_limit(self) -> None:
+        stream = UploadStream(size_limit=10_000)
+        stream.write(b'x' * 8192)
+        with pytest.raises(PayloadTooLarge, match='File exceeds maximum size of 10000 bytes'):
+            stream.write(b'x' * 8192)
+        assert stream.size == 16384
+
+
+@pytest.fixture(scope='module')
+def app() -> Flask:
+    """Minimal application with upload request handling."""
+    app = Flask(__name__)
+    app.request_class = APIRequest
+    return app
+
+
+@pytest.mark.unit
+class TestSpoolFile:
+    """Unit tests for spool_file."""
+
+    def test_spooled(self, app: Flask) -> None:
+        data = os.urandom(UPLOAD_SPOOL_SIZE * 2)
+        with app.test_request_context(method='POST', data={'obs.fits': (BytesIO(data), 'obs.fits')}):
+            name, file_type, stream = spool_file(request, allowed_extensions=['fits'], size_limit=len(data))
+            assert (name, file_type) == ('obs.fits', 'fits')
+            assert isinstance(stream, UploadStream)
+            assert stream.checksum == hashlib.sha256(data).hexdigest()
+            assert stream.read() == data
+
+    def test_too_large(self, app: Flask) -> None:
+        data = os.urandom(UPLOAD_SPOOL_SIZE)
+        with app.test_request_context(method='POST', data={'obs.fits': (BytesIO(data), 'obs.fits')}):
+            with pytest.raises(PayloadTooLarge):
+                require_file(request, size_limit=len(data) - 1)